@@ -0,0 +1,162 @@
+import os
+import time
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+# 캐시 설정
+# - ANALYSIS_CACHE_BACKEND: "memory"(컨테이너 내 LRU), "dynamodb"(LRU + DynamoDB), "none"
+ANALYSIS_CACHE_BACKEND = os.environ.get('ANALYSIS_CACHE_BACKEND', 'memory')
+ANALYSIS_CACHE_TABLE = os.environ.get('ANALYSIS_CACHE_TABLE', 'inha-capstone-14-AnalysisCache')
+ANALYSIS_CACHE_TTL_SECONDS = int(os.environ.get('ANALYSIS_CACHE_TTL_SECONDS', 60 * 60 * 24 * 7))
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.environ.get('ANALYSIS_CACHE_MAX_ENTRIES', 256))
+
+
+def content_hash(image_data):
+    """정규화(전처리)된 이미지 바이트의 SHA-256"""
+    return hashlib.sha256(image_data).hexdigest()
+
+
+class LRUCacheBackend:
+    """warm 컨테이너 내 LRU 캐시 (TTL 지원)"""
+
+    def __init__(self, max_entries=ANALYSIS_CACHE_MAX_ENTRIES, ttl_seconds=ANALYSIS_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.time() + self.ttl_seconds, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+class InMemoryTable:
+    """
+    DynamoDB Table의 get_item/put_item 동작을 흉내내는 로컬 대용품 (테스트용)
+    """
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key):
+        item = self.items.get(Key['image_hash'])
+        return {'Item': dict(item)} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item['image_hash']] = dict(Item)
+        return {}
+
+
+class DynamoDBCacheBackend:
+    """
+    DynamoDB 테이블 캐시 (Partition Key: image_hash, TTL 속성: ttl)
+    - DynamoDB TTL 삭제는 지연될 수 있으므로 조회 시 만료 여부를 직접 확인
+    """
+
+    def __init__(self, table, ttl_seconds=ANALYSIS_CACHE_TTL_SECONDS):
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key):
+        item = self.table.get_item(Key={'image_hash': key}).get('Item')
+        if not item or int(item.get('ttl', 0)) <= int(time.time()):
+            return None
+        return json.loads(item['result'])
+
+    def put(self, key, value):
+        self.table.put_item(
+            Item={
+                'image_hash': key,
+                'result': json.dumps(value, ensure_ascii=False),
+                'ttl': int(time.time()) + self.ttl_seconds
+            }
+        )
+
+
+class AnalysisCache:
+    """
+    이미지 해시 -> 분석 결과({category, brand, description}) 캐시
+    - 여러 백엔드를 앞에서부터 차례로 조회하고, 하위 계층 hit은 상위 계층에 채워 넣음
+    """
+
+    def __init__(self, backends):
+        self.backends = backends
+        self.stats = {"hits": 0, "misses": 0, "errors": 0}
+
+    def get(self, key):
+        for index, backend in enumerate(self.backends):
+            try:
+                value = backend.get(key)
+            except Exception as e:
+                print(f"분석 캐시 조회 실패: {e}")
+                self.stats["errors"] += 1
+                continue
+
+            if value is not None:
+                for upper in self.backends[:index]:
+                    upper.put(key, value)
+                self.stats["hits"] += 1
+                return value
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key, value):
+        for backend in self.backends:
+            try:
+                backend.put(key, value)
+            except Exception as e:
+                print(f"분석 캐시 저장 실패: {e}")
+                self.stats["errors"] += 1
+
+    def get_or_analyze(self, image_data, analyze):
+        """
+        캐시에 있으면 저장된 결과를, 없으면 analyze(image_data)를 실행하고 저장
+        반환값: (결과, 캐시 hit 여부)
+        """
+        key = content_hash(image_data)
+
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+
+        result = analyze(image_data)
+        self.put(key, result)
+        return result, False
+
+    def hit_rate(self):
+        total = self.stats["hits"] + self.stats["misses"]
+        return round(self.stats["hits"] / total, 3) if total else 0.0
+
+
+def _create_cache():
+    if ANALYSIS_CACHE_BACKEND == 'none':
+        return AnalysisCache([])
+
+    backends = [LRUCacheBackend()]
+
+    if ANALYSIS_CACHE_BACKEND == 'dynamodb':
+        import boto3
+        table = boto3.resource('dynamodb').Table(ANALYSIS_CACHE_TABLE)
+        backends.append(DynamoDBCacheBackend(table))
+
+    return AnalysisCache(backends)
+
+
+analysis_cache = _create_cache()
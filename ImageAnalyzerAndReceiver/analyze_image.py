@@ -1,16 +1,32 @@
 import json
+import os
+import time
+import random
 import base64
 import boto3
 import re
+from botocore.exceptions import ClientError
+from structured_output import (
+    AnalysisFormatError,
+    extract_analysis_from_stream,
+    extract_batch_analysis,
+)
 
 bedrock = boto3.client('bedrock-runtime', region_name='us-west-2')
 
-def analyze_image_with_bedrock(image_data):
-    """Claude Vision으로 이미지 분석하여 구조화된 데이터 반환"""
-    image_base64 = base64.b64encode(image_data).decode('ascii')
+MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"
 
-    # 구조화된 출력을 위한 프롬프트
-    prompt = """이미지를 분석하고 다음 정보를 정확한 JSON 형식으로 제공해주세요.
+# 스로틀링 재시도 설정
+BEDROCK_MAX_RETRIES = int(os.environ.get('BEDROCK_MAX_RETRIES', 4))
+BEDROCK_BACKOFF_BASE = float(os.environ.get('BEDROCK_BACKOFF_BASE', 0.5))  # 초
+RETRYABLE_ERRORS = {'ThrottlingException', 'ServiceUnavailableException', 'ModelNotReadyException'}
+
+# 응답 스트리밍 사용 여부 / 형식 오류 시 최대 요청 횟수
+BEDROCK_STREAMING = os.environ.get('BEDROCK_STREAMING', 'true').lower() == 'true'
+ANALYSIS_MAX_ATTEMPTS = int(os.environ.get('ANALYSIS_MAX_ATTEMPTS', 2))
+
+# 구조화된 출력을 위한 프롬프트
+PROMPT = """이미지를 분석하고 다음 정보를 정확한 JSON 형식으로 제공해주세요.
 
 
 1. 이미지에 있는 물체의 카테고리를 식별하세요 (예: 지갑, 카드, 학생증, 마우스, 키보드, 가방, 시계 등)
@@ -55,46 +71,165 @@ def analyze_image_with_bedrock(image_data):
 
 이제 제공된 이미지를 분석하고 JSON 형식으로만 응답해주세요. 다른 설명은 포함하지 마세요."""
 
+# 여러 이미지를 한 번에 분석할 때 사용하는 프롬프트 (이미지마다 id 포함)
+BATCH_PROMPT = """위에 제공된 각 이미지는 바로 앞의 "이미지 id: ..." 텍스트로 구분됩니다.
+각 이미지에 있는 물체를 분석하고 다음 JSON 배열 형식으로만 응답하세요. 다른 설명은 포함하지 마세요.
+
+1. category: 물체의 카테고리 (예: 지갑, 카드, 학생증, 마우스, 키보드, 가방, 시계 등)
+2. brand: 식별 가능한 브랜드명, 식별할 수 없다면 "알 수 없음"
+3. description: 물체에 대한 간단한 설명
+
+출력 형식
+[
+  {"id": "이미지 id", "category": "물체의 카테고리", "brand": "브랜드명 또는 '알 수 없음'", "description": "물체에 대한 간단한 설명"}
+]
+
+모든 이미지에 대해 입력 순서대로 하나씩 결과를 포함하세요."""
+
+
+def _image_block(image_data, media_type):
+    return {
+        "type": "image",
+        "source": {
+            "type": "base64",
+            "media_type": media_type,
+            "data": base64.b64encode(image_data).decode('ascii')
+        }
+    }
+
+
+def _request_body(content, max_tokens):
     # Bedrock API 요청 바디
-    body = json.dumps(
+    return json.dumps(
         {
             "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 1000,
+            "max_tokens": max_tokens,
             "temperature": 0,
             "messages": [
                 {
                     "role": "user",
-                    "content": [
-                        {
-                            "type": "image",
-                            "source": {
-                                "type": "base64",
-                                "media_type": "image/jpeg",
-                                "data": image_base64
-                            }
-                        },
-                        {
-                            "type": "text",
-                            "text": prompt
-                        }
-                    ]
+                    "content": content
                 }
             ]
         }
         ,ensure_ascii=False
     )
 
+
+def _with_retry(call):
+    """스로틀링 등 일시적 오류는 지수 백오프(+jitter)로 재시도"""
+    attempt = 0
+    while True:
+        try:
+            return call()
+        except ClientError as e:
+            code = e.response.get('Error', {}).get('Code')
+            if code not in RETRYABLE_ERRORS or attempt >= BEDROCK_MAX_RETRIES:
+                raise
+            delay = BEDROCK_BACKOFF_BASE * (2 ** attempt) * (0.5 + random.random())
+            print(f"Bedrock {code}, {delay:.2f}s 후 재시도 ({attempt + 1}/{BEDROCK_MAX_RETRIES})")
+            time.sleep(delay)
+            attempt += 1
+
+
+def _invoke(content, max_tokens=1000):
+    """Bedrock 호출 후 모델 응답 텍스트 반환"""
+    body = _request_body(content, max_tokens)
+
     # bedrock 호출
-    response = bedrock.invoke_model(
-        modelId="anthropic.claude-3-sonnet-20240229-v1:0",
+    response = _with_retry(lambda: bedrock.invoke_model(
+        modelId=MODEL_ID,
         body=body,
         contentType='application/json',
         accept='application/json'
-    )
+    ))
 
     # 응답 파싱
     response_body = json.loads(response['body'].read())
-    result_text = response_body['content'][0]['text']
-    result_json = json.loads(result_text)
+    return response_body['content'][0]['text']
+
+
+def _invoke_stream(content, max_tokens=1000):
+    """
+    Bedrock 스트리밍 호출 - 모델 응답 텍스트를 도착하는 대로 yield
+    (호출 측에서 generator를 닫으면 스트림도 닫힘)
+    """
+    body = _request_body(content, max_tokens)
+
+    response = _with_retry(lambda: bedrock.invoke_model_with_response_stream(
+        modelId=MODEL_ID,
+        body=body,
+        contentType='application/json',
+        accept='application/json'
+    ))
+
+    stream = response['body']
+    try:
+        for event in stream:
+            chunk = event.get('chunk')
+            if chunk is None:
+                # modelStreamErrorException 등 스트림 중 오류
+                raise RuntimeError(f"Bedrock 스트림 오류: {list(event.keys())}")
+
+            data = json.loads(chunk['bytes'])
+            if data.get('type') == 'content_block_delta':
+                yield data['delta'].get('text', '')
+    finally:
+        stream.close()
+
+
+def _invoke_chunks(content):
+    """스트리밍 설정과 관계없이 응답 텍스트 조각을 yield"""
+    if BEDROCK_STREAMING:
+        yield from _invoke_stream(content)
+    else:
+        yield _invoke(content)
+
+
+def analyze_image_with_bedrock(image_data, media_type="image/jpeg"):
+    """
+    Claude Vision으로 이미지 분석하여 구조화된 데이터 반환
+    - 응답 앞뒤의 불필요한 텍스트는 무시하고, JSON 객체가 완성되는 즉시 반환
+    - 유효한 결과를 얻지 못하면 ANALYSIS_MAX_ATTEMPTS 회까지 재요청
+    """
+    content = [
+        _image_block(image_data, media_type),
+        {
+            "type": "text",
+            "text": PROMPT
+        }
+    ]
+
+    attempt = 1
+    while True:
+        chunks = _invoke_chunks(content)
+        try:
+            return extract_analysis_from_stream(chunks)
+        except AnalysisFormatError as e:
+            if attempt >= ANALYSIS_MAX_ATTEMPTS:
+                raise
+            print(f"분석 결과 형식 오류, 재요청 ({attempt}/{ANALYSIS_MAX_ATTEMPTS}): {e}")
+            attempt += 1
+        finally:
+            chunks.close()
+
+
+def analyze_images_batch(images):
+    """
+    여러 이미지를 하나의 요청으로 분석
+    - images: [(image_id, image_data, media_type), ...]
+    - 반환값: {image_id: {category, brand, description}} (형식이 잘못된 항목은 제외)
+    """
+    content = []
+    for image_id, image_data, media_type in images:
+        content.append({"type": "text", "text": f"이미지 id: {image_id}"})
+        content.append(_image_block(image_data, media_type))
+    content.append({"type": "text", "text": BATCH_PROMPT})
+
+    result_text = _invoke(content, max_tokens=300 * len(images) + 200)
 
-    return result_json
\ No newline at end of file
+    try:
+        return extract_batch_analysis(result_text)
+    except AnalysisFormatError as e:
+        print(f"배치 분석 결과 형식 오류 (단건 분석으로 대체): {e}")
+        return {}
@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from analyze_image import analyze_image_with_bedrock, analyze_images_batch
+from send_image import upload_image
+from preprocess_image import preprocess_image
+from analysis_cache import analysis_cache, content_hash
+from registry import register_item
+
+# 배치 분석 설정
+BATCH_IMAGES_PER_REQUEST = int(os.environ.get('BATCH_IMAGES_PER_REQUEST', 4))  # Bedrock 요청 1회당 이미지 수
+BATCH_MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS', 4))  # 동시 Bedrock 요청 수 (스로틀링 고려)
+
+executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS)
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _capture(step, image):
+    """
+    이미지 한 장에 대해 step을 실행하고, 실패하면 image["error"]에 기록
+    (한 이미지의 실패가 배치 전체를 중단시키지 않도록)
+    """
+    try:
+        return step(image)
+    except Exception as e:
+        print(f"배치 이미지 처리 실패: id={image['id']}, {e}")
+        image["error"] = str(e)
+        return None
+
+
+def _pending(images):
+    return [image for image in images if "error" not in image]
+
+
+def _analyze_chunk(chunk):
+    """
+    이미지 묶음을 한 번의 Bedrock 요청으로 분석
+    - 응답에서 누락된 이미지(또는 묶음 요청 실패 시 전체)는 단건 분석으로 보충
+    - 단건 분석까지 실패한 이미지는 결과에서 빠지고 image["error"]에 기록
+    """
+    try:
+        results = analyze_images_batch(
+            [(image["id"], image["processed"]["data"], image["processed"]["media_type"]) for image in chunk]
+        )
+    except Exception as e:
+        print(f"배치 분석 요청 실패 (단건 분석으로 대체): {e}")
+        results = {}
+    bedrock_calls = 1
+
+    for image in chunk:
+        if image["id"] not in results:
+            analysis = _capture(
+                lambda image: analyze_image_with_bedrock(image["processed"]["data"], image["processed"]["media_type"]),
+                image
+            )
+            if analysis is not None:
+                results[image["id"]] = analysis
+            bedrock_calls += 1
+
+    return results, bedrock_calls
+
+
+def _preprocess(image):
+    image["processed"] = preprocess_image(image["data"])
+    image["cache_key"] = content_hash(image["processed"]["data"])
+    image["analysis"] = analysis_cache.get(image["cache_key"])
+
+
+def _ingest(images, register, device_name=None):
+    started = time.perf_counter()
+
+    # 1. 전처리 + 분석 캐시 조회 (디코딩할 수 없는 이미지는 여기서 실패 처리)
+    list(executor.map(lambda image: _capture(_preprocess, image), _pending(images)))
+
+    # 2. 캐시 miss 이미지만 묶어서 병렬 분석 (bounded worker pool)
+    preprocessed = _pending(images)
+    misses = [image for image in preprocessed if image["analysis"] is None]
+    bedrock_calls = 0
+    for results, calls in executor.map(_analyze_chunk, list(_chunks(misses, BATCH_IMAGES_PER_REQUEST))):
+        bedrock_calls += calls
+        for image in misses:
+            if image["id"] in results:
+                image["analysis"] = results[image["id"]]
+                analysis_cache.put(image["cache_key"], image["analysis"])
+
+    # 3. 원본 S3 저장
+    def upload(image):
+        image["file_url"] = upload_image(image["data"], image["processed"]["original_media_type"])
+
+    list(executor.map(lambda image: _capture(upload, image), _pending(images)))
+
+    # 4. ItemRegister 등록
+    def register_one(image):
+        data = register_item(
+            image["file_url"], image["analysis"], image["processed"]["phash"], device_name,
+            image_sha256=content_hash(image["data"])  # 같은 원본 이미지 재전송 시 중복 등록 방지
+        )
+        image["locker_number"] = data.get('locker_number')
+
+    if register:
+        list(executor.map(lambda image: _capture(register_one, image), _pending(images)))
+
+    elapsed = time.perf_counter() - started
+
+    stats = {
+        "images": len(images),
+        "failed": len(images) - len(_pending(images)),
+        "cache_hits": len(preprocessed) - len(misses),
+        "bedrock_calls": bedrock_calls,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "images_per_sec": round(len(images) / elapsed, 2) if elapsed else None,
+        "ms_per_image": round(elapsed * 1000 / len(images), 1)
+    }
+    print(f"배치 처리: {json.dumps(stats)}")
+
+    # 실패한 이미지는 {id, error}로, 나머지는 분석/등록 결과로 반환 (요청 순서 유지)
+    results = [
+        {"id": image["id"], "error": image["error"]} if "error" in image else {
+            "id": image["id"],
+            "category": image["analysis"].get('category'),
+            "brand": image["analysis"].get('brand'),
+            "description": image["analysis"].get('description'),
+            "image_url": image["file_url"],
+            "locker_number": image.get("locker_number")
+        }
+        for image in images
+    ]
+
+    return results, stats
+
+
+def lambda_handler(event, context):
+    """
+    여러 이미지를 한 번에 분석/등록하는 배치 진입점 (키오스크 재연결, 관리자 일괄 등록)
+    요청: {"images": [{"id": "...", "image": "<base64>"}], "register": true, "device_name": "..."}
+    """
+    try:
+        body = json.loads(event['body']) if 'body' in event else event
+        images = []
+        for index, image in enumerate(body.get('images', [])):
+            entry = {"id": str(image.get('id', index))}
+            try:
+                entry["data"] = base64.b64decode(image['image'])
+            except (KeyError, ValueError) as e:
+                entry["error"] = f"이미지 디코딩 실패: {e}"
+            images.append(entry)
+
+        if not images:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({'error': 'images가 비어있습니다'})
+            }
+
+        results, stats = _ingest(
+            images, register=body.get('register', True), device_name=body.get('device_name')
+        )
+
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json'},
+            'body': json.dumps({"results": results, "stats": stats}, ensure_ascii=False)
+        }
+
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json'},
+            'body': json.dumps({'error': str(e)})
+        }
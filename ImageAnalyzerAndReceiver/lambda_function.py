@@ -1,8 +1,50 @@
 import json
+import time
 import base64
-import requests
+from concurrent.futures import ThreadPoolExecutor, wait
 from analyze_image import analyze_image_with_bedrock
 from send_image import upload_image
+from preprocess_image import preprocess_image, detect_media_type
+from analysis_cache import analysis_cache, content_hash
+from registry import find_registered_duplicate, register_item
+
+# Bedrock 분석과 S3 업로드를 동시에 실행하기 위한 스레드 풀 (warm 컨테이너에서 재사용)
+executor = ThreadPoolExecutor(max_workers=2)
+
+
+def _timed(func, *args):
+    """함수를 실행하고 (결과, 소요시간 ms)를 반환"""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, round((time.perf_counter() - started) * 1000, 1)
+
+
+def _analyze(image_data, media_type):
+    """분석 결과 캐시(이미지 SHA-256)를 먼저 확인하고, 없으면 Bedrock 호출"""
+    return analysis_cache.get_or_analyze(
+        image_data,
+        lambda data: analyze_image_with_bedrock(data, media_type)
+    )
+
+
+def _device_name(event):
+    """요청을 보낸 키오스크 기기 이름 (쿼리스트링 device_name 또는 X-Device-Name 헤더, 없으면 None)"""
+    params = event.get('queryStringParameters') or {}
+    if params.get('device_name'):
+        return params['device_name']
+
+    headers = {key.lower(): value for key, value in (event.get('headers') or {}).items()}
+    return headers.get('x-device-name')
+
+
+def _idempotency_key(event):
+    """
+    키오스크가 보낸 Idempotency-Key 헤더 (없으면 None -> 원본 이미지 SHA-256을 키로 사용)
+    (같은 촬영본의 재시도는 같은 키 -> ItemRegister가 첫 등록 결과를 그대로 반환)
+    """
+    headers = {key.lower(): value for key, value in (event.get('headers') or {}).items()}
+    return headers.get('idempotency-key')
+
 
 def lambda_handler(event, context):
     try:
@@ -22,34 +64,86 @@ def lambda_handler(event, context):
         else:
             image_data = base64.b64decode(body)
 
-        # Bedrock으로 이미지 분석
-        analyze_result = analyze_image_with_bedrock(image_data)
+        device_name = _device_name(event)
+        pipeline_started = time.perf_counter()
 
-        # # S3에 이미지 저장
-        file_url = upload_image(image_data)
+        # S3 저장(원본)은 형식만 알면 되므로 전처리를 기다리지 않고 바로 시작
+        upload_future = executor.submit(
+            _timed, upload_image, image_data, detect_media_type(image_data)
+        )
 
-        # 이미지 저장용 서버로 API 호출
-        api_url = "https://vwfopg9nxh.execute-api.us-west-2.amazonaws.com/v1/images/registry"
-        payload = {
-            "file_url": file_url,
-            "analysis_result": analyze_result
-        }
-        headers = {
-            "Content-Type": "application/json"
-        }
+        # Bedrock 전송용 이미지 전처리 (축소/재인코딩/perceptual hash)
+        processed, preprocess_ms = _timed(preprocess_image, image_data)
+
+        # Bedrock 이미지 분석(전처리본)을 진행 중인 S3 저장(원본)과 병렬로 실행
+        analyze_future = executor.submit(
+            _timed, _analyze, processed["data"], processed["media_type"]
+        )
+
+        # 같은 기기의 최근 유사 이미지 조회도 분석/업로드와 동시에 진행 (조회 왕복이 분석 앞을 막지 않음)
+        duplicate, lookup_ms = _timed(
+            find_registered_duplicate, processed["phash"], device_name
+        )
+        if duplicate:
+            # Lambda는 응답 후 멈추므로 진행 중인 작업이 다음 호출로 넘어가지 않도록 끝까지 기다림
+            wait([analyze_future, upload_future])
+            print(f"중복 이미지: item_id={duplicate.get('item_id')} ({lookup_ms}ms)")
+            return {
+                'statusCode': 200,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({
+                    "category": duplicate.get('category'),
+                    "locker_number": duplicate.get('locker_number'),
+                    "image_url": duplicate.get('file_url'),
+                    "duplicate": True
+                })
+            }
 
-        response = requests.post(api_url, json=payload, headers=headers)
+        (analyze_result, cache_hit), analyze_ms = analyze_future.result()
+        file_url, upload_ms = upload_future.result()
+
+        # 이미지 저장용 서버로 API 호출 (응답 데이터(JSON) 파싱)
+        data, registry_ms = _timed(
+            register_item, file_url, analyze_result, processed["phash"], device_name,
+            content_hash(image_data), _idempotency_key(event)
+        )
 
-        # 응답 데이터(JSON) 파싱
-        data = response.json()
         category = data.get('category')
         locker_number = data.get('locker_number')
 
+        # 단계별 소요시간 (ms)
+        timings = {
+            "preprocess_ms": preprocess_ms,
+            "duplicate_lookup_ms": lookup_ms,
+            "analysis_ms": analyze_ms,  # Bedrock 호출 또는 캐시 조회
+            "s3_upload_ms": upload_ms,
+            "registry_ms": registry_ms,
+            "total_ms": round((time.perf_counter() - pipeline_started) * 1000, 1)
+        }
+        print(f"처리 시간: {json.dumps(timings)}")
+        print(
+            f"분석 캐시: hit={cache_hit}, hit_rate={analysis_cache.hit_rate()}, "
+            f"stats={json.dumps(analysis_cache.stats)}"
+        )
+
+        # 전처리 효과 (전송 바이트 / 이미지 토큰 절감량)
+        image_metrics = {
+            "original_bytes": processed["original_bytes"],
+            "processed_bytes": processed["processed_bytes"],
+            "bytes_saved": processed["original_bytes"] - processed["processed_bytes"],
+            "image_tokens_saved": processed["image_tokens_saved"],
+            "phash": processed["phash"]
+        }
+        print(f"이미지 전처리: {json.dumps(image_metrics)}")
+
         # API 응답값 세팅
         response = {
             "category" : category,
             "locker_number" : locker_number,
-            "image_url" : file_url
+            "image_url" : file_url,
+            "timings" : timings,
+            "analysis_cache_hit" : cache_hit,
+            "image" : image_metrics
         }
 
         return {
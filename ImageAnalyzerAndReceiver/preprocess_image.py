@@ -0,0 +1,102 @@
+import io
+import os
+
+try:
+    from PIL import Image, ImageOps
+except ImportError as e:
+    print(f"Pillow 로드 실패 (전처리 없이 원본 사용): {e}")
+    Image = None
+
+# 전처리 설정
+IMAGE_MAX_EDGE = int(os.environ.get('IMAGE_MAX_EDGE', 1024))  # 긴 변 최대 픽셀
+IMAGE_JPEG_QUALITY = int(os.environ.get('IMAGE_JPEG_QUALITY', 85))
+
+# 파일 시그니처 -> media_type
+_SIGNATURES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+
+def detect_media_type(image_data):
+    """파일 시그니처로 실제 이미지 형식 판별 (알 수 없으면 image/jpeg)"""
+    for signature, media_type in _SIGNATURES:
+        if image_data.startswith(signature):
+            return media_type
+
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return 'image/webp'
+
+    return 'image/jpeg'
+
+
+def estimate_image_tokens(width, height):
+    """Claude 이미지 토큰 수 추정 (약 width * height / 750)"""
+    return int(width * height / 750)
+
+
+def dhash(image, hash_size=8):
+    """
+    difference hash(64bit) 계산
+    - 리사이즈/재인코딩에도 거의 변하지 않아 중복 이미지 판별에 사용
+    """
+    gray = image.convert('L').resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = list(gray.getdata())
+
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+
+    return f"{value:016x}"
+
+
+def preprocess_image(image_data):
+    """
+    Bedrock 전송용 이미지 전처리
+    - 실제 형식 판별, 긴 변을 IMAGE_MAX_EDGE로 축소, JPEG 재인코딩, perceptual hash 계산
+    - 원본은 변경하지 않음 (S3에는 원본 보관)
+    """
+    media_type = detect_media_type(image_data)
+
+    result = {
+        "data": image_data,
+        "media_type": media_type,
+        "original_media_type": media_type,
+        "original_bytes": len(image_data),
+        "processed_bytes": len(image_data),
+        "phash": None,
+        "image_tokens_saved": 0
+    }
+
+    if Image is None:
+        return result
+
+    image = Image.open(io.BytesIO(image_data))
+    image = ImageOps.exif_transpose(image)
+    original_size = image.size
+
+    result["phash"] = dhash(image)
+
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    image.thumbnail((IMAGE_MAX_EDGE, IMAGE_MAX_EDGE), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=IMAGE_JPEG_QUALITY, optimize=True)
+    processed = buffer.getvalue()
+
+    # 재인코딩 결과가 더 크면 원본 그대로 사용
+    if len(processed) < len(image_data):
+        result["data"] = processed
+        result["media_type"] = 'image/jpeg'
+        result["processed_bytes"] = len(processed)
+        result["image_tokens_saved"] = (
+            estimate_image_tokens(*original_size) - estimate_image_tokens(*image.size)
+        )
+
+    return result
@@ -0,0 +1,53 @@
+import requests
+
+# 이미지 저장용 서버(ItemRegister) API
+REGISTRY_API_URL = "https://vwfopg9nxh.execute-api.us-west-2.amazonaws.com/v1/images/registry"
+HEADERS = {
+    "Content-Type": "application/json"
+}
+
+
+def find_registered_duplicate(phash, device_name=None):
+    """
+    ItemRegister에 같은 기기의 최근 유사 이미지가 있는지 조회 (실패 시 None -> 정상 등록 진행)
+    device_name이 없으면 ItemRegister의 기본 기기로 조회
+    """
+    if not phash:
+        return None
+
+    try:
+        response = requests.post(
+            REGISTRY_API_URL,
+            json={"phash": phash, "lookup_only": True, "device_name": device_name},
+            headers=HEADERS,
+            timeout=3
+        )
+        data = response.json()
+        return data if data.get('duplicate') else None
+    except Exception as e:
+        print(f"중복 조회 실패 (무시하고 진행): {e}")
+        return None
+
+
+def register_item(file_url, analysis_result, phash, device_name=None, image_sha256=None, idempotency_key=None):
+    """
+    ItemRegister에 분실물 등록 후 응답(JSON) 반환 (device_name: 이미지를 보낸 키오스크 기기)
+    - image_sha256: 원본 이미지 SHA-256. ItemRegister는 이 값과 기기로 재시도 요청을 같은 요청으로 판단
+      (file_url은 업로드마다 새 uuid라 재시도마다 달라짐)
+    - idempotency_key: 키오스크가 보낸 키, 없으면 image_sha256을 키로 사용
+    - ItemRegister가 오류(4xx/5xx)를 반환하면 예외 발생
+    """
+    payload = {
+        "file_url": file_url,
+        "analysis_result": analysis_result,
+        "phash": phash,
+        "device_name": device_name,
+        "image_sha256": image_sha256
+    }
+
+    idempotency_key = idempotency_key or image_sha256
+    headers = dict(HEADERS, **{"Idempotency-Key": idempotency_key}) if idempotency_key else HEADERS
+
+    response = requests.post(REGISTRY_API_URL, json=payload, headers=headers)
+    response.raise_for_status()
+    return response.json()
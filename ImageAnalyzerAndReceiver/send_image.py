@@ -9,14 +9,23 @@ s3_client = boto3.client('s3')
 """이미지를 S3에 저장하고 URL 반환"""
 
 
-def upload_image(image_data):
-    file_name = str(uuid.uuid4()) + ".jpg"
+# media_type -> 파일 확장자
+EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp'
+}
+
+
+def upload_image(image_data, media_type='image/jpeg'):
+    file_name = str(uuid.uuid4()) + EXTENSIONS.get(media_type, '.jpg')
 
     s3_client.put_object(
         Bucket=S3_BUCKET,
         Key=file_name,
         Body=image_data,
-        ContentType='image/jpeg'
+        ContentType=media_type
     )
 
     file_url = f"https://{S3_BUCKET}.s3.amazonaws.com/{file_name}"
@@ -0,0 +1,148 @@
+import re
+import json
+
+# 분석 결과 필드
+REQUIRED_FIELDS = ("category", "brand", "description")
+UNKNOWN_BRAND = "알 수 없음"
+
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+_SMART_QUOTES = str.maketrans({'“': '"', '”': '"'})
+
+
+class AnalysisFormatError(ValueError):
+    """모델 응답에서 유효한 분석 결과(JSON)를 얻지 못한 경우"""
+
+
+class JSONExtractor:
+    """
+    스트리밍 텍스트에서 최상위 JSON 객체/배열을 점진적으로 추출
+    - 앞뒤 설명 문장, 코드 블록(```json) 등은 무시
+    - 닫는 괄호가 도착하는 즉시 후보 문자열을 돌려줌
+    """
+
+    def __init__(self, opener='{'):
+        self.opener = opener
+        self.closer = '}' if opener == '{' else ']'
+        self.reset()
+
+    def reset(self):
+        self.buffer = []
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+
+    def feed(self, text):
+        """텍스트 조각을 추가하고, 완성된 후보 JSON 문자열 목록을 반환"""
+        candidates = []
+
+        for char in text:
+            if self.depth == 0:
+                if char == self.opener:
+                    self.buffer = [char]
+                    self.depth = 1
+                continue
+
+            self.buffer.append(char)
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.depth += 1
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    candidates.append(''.join(self.buffer))
+                    self.reset()
+
+        return candidates
+
+
+def parse_candidate(candidate):
+    """후보 문자열을 JSON으로 파싱 (실패 시 1회 보정 후 재시도, 그래도 실패하면 None)"""
+    try:
+        return json.loads(candidate)
+    except ValueError:
+        pass
+
+    repaired = _TRAILING_COMMA.sub(r'\1', candidate.translate(_SMART_QUOTES))
+    try:
+        return json.loads(repaired)
+    except ValueError:
+        return None
+
+
+def validate_analysis(data):
+    """
+    분석 결과 스키마 검증 및 정규화
+    - category는 필수, brand가 비어있으면 '알 수 없음', description이 없으면 빈 문자열
+    """
+    if not isinstance(data, dict):
+        raise AnalysisFormatError("분석 결과가 JSON 객체가 아닙니다")
+
+    category = data.get("category")
+    if not isinstance(category, str) or not category.strip():
+        raise AnalysisFormatError("category가 비어있습니다")
+
+    brand = data.get("brand")
+    description = data.get("description")
+
+    result = dict(data)
+    result["category"] = category.strip()
+    result["brand"] = brand.strip() if isinstance(brand, str) and brand.strip() else UNKNOWN_BRAND
+    result["description"] = description.strip() if isinstance(description, str) else ""
+    return result
+
+
+def extract_analysis(text):
+    """모델 응답 전체 텍스트에서 첫 번째 유효한 분석 결과를 추출"""
+    return extract_analysis_from_stream([text])
+
+
+def extract_analysis_from_stream(chunks):
+    """
+    텍스트 조각 스트림에서 유효한 분석 결과가 완성되는 즉시 반환
+    (남은 스트림은 읽지 않음)
+    """
+    extractor = JSONExtractor('{')
+    last_error = AnalysisFormatError("응답에서 JSON 객체를 찾을 수 없습니다")
+
+    for chunk in chunks:
+        for candidate in extractor.feed(chunk):
+            data = parse_candidate(candidate)
+            if data is None:
+                last_error = AnalysisFormatError(f"JSON 파싱 실패: {candidate[:100]}")
+                continue
+            try:
+                return validate_analysis(data)
+            except AnalysisFormatError as e:
+                last_error = e
+
+    raise last_error
+
+
+def extract_batch_analysis(text):
+    """배치 응답 텍스트에서 [{id, category, brand, description}, ...] 배열을 추출"""
+    for candidate in JSONExtractor('[').feed(text):
+        data = parse_candidate(candidate)
+        if isinstance(data, list):
+            results = {}
+            for entry in data:
+                if not isinstance(entry, dict) or 'id' not in entry:
+                    continue
+                try:
+                    result = validate_analysis(entry)
+                except AnalysisFormatError:
+                    continue
+                results[str(result.pop('id'))] = result
+            return results
+
+    raise AnalysisFormatError("응답에서 JSON 배열을 찾을 수 없습니다")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Lambda 배포 디렉터리(ImageAnalyzerAndReceiver)의 모듈을 그대로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
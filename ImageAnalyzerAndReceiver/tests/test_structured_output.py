@@ -0,0 +1,171 @@
+import pytest
+
+from structured_output import (
+    UNKNOWN_BRAND,
+    AnalysisFormatError,
+    JSONExtractor,
+    extract_analysis,
+    extract_analysis_from_stream,
+    extract_batch_analysis,
+    validate_analysis,
+)
+
+# ============================================================
+# 깨진/지저분한 Bedrock 응답 모음: (이름, 응답 텍스트, 기대 결과)
+# ============================================================
+MALFORMED_RESPONSES = [
+    (
+        "plain",
+        '{"category": "지갑", "brand": "구찌", "description": "검은색 반지갑"}',
+        {"category": "지갑", "brand": "구찌", "description": "검은색 반지갑"},
+    ),
+    (
+        "prose_before_and_after",
+        '분석 결과는 다음과 같습니다:\n{"category": "우산", "brand": "", "description": "파란 장우산"}\n추가로 궁금한 점이 있으면 말씀해 주세요.',
+        {"category": "우산", "brand": UNKNOWN_BRAND, "description": "파란 장우산"},
+    ),
+    (
+        "code_fence",
+        '```json\n{"category": "에어팟", "brand": "Apple", "description": "흰색 케이스"}\n```',
+        {"category": "에어팟", "brand": "Apple", "description": "흰색 케이스"},
+    ),
+    (
+        "trailing_comma",
+        '{"category": "카드", "brand": "신한", "description": "체크카드",}',
+        {"category": "카드", "brand": "신한", "description": "체크카드"},
+    ),
+    (
+        "trailing_comma_in_nested_array",
+        '{"category": "가방", "brand": "나이키", "description": "백팩", "colors": ["검정", "회색",],}',
+        {"category": "가방", "brand": "나이키", "description": "백팩", "colors": ["검정", "회색"]},
+    ),
+    (
+        "smart_quotes",
+        '{“category”: “학생증”, “brand”: “인하대학교”, “description”: “사진 있음”}',
+        {"category": "학생증", "brand": "인하대학교", "description": "사진 있음"},
+    ),
+    (
+        "braces_inside_strings",
+        '{"category": "노트북", "brand": "LG", "description": "스티커 {gram} 과 ] 문자가 붙어 있음"}',
+        {"category": "노트북", "brand": "LG", "description": "스티커 {gram} 과 ] 문자가 붙어 있음"},
+    ),
+    (
+        "escaped_quotes_and_backslash",
+        '{"category": "휴대폰", "brand": "삼성", "description": "케이스에 \\"INHA\\" 각인, 경로 C:\\\\ 표시"}',
+        {"category": "휴대폰", "brand": "삼성", "description": "케이스에 \"INHA\" 각인, 경로 C:\\ 표시"},
+    ),
+    (
+        "escaped_brace_before_closing",
+        '{"category": "지갑", "brand": "", "description": "끝이 역슬래시\\\\"}',
+        {"category": "지갑", "brand": UNKNOWN_BRAND, "description": "끝이 역슬래시\\"},
+    ),
+    (
+        "first_object_invalid_second_valid",
+        '예시: {"category": ""} 실제 결과: {"category": "우산", "brand": "버버리", "description": "체크무늬"}',
+        {"category": "우산", "brand": "버버리", "description": "체크무늬"},
+    ),
+    (
+        "whitespace_padding_and_missing_fields",
+        '  {"category": "  텀블러  ", "brand": "   "}  ',
+        {"category": "텀블러", "brand": UNKNOWN_BRAND, "description": ""},
+    ),
+]
+
+UNRECOVERABLE_RESPONSES = [
+    ("no_json", "죄송합니다. 이미지를 분석할 수 없습니다."),
+    ("truncated", '{"category": "지갑", "brand": "구찌", "description": "검은'),
+    ("missing_category", '{"brand": "구찌", "description": "검은색 반지갑"}'),
+    ("not_json_inside_braces", "{category: 지갑, brand: 구찌}"),
+    ("array_without_object", '["지갑", "구찌", "검은색 반지갑"]'),
+]
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("name, text, expected", MALFORMED_RESPONSES, ids=[case[0] for case in MALFORMED_RESPONSES])
+def test_extract_analysis_recovers_malformed_responses(name, text, expected):
+    assert extract_analysis(text) == expected
+
+
+@pytest.mark.parametrize("name, text, expected", MALFORMED_RESPONSES, ids=[case[0] for case in MALFORMED_RESPONSES])
+@pytest.mark.parametrize("size", [1, 2, 3, 7])
+def test_stream_split_mid_token_matches_full_text(name, text, expected, size):
+    # 문자열/이스케이프/괄호 한가운데에서 잘린 조각이어도 결과가 같아야 함
+    assert extract_analysis_from_stream(_chunks(text, size)) == expected
+
+
+@pytest.mark.parametrize("name, text", UNRECOVERABLE_RESPONSES, ids=[case[0] for case in UNRECOVERABLE_RESPONSES])
+def test_extract_analysis_raises_on_unrecoverable_responses(name, text):
+    with pytest.raises(AnalysisFormatError):
+        extract_analysis(text)
+
+
+def test_stream_returns_as_soon_as_object_closes():
+    consumed = []
+
+    def stream():
+        for chunk in ['앞말 {"category": "지갑", ', '"brand": "", "description": "x"}', ' 뒷말', ' 더 읽으면 안 됨']:
+            consumed.append(chunk)
+            yield chunk
+
+    assert extract_analysis_from_stream(stream())["category"] == "지갑"
+    assert len(consumed) == 2
+
+
+def test_json_extractor_tracks_state_across_feeds():
+    extractor = JSONExtractor('{')
+
+    assert extractor.feed('설명 {"a": "}{') == []
+    assert extractor.feed('\\"", "b": {"c": [1, 2]}') == []
+    assert extractor.feed('} 그리고 {"d": 1}') == ['{"a": "}{\\"", "b": {"c": [1, 2]}}', '{"d": 1}']
+
+
+def test_json_extractor_ignores_closers_before_first_opener():
+    assert JSONExtractor('{').feed('}] ] {"a": 1}') == ['{"a": 1}']
+
+
+def test_json_extractor_array_mode_includes_nested_objects():
+    assert JSONExtractor('[').feed('결과: [{"id": 1}, {"id": "2]"}] 끝') == ['[{"id": 1}, {"id": "2]"}]']
+
+
+def test_validate_analysis_normalizes_fields_and_keeps_extras():
+    result = validate_analysis({"category": " 지갑 ", "brand": None, "description": 3, "color": "검정"})
+    assert result == {"category": "지갑", "brand": UNKNOWN_BRAND, "description": "", "color": "검정"}
+
+
+@pytest.mark.parametrize("data", [None, [], "지갑", {"category": None}, {"category": "   "}, {"category": 1}])
+def test_validate_analysis_rejects_invalid(data):
+    with pytest.raises(AnalysisFormatError):
+        validate_analysis(data)
+
+
+def test_extract_batch_analysis_with_prose_fence_and_trailing_commas():
+    text = (
+        "다음은 이미지별 결과입니다.\n```json\n"
+        '[\n'
+        '  {"id": "a", "category": "지갑", "brand": "구찌", "description": "검정 {반지갑}",},\n'
+        '  {"id": 2, "category": "우산", "brand": "", "description": "파랑"},\n'
+        ']\n```'
+    )
+    assert extract_batch_analysis(text) == {
+        "a": {"category": "지갑", "brand": "구찌", "description": "검정 {반지갑}"},
+        "2": {"category": "우산", "brand": UNKNOWN_BRAND, "description": "파랑"},
+    }
+
+
+def test_extract_batch_analysis_skips_invalid_entries():
+    text = '[{"id": "a", "category": ""}, {"category": "우산"}, "문자열", {"id": "b", "category": "카드"}]'
+    assert extract_batch_analysis(text) == {"b": {"category": "카드", "brand": UNKNOWN_BRAND, "description": ""}}
+
+
+def test_extract_batch_analysis_skips_unparseable_array_before_valid_one():
+    text = '[잘못된 배열] 정정: [{"id": "x", "category": "학생증"}]'
+    assert extract_batch_analysis(text) == {"x": {"category": "학생증", "brand": UNKNOWN_BRAND, "description": ""}}
+
+
+@pytest.mark.parametrize("text", ["배열이 없습니다", '{"id": "a", "category": "지갑"}', '[{"id": "a",'])
+def test_extract_batch_analysis_raises_without_array(text):
+    with pytest.raises(AnalysisFormatError):
+        extract_batch_analysis(text)
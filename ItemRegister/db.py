@@ -0,0 +1,101 @@
+import os
+import time
+import psycopg2
+
+# RDS 환경 변수
+RDS_HOST = os.environ['RDS_HOST']
+RDS_DB = os.environ['RDS_DB']
+RDS_USER = os.environ['RDS_USER']
+RDS_PASSWORD = os.environ['RDS_PASSWORD']
+RDS_PORT = int(os.environ['RDS_PORT'])
+
+# 커넥션 재사용 설정
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 60 * 30))  # 초 단위
+DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 5))
+# RDS Proxy 등 외부 풀러 사용 시 true -> 매 호출마다 연결/해제
+DB_USE_EXTERNAL_POOLER = os.environ.get('DB_USE_EXTERNAL_POOLER', 'false').lower() == 'true'
+
+# warm 컨테이너에서 재사용할 커넥션 (핸들러 밖 전역 변수)
+_conn = None
+_conn_created_at = 0.0
+
+# 커넥션 재사용 통계 (hit: 재사용, miss: 새로 연결)
+pool_stats = {"hits": 0, "misses": 0}
+
+
+def _connect():
+    conn = psycopg2.connect(
+        host=RDS_HOST,
+        database=RDS_DB,
+        user=RDS_USER,
+        password=RDS_PASSWORD,
+        port=RDS_PORT,
+        connect_timeout=DB_CONNECT_TIMEOUT
+    )
+    # 등록은 단일 SQL 문이므로 별도 COMMIT 왕복 없이 문장 단위로 커밋
+    conn.autocommit = True
+    return conn
+
+
+def _is_usable(conn) -> bool:
+    """커넥션이 살아있고 재활용 주기가 지나지 않았는지 확인"""
+    if conn is None or conn.closed:
+        return False
+
+    if time.time() - _conn_created_at > DB_POOL_RECYCLE:
+        return False
+
+    if DB_POOL_PRE_PING:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except psycopg2.Error:
+            return False
+
+    return True
+
+
+def get_connection():
+    """
+    DB 커넥션을 반환합니다.
+    warm 컨테이너에서는 이전 호출의 커넥션을 재사용합니다.
+    """
+    global _conn, _conn_created_at
+
+    if not DB_USE_EXTERNAL_POOLER and _is_usable(_conn):
+        pool_stats["hits"] += 1
+        return _conn
+
+    close_connection()
+
+    _conn = _connect()
+    _conn_created_at = time.time()
+    pool_stats["misses"] += 1
+    return _conn
+
+
+def release_connection(conn, failed: bool = False):
+    """
+    호출이 끝난 커넥션을 반납합니다.
+    - 외부 풀러 모드이거나 오류가 난 경우에는 커넥션을 닫습니다.
+    """
+    if failed:
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            pass
+
+    if DB_USE_EXTERNAL_POOLER or failed:
+        close_connection()
+
+
+def close_connection():
+    global _conn
+
+    if _conn is not None:
+        try:
+            _conn.close()
+        except psycopg2.Error:
+            pass
+    _conn = None
@@ -0,0 +1,132 @@
+import os
+from datetime import datetime, timedelta
+
+# 중복 판정 설정
+DUPLICATE_WINDOW_SECONDS = int(os.environ.get('DUPLICATE_WINDOW_SECONDS', 600))  # 같은 기기에서 이 시간 내 재촬영만 중복으로 봄
+DUPLICATE_MAX_DISTANCE = int(os.environ.get('DUPLICATE_MAX_DISTANCE', 2))  # 64bit perceptual hash 허용 해밍 거리 (같은 배경의 다른 물건과 구분되도록 작게)
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """
+    해밍 거리 기반 BK-tree
+    - 거리 d 이내 검색 시 삼각부등식으로 대부분의 노드를 건너뜀
+    """
+
+    def __init__(self):
+        self.root = None  # (hash, payload, {distance: child})
+
+    def add(self, hash_value, payload):
+        node = (hash_value, payload, {})
+        if self.root is None:
+            self.root = node
+            return
+
+        current = self.root
+        while True:
+            distance = hamming_distance(hash_value, current[0])
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, hash_value, max_distance):
+        """max_distance 이내의 (거리, payload) 목록 반환"""
+        if self.root is None:
+            return []
+
+        results = []
+        stack = [self.root]
+        while stack:
+            node_hash, payload, children = stack.pop()
+            distance = hamming_distance(hash_value, node_hash)
+            if distance <= max_distance:
+                results.append((distance, payload))
+
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+
+        return results
+
+
+class DuplicateIndex:
+    """
+    기기(device_name)별 최근 등록 이미지의 perceptual hash 인덱스
+    - warm 컨테이너에서 유지하며, 호출마다 새로 등록된 행만 DB에서 읽어 추가
+    - 윈도우를 벗어난 항목이 생기면 트리를 재구성
+    """
+
+    def __init__(self):
+        self.devices = {}  # device_name -> {"tree", "entries", "last_id"}
+
+    def _refresh(self, cursor, device_name, now):
+        state = self.devices.setdefault(device_name, {"tree": BKTree(), "entries": [], "last_id": 0})
+        window_start = now - timedelta(seconds=DUPLICATE_WINDOW_SECONDS)
+
+        sql = """
+        SELECT li.id, li.photo_phash, li.photo_url, li.registered_at, t.name,
+               COALESCE(li.locker_id, t.locker_number)
+        FROM lostitems li
+        LEFT JOIN lostitem_tags lt ON lt.lost_item_id = li.id
+        LEFT JOIN tags t ON t.id = lt.tag_id
+        WHERE li.device_name = %s
+          AND li.registered_at >= %s
+          AND li.id > %s
+          AND li.photo_phash IS NOT NULL
+        ORDER BY li.id;
+        """
+        cursor.execute(sql, (device_name, window_start, state["last_id"]))
+
+        new_entries = []
+        for item_id, phash, photo_url, registered_at, category, locker_number in cursor.fetchall():
+            state["last_id"] = max(state["last_id"], item_id)
+            if new_entries and new_entries[-1]["item_id"] == item_id:
+                continue  # 태그가 여러 개인 경우 첫 태그만 사용
+            new_entries.append({
+                "item_id": item_id,
+                "hash": int(phash, 16),
+                "photo_url": photo_url,
+                "registered_at": registered_at,
+                "category": category,
+                "locker_number": locker_number
+            })
+
+        live_entries = [e for e in state["entries"] if e["registered_at"] >= window_start]
+        if len(live_entries) != len(state["entries"]):
+            state["tree"] = BKTree()
+            for entry in live_entries:
+                state["tree"].add(entry["hash"], entry)
+
+        for entry in new_entries:
+            state["tree"].add(entry["hash"], entry)
+
+        state["entries"] = live_entries + new_entries
+        return state, window_start
+
+    def find_duplicate(self, cursor, device_name, phash):
+        """
+        같은 기기에서 윈도우 내 등록된, 해밍 거리가 가장 가까운 기존 항목을 반환 (없으면 None)
+        """
+        if not phash:
+            return None
+
+        now = datetime.now()
+        state, window_start = self._refresh(cursor, device_name, now)
+
+        matches = [
+            (distance, entry)
+            for distance, entry in state["tree"].search(int(phash, 16), DUPLICATE_MAX_DISTANCE)
+            if entry["registered_at"] >= window_start
+        ]
+        if not matches:
+            return None
+
+        return min(matches, key=lambda m: (m[0], -m[1]["item_id"]))[1]
+
+
+duplicate_index = DuplicateIndex()
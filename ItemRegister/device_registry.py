@@ -0,0 +1,44 @@
+import os
+import time
+
+# 기기 등록부(devices 테이블)를 다시 읽는 주기 (초)
+DEVICE_REGISTRY_TTL_SECONDS = int(os.environ.get('DEVICE_REGISTRY_TTL_SECONDS', 300))
+
+# 요청에 device_name이 없을 때(기존 단일 기기 구성) 사용할 기기와 위치
+DEFAULT_DEVICE_NAME = os.environ.get('DEFAULT_DEVICE_NAME', '60주년-1')
+DEFAULT_LOCATION = os.environ.get('DEFAULT_LOCATION', '60주년')
+
+
+class DeviceRegistry:
+    """
+    device_name -> 설치 위치 캐시
+    - warm 컨테이너에서 유지하며, TTL이 지났을 때만 전체 기기 목록을 한 번에 다시 읽음
+    """
+
+    def __init__(self):
+        self.locations = {}
+        self.expires_at = 0.0
+
+    def _load(self, cursor):
+        cursor.execute("SELECT device_name, location FROM devices WHERE is_active;")
+        self.locations = dict(cursor.fetchall())
+        self.expires_at = time.time() + DEVICE_REGISTRY_TTL_SECONDS
+
+    def resolve(self, cursor, device_name):
+        """
+        (device_name, location) 반환
+        - device_name이 없으면 기본 기기, 등록부에 위치가 없으면 기본 기기만 기본 위치 사용
+        """
+        device_name = device_name or DEFAULT_DEVICE_NAME
+
+        if self.expires_at <= time.time():
+            self._load(cursor)
+
+        location = self.locations.get(device_name)
+        if location is None and device_name == DEFAULT_DEVICE_NAME:
+            location = DEFAULT_LOCATION
+
+        return device_name, location
+
+
+device_registry = DeviceRegistry()
@@ -0,0 +1,171 @@
+import os
+import json
+import time
+import hashlib
+from datetime import datetime, timedelta
+from db import get_connection, release_connection
+
+# Idempotency-Key 설정 (LostFoundAPI와 같은 idempotency_keys 테이블 사용)
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', 86400))  # 첫 응답을 재사용하는 기간
+IDEMPOTENCY_LOCK_SECONDS = int(os.environ.get('IDEMPOTENCY_LOCK_SECONDS', 30))  # 처리 중 비정상 종료 시 재처리 허용 시간
+IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get('IDEMPOTENCY_WAIT_SECONDS', 5))  # 처리 중인 같은 키를 기다리는 최대 시간
+
+# begin() 결과
+NEW = "NEW"
+REPLAY = "REPLAY"
+BUSY = "BUSY"
+MISMATCH = "MISMATCH"
+
+# 키 선점 (이미 있으면 아무것도 하지 않음)
+CLAIM_SQL = """
+INSERT INTO idempotency_keys (key, request_hash, status, locked_until, expires_at, created_at, updated_at)
+VALUES (%(key)s, %(request_hash)s, 'IN_PROGRESS', %(locked_until)s, %(expires_at)s, %(now)s, %(now)s)
+ON CONFLICT (key) DO NOTHING
+RETURNING id;
+"""
+
+# 만료되었거나, 같은 요청이 처리 중 비정상 종료된 키만 다시 선점
+RECLAIM_SQL = """
+UPDATE idempotency_keys
+SET request_hash = %(request_hash)s,
+    status = 'IN_PROGRESS',
+    locked_until = %(locked_until)s,
+    expires_at = %(expires_at)s,
+    response_status = NULL,
+    response_headers = NULL,
+    response_body = NULL,
+    updated_at = %(now)s
+WHERE key = %(key)s
+  AND (expires_at <= %(now)s
+       OR (status = 'IN_PROGRESS' AND locked_until <= %(now)s AND request_hash = %(request_hash)s))
+RETURNING id;
+"""
+
+SELECT_SQL = """
+SELECT request_hash, status, response_status, response_body
+FROM idempotency_keys
+WHERE key = %(key)s;
+"""
+
+COMPLETE_SQL = """
+UPDATE idempotency_keys
+SET status = 'COMPLETED',
+    locked_until = NULL,
+    response_status = %(status)s,
+    response_headers = %(headers)s,
+    response_body = %(body)s,
+    updated_at = %(now)s
+WHERE key = %(key)s;
+"""
+
+RELEASE_SQL = "DELETE FROM idempotency_keys WHERE key = %(key)s AND status = 'IN_PROGRESS';"
+
+
+def storage_key(idempotency_key):
+    return hashlib.sha256(f"registry\n{idempotency_key}".encode()).hexdigest()
+
+
+def request_hash(body):
+    """
+    요청을 식별하는 값(원본 이미지 SHA-256 + 기기)만으로 해시합니다.
+    - file_url(업로드마다 새 uuid)과 analysis_result(모델 응답)는 재시도마다 달라지므로 제외
+    - image_sha256을 보내지 않는 호출자는 perceptual hash로 대신 식별
+    """
+    identity = {
+        "image": body.get('image_sha256') or body.get('phash'),
+        "device_name": body.get('device_name')
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+
+def _begin_once(key, body_hash):
+    now = datetime.utcnow()
+    params = {
+        "key": key,
+        "request_hash": body_hash,
+        "locked_until": now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS),
+        "expires_at": now + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS),
+        "now": now
+    }
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    failed = True
+
+    try:
+        cursor.execute(CLAIM_SQL, params)
+        claimed = cursor.fetchone()
+
+        if claimed is None:
+            cursor.execute(RECLAIM_SQL, params)
+            claimed = cursor.fetchone()
+
+        if claimed is not None:
+            failed = False
+            return NEW, None
+
+        cursor.execute(SELECT_SQL, params)
+        row = cursor.fetchone()
+        failed = False
+
+        # 처리 중이던 요청이 실패해 키가 방금 해제됨 -> 다음 시도에서 다시 선점
+        if row is None:
+            return BUSY, None
+
+        stored_hash, status, response_status, response_body = row
+        if stored_hash != body_hash:
+            return MISMATCH, None
+        if status == 'COMPLETED':
+            return REPLAY, (response_status, response_body)
+        return BUSY, None
+
+    finally:
+        cursor.close()
+        release_connection(conn, failed=failed)
+
+
+def begin(key, body_hash):
+    """
+    키를 선점하거나 저장된 응답을 조회합니다.
+    - 같은 키의 요청이 처리 중이면 최대 IDEMPOTENCY_WAIT_SECONDS 동안 기다립니다.
+    Returns: (NEW / REPLAY / BUSY / MISMATCH, REPLAY일 때 (status, body))
+    """
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+    delay = 0.05
+
+    while True:
+        state, stored = _begin_once(key, body_hash)
+        if state != BUSY or time.monotonic() >= deadline:
+            return state, stored
+
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+
+def _execute(sql, params):
+    conn = get_connection()
+    cursor = conn.cursor()
+    failed = True
+
+    try:
+        cursor.execute(sql, params)
+        failed = False
+    finally:
+        cursor.close()
+        release_connection(conn, failed=failed)
+
+
+def complete(key, status, body):
+    """처리 결과(응답)를 저장 -> 같은 키의 재시도는 이 응답을 그대로 받음"""
+    _execute(COMPLETE_SQL, {
+        "key": key,
+        "status": status,
+        "headers": json.dumps([["content-type", "application/json"]]),
+        "body": body,
+        "now": datetime.utcnow()
+    })
+
+
+def release(key):
+    """처리 실패 시 키를 해제 -> 재시도에서 다시 처리"""
+    _execute(RELEASE_SQL, {"key": key})
@@ -1,98 +1,129 @@
-import psycopg2
 from datetime import datetime
-import os
-
-# RDS 환경 변수
-RDS_HOST = os.environ['RDS_HOST']
-RDS_DB = os.environ['RDS_DB']
-RDS_USER = os.environ['RDS_USER']
-RDS_PASSWORD = os.environ['RDS_PASSWORD']
-RDS_PORT = int(os.environ['RDS_PORT'])
-
-
-def insert_lost_item(file_url, category, description):
-    """LostItems 테이블에 데이터 저장"""
-    # DB 연결
-    conn = psycopg2.connect(
-        host=RDS_HOST,
-        database=RDS_DB,
-        user=RDS_USER,
-        password=RDS_PASSWORD,
-        port=RDS_PORT
-    )
+from db import get_connection, release_connection
+from dedupe import duplicate_index
+from device_registry import DEFAULT_DEVICE_NAME, device_registry
 
-    try:
-        cursor = conn.cursor()
 
-        # Tag 찾기
-        sql = """
-        SELECT id, locker_number FROM tags WHERE name = %s;
-        """
+def find_duplicate_item(phash, device_name=None):
+    """
+    같은 기기에서 최근 등록된 유사 이미지(perceptual hash)가 있으면 해당 항목 반환
+    반환값: {"item_id", "photo_url", "category", "locker_number", ...} 또는 None
+    """
+    if not phash:
+        return None
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    failed = True
 
-        cursor.execute(sql, (category,))
+    try:
+        duplicate = duplicate_index.find_duplicate(cursor, device_name or DEFAULT_DEVICE_NAME, phash)
+        failed = False
+        return duplicate
 
+    finally:
+        cursor.close()
+        release_connection(conn, failed=failed)
+
+
+# 태그 조회 + 사물함 칸 예약 + LostItems 삽입 + LostItems_Tags 삽입을 한 번의 왕복으로 처리하는 CTE
+# - 태그가 없으면 아무것도 삽입되지 않고 결과 행이 없음
+# - 사물함 칸은 태그 기본 칸에 여유가 있으면 우선, 아니면 남은 용량이 가장 큰 칸을 예약
+#   (다른 등록이 잠근 칸은 SKIP LOCKED로 건너뛰므로 대기하지 않음)
+# - 기기에 등록된 빈 칸이 없으면 locker_id는 NULL, 사물함 번호는 태그 기본값을 반환
+INSERT_ITEM_SQL = """
+WITH tag AS (
+    SELECT id, locker_number FROM tags WHERE name = %(category)s
+),
+slot AS (
+    SELECT l.id, l.locker_number
+    FROM lockers l, tag
+    WHERE l.device_name = %(device_name)s
+      AND l.is_active
+      AND l.occupancy < l.capacity
+    ORDER BY (l.locker_number = tag.locker_number) DESC,
+             (l.capacity - l.occupancy) DESC,
+             l.locker_number
+    LIMIT 1
+    FOR UPDATE OF l SKIP LOCKED
+),
+reserve AS (
+    UPDATE lockers
+    SET occupancy = lockers.occupancy + 1,
+        updated_at = %(now)s
+    FROM slot
+    WHERE lockers.id = slot.id
+    RETURNING lockers.locker_number
+),
+item AS (
+    INSERT INTO lostitems (
+        photo_url,
+        photo_phash,
+        device_name,
+        location,
+        locker_id,
+        registered_at,
+        description,
+        status,
+        created_at,
+        updated_at
+    )
+    SELECT %(file_url)s, %(phash)s, %(device_name)s, %(location)s,
+           (SELECT locker_number FROM reserve), %(now)s,
+           %(description)s, %(status)s, %(now)s, %(now)s
+    FROM tag
+    RETURNING id, locker_id
+),
+link AS (
+    INSERT INTO lostitem_tags (
+        lost_item_id,
+        tag_id,
+        created_at,
+        updated_at
+    )
+    SELECT item.id, tag.id, %(now)s, %(now)s
+    FROM item, tag
+    RETURNING id
+)
+SELECT item.id, COALESCE(item.locker_id, tag.locker_number) FROM item, tag;
+"""
+
+
+def insert_lost_item(file_url, category, description, phash=None, device_name=None):
+    """
+    LostItems 테이블에 데이터 저장 (단일 SQL 문, autocommit)
+    - device_name: 촬영한 기기 (없으면 기본 기기), 위치는 기기 등록부 캐시에서 결정
+    """
+    # DB 연결 (warm 컨테이너면 기존 커넥션 재사용)
+    conn = get_connection()
+    cursor = conn.cursor()
+    failed = True
+
+    try:
+        device_name, location = device_registry.resolve(cursor, device_name)
+
+        params = {
+            "category": category,
+            "file_url": file_url,
+            "phash": phash,  # photo_phash (중복 판별용)
+            "device_name": device_name,
+            "location": location,
+            "now": datetime.now(),  # registered_at, created_at, updated_at
+            "description": description,
+            "status": '보관'  # default status
+        }
+
+        cursor.execute(INSERT_ITEM_SQL, params)
         row = cursor.fetchone()
 
-        tag_id = row[0]
-        locker_number = row[1]
-
-        # LostItems 레코드 삽입
-        sql = """
-        INSERT INTO lostitems (
-            photo_url,
-            device_name,
-            location,
-            registered_at,
-            description,
-            status,
-            created_at,
-            updated_at
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING id;
-        """
-
-        now = datetime.now()
-
-        params = (
-            file_url,
-            '60주년-1',  # device_name
-            '60주년',  # location
-            now,  # registered_at
-            description,  # description
-            '보관',  # default status
-            now,  # created_at
-            now  # updated_at
-        )
-
-        cursor.execute(sql, params)
-        lost_item_id = cursor.fetchone()[0]
-
-        # LostItems_Tags 레코드 삽입
-
-        sql = """
-        INSERT INTO lostitem_tags (
-            lost_item_id,
-            tag_id,
-            created_at,
-            updated_at
-        ) VALUES (%s, %s, %s, %s)
-        RETURNING id;
-        """
-
-        params = (
-            lost_item_id,
-            tag_id,
-            now,  # created_at
-            now  # updated_at
-        )
-
-        cursor.execute(sql, params)
-        lost_item_id = cursor.fetchone()[0]
-
-        conn.commit()
+        if row is None:
+            raise ValueError(f"등록되지 않은 태그입니다: {category}")
+
+        lost_item_id, locker_number = row
+        failed = False
 
         return locker_number
 
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn, failed=failed)
@@ -3,38 +3,132 @@ import boto3
 import base64
 from datetime import datetime
 import os
-from insert_item import insert_lost_item
+from insert_item import insert_lost_item, find_duplicate_item
+from db import pool_stats
+import idempotency
+
+
+def _json_response(status_code, payload):
+    return {
+        'statusCode': status_code,
+        'headers': {'Content-Type': 'application/json'},
+        'body': json.dumps(payload)
+    }
+
+
+def _idempotency_key(event):
+    """ImageAnalyzerAndReceiver가 보낸 Idempotency-Key 헤더 (없으면 None)"""
+    headers = {key.lower(): value for key, value in (event.get('headers') or {}).items()}
+    return headers.get('idempotency-key')
 
 
 def lambda_handler(event, context):
+    key = None
+
     try:
         # Request Body 값 추출
         body = json.loads(event['body'])
-        file_url = body.get('file_url')
-        analysis_result = body.get('analysis_result')
 
-        # DB에 데이터 저장
-        locker_number = insert_lost_item( # 사물함 번호 리턴
-            file_url=file_url,
-            category=analysis_result.get('category'),
-            description=analysis_result.get('description')
-        )
+        # 같은 Idempotency-Key로 재시도된 등록 요청이면 첫 응답을 그대로 반환
+        # (동시에 도착한 재시도는 첫 요청이 끝날 때까지 기다렸다가 같은 응답을 받음)
+        idempotency_key = None if body.get('lookup_only') else _idempotency_key(event)
+        if idempotency_key:
+            key = idempotency.storage_key(idempotency_key)
+            state, stored = idempotency.begin(key, idempotency.request_hash(body))
 
-        response = {
-            "category" : analysis_result.get('category'),
-            "locker_number" : locker_number
-        }
+            if state == idempotency.REPLAY:
+                print(f"Idempotency-Key 재사용: {idempotency_key}")
+                status_code, response_body = stored
+                return {
+                    'statusCode': status_code,
+                    'headers': {'Content-Type': 'application/json', 'Idempotent-Replayed': 'true'},
+                    'body': response_body
+                }
+            if state == idempotency.MISMATCH:
+                key = None
+                return _json_response(422, {"error": "같은 Idempotency-Key로 다른 요청이 이미 처리되었습니다."})
+            if state == idempotency.BUSY:
+                key = None
+                return _json_response(409, {"error": "같은 Idempotency-Key의 요청이 아직 처리 중입니다."})
 
-        return {
-            'statusCode': 200,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps(response)
-        }
+        result = _register(body)
+
+        if key:
+            idempotency.complete(key, result['statusCode'], result['body'])
+
+        return result
 
     except Exception as e:
         print(f"에러 발생: {str(e)}")
+        if key:
+            try:
+                idempotency.release(key)
+            except Exception as release_error:
+                print(f"Idempotency-Key 해제 실패: {str(release_error)}")
         return {
             'statusCode': 500,
             'body': json.dumps(f'처리 실패: {str(e)}')
         }
 
+
+def _lookup_duplicate(body):
+    """
+    중복 여부만 확인하는 요청 (ImageAnalyzerAndReceiver의 사전 조회)
+    최근 같은 기기에서 등록된 유사 이미지(perceptual hash)가 있으면 기존 항목 반환
+    """
+    duplicate = find_duplicate_item(body.get('phash'), body.get('device_name'))
+    if not duplicate:
+        response = {"duplicate": False}
+    else:
+        print(f"중복 이미지 조회: item_id={duplicate['item_id']}")
+        response = {
+            "duplicate": True,
+            "item_id": duplicate['item_id'],
+            "category": duplicate['category'],
+            "locker_number": duplicate['locker_number'],
+            "file_url": duplicate['photo_url']
+        }
+
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'body': json.dumps(response)
+    }
+
+
+def _register(body):
+    """
+    분실물 등록 (lookup_only면 중복 조회만)
+    - 실제 등록에는 perceptual hash 중복 판정을 적용하지 않음: 고정 카메라에서는 배경이 같은
+      다른 물건도 해시가 가까워 새 분실물이 누락될 수 있음. 재시도는 Idempotency-Key(원본 SHA-256)로 판별
+    """
+    if body.get('lookup_only'):
+        return _lookup_duplicate(body)
+
+    file_url = body.get('file_url')
+    analysis_result = body.get('analysis_result')
+    phash = body.get('phash')
+    device_name = body.get('device_name')  # 촬영한 기기 (없으면 기본 기기)
+
+    # DB에 데이터 저장
+    locker_number = insert_lost_item( # 사물함 번호 리턴
+        file_url=file_url,
+        category=analysis_result.get('category'),
+        description=analysis_result.get('description'),
+        phash=phash,
+        device_name=device_name
+    )
+    print(f"DB 커넥션 재사용 통계: {pool_stats}")
+
+    response = {
+        "duplicate" : False,
+        "category" : analysis_result.get('category'),
+        "locker_number" : locker_number
+    }
+
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': 'application/json'},
+        'body': json.dumps(response)
+    }
+
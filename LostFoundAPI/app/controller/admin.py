@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.db.session import get_db
 from app.core import security
@@ -8,13 +8,17 @@ from app.dependencies import get_current_admin
 from app.models.manager import Managers
 
 from app.service import manager_service
-from app.service import tag_service, item_service, pickup_code_service
+from app.service import tag_service, item_service, pickup_code_service, locker_inventory_service
+from app.service import command_ledger_service, device_registry_service, device_health_service
 
 from app.schemas import manager as manager_schema
 from app.schemas import user as user_schema
 from app.schemas import tag as tag_schema
 from app.schemas import item as item_schema
 from app.schemas import pickup_code as pickup_schema
+from app.schemas import locker as locker_schema
+from app.schemas import locker_command as locker_command_schema
+from app.schemas import device as device_schema
 
 router = APIRouter()
 
@@ -27,7 +31,7 @@ async def login_admin(
         login_data: manager_schema.ManagerLogin,
         db: Session = Depends(get_db)
 ):
-    manager = manager_service.authenticate_manager(db, login_data)
+    manager = await manager_service.authenticate_manager(db, login_data)
 
     if not manager:
         raise HTTPException(
@@ -141,3 +145,106 @@ async def get_pickup_logs(
         ))
 
     return result
+
+
+
+# ============================================================
+# 4. 사물함 칸 관리 (Locker Inventory) - 관리자 권한 필요
+# ============================================================
+
+@router.get("/lockers", response_model=List[locker_schema.LockerResponse])
+async def get_lockers(
+        db: Session = Depends(get_db),
+        current_admin: Managers = Depends(get_current_admin)
+):
+    """
+    [관리자] 기기별 사물함 칸의 용량과 현재 점유 수를 조회합니다.
+    """
+    return locker_inventory_service.get_all_lockers(db)
+
+@router.put("/lockers", response_model=locker_schema.LockerResponse)
+async def upsert_locker(
+        locker_in: locker_schema.LockerUpsert,
+        db: Session = Depends(get_db),
+        current_admin: Managers = Depends(get_current_admin)
+):
+    """
+    [관리자] 사물함 칸을 등록하거나 용량/사용 여부를 수정합니다. (device_name + locker_number 기준)
+    """
+    return locker_inventory_service.upsert_locker(db, locker_in)
+
+
+# ============================================================
+# 5. 사물함 명령 원장 (Locker Command Ledger) - 관리자 권한 필요
+# ============================================================
+
+@router.get("/locker-commands", response_model=List[locker_command_schema.LockerCommandResponse])
+async def get_locker_commands(
+        limit: int = Query(50, ge=1, le=500),
+        device_name: Optional[str] = Query(None),
+        db: Session = Depends(get_db),
+        current_admin: Managers = Depends(get_current_admin)
+):
+    """
+    [관리자] 최근 발행한 사물함 명령과 기기 응답(ack) 결과를 최신순으로 조회합니다.
+    """
+    return command_ledger_service.get_recent_commands(db, limit=limit, device_name=device_name)
+
+@router.get("/locker-commands/stats", response_model=List[locker_command_schema.LockerCommandStats])
+async def get_locker_command_stats(
+        since_minutes: int = Query(60, ge=1, le=60 * 24 * 30),
+        device_name: Optional[str] = Query(None),
+        db: Session = Depends(get_db),
+        current_admin: Managers = Depends(get_current_admin)
+):
+    """
+    [관리자] 기기/사물함별 명령 수, 완료·시간초과·실패·재시도 수, 발행 -> ack 지연(평균/최대)을 조회합니다.
+    - since_minutes: 최근 몇 분간의 명령을 집계할지 (기본 60분)
+    """
+    return command_ledger_service.get_command_stats(db, since_minutes=since_minutes, device_name=device_name)
+
+
+# ============================================================
+# 6. 사물함 기기 등록부 (Device Registry) - 관리자 권한 필요
+# ============================================================
+
+@router.get("/devices", response_model=List[device_schema.DeviceResponse])
+async def get_devices(
+        db: Session = Depends(get_db),
+        current_admin: Managers = Depends(get_current_admin)
+):
+    """
+    [관리자] 등록된 사물함 기기(위치, IoT 기기 이름, 토픽 접두사, 칸 수)와
+    기기 상태(ONLINE / OFFLINE / UNKNOWN, 마지막 heartbeat, 펌웨어, 문 상태)를 조회합니다.
+    """
+    health = device_health_service.get_all_device_health(db)
+
+    devices = []
+    for device in device_registry_service.get_all_devices(db):
+        response = device_schema.DeviceResponse.model_validate(device)
+        response.health = device_schema.DeviceHealth(
+            **health.get(device.thing_name, {"device_name": device.thing_name, "status": device_health_service.UNKNOWN})
+        )
+        devices.append(response)
+    return devices
+
+@router.get("/devices/health", response_model=List[device_schema.DeviceHealth])
+async def get_device_health(
+        db: Session = Depends(get_db),
+        current_admin: Managers = Depends(get_current_admin)
+):
+    """
+    [관리자] heartbeat를 보낸 모든 IoT 기기의 상태를 조회합니다. (등록부에 없는 기기 포함)
+    """
+    return list(device_health_service.get_all_device_health(db).values())
+
+@router.put("/devices", response_model=device_schema.DeviceResponse)
+async def upsert_device(
+        device_in: device_schema.DeviceUpsert,
+        db: Session = Depends(get_db),
+        current_admin: Managers = Depends(get_current_admin)
+):
+    """
+    [관리자] 사물함 기기를 등록하거나 수정합니다. (device_name 기준, 저장 즉시 라우팅에 반영)
+    """
+    return device_registry_service.upsert_device(db, device_in)
@@ -2,7 +2,13 @@ from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.db.session import get_db
+from app.db.session import get_db, get_pool_stats
+from app.core.auth_cache import principal_cache
+from app.core.security import password_pool
+from app.service.mail_queue import get_mail_stats
+from app.core.response_cache import response_cache
+from app.core.idempotency import get_idempotency_stats
+from app.service.locker_transport import transport as locker_transport
 from app.service import dev_service
 from app.schemas.item import ItemResponse # (기존 응답 스키마 재사용)
 
@@ -43,4 +49,55 @@ async def delete_dummy_items(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"테스트 데이터 삭제 실패: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.get("/pool-stats", summary="DB 커넥션 풀 통계")
+async def get_db_pool_stats():
+    """
+    현재 Lambda 컨테이너의 DB 커넥션 풀 hit/miss 통계를 반환합니다. (cold/warm 비교용)
+    """
+    return get_pool_stats()
+
+@router.get("/auth-cache-stats", summary="인증 캐시 통계")
+async def get_auth_cache_stats():
+    """
+    현재 Lambda 컨테이너의 토큰 -> 사용자 캐시 hit/miss/eviction 통계를 반환합니다.
+    """
+    return principal_cache.stats()
+
+@router.get("/hash-pool-stats", summary="비밀번호 해싱 워커 풀 통계")
+async def get_hash_pool_stats():
+    """
+    bcrypt 워커 풀의 대기열 깊이 / 대기·실행 시간 / 거절 건수를 반환합니다.
+    """
+    return password_pool.stats()
+
+@router.get("/mail-stats", summary="메일 큐 / SMTP 전송 통계")
+async def get_mail_queue_stats():
+    """
+    메일 큐 깊이와 SMTP 전송/재시도/실패/연결 횟수를 반환합니다.
+    """
+    return get_mail_stats()
+
+@router.get("/response-cache-stats", summary="공개 조회 API 응답 캐시 통계")
+async def get_response_cache_stats():
+    """
+    /tags/, /items/, /items/{id} 응답 캐시의 hit/miss/304 통계를 반환합니다.
+    """
+    return response_cache.stats()
+
+@router.get("/locker-transport-stats", summary="사물함 명령 발행 통계")
+async def get_locker_transport_stats():
+    """
+    사물함 명령 발행/병합/재시도/실패 횟수와 명령별 발행 지연 히스토그램을 반환합니다.
+    """
+    if locker_transport is None:
+        return {"backend": None}
+    return locker_transport.stats()
+
+@router.get("/idempotency-stats", summary="Idempotency-Key 처리 통계")
+async def get_idempotency_key_stats():
+    """
+    Idempotency-Key 요청의 처리/저장/재사용/대기/충돌 건수를 반환합니다.
+    """
+    return get_idempotency_stats()
@@ -1,25 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 import app.schemas.item as item_schema
-from app.db.session import get_db
-from app.service import item_service
-from app.models import Users
-from app.dependencies import get_current_user # 1.5 API가 사용할 의존성
+from app.core.config import settings
+from app.core.response_cache import cached_response
+from app.db.session import get_db, get_async_db
+from app.service import item_service, async_item_service
+from app.models import Users, LostItemStatus
+from app.dependencies import get_current_user, get_current_user_id # 1.5 API가 사용할 의존성
 
 router = APIRouter()
 
-# 1.1 (GET /) - 전체 리스트
-@router.get("/", response_model=List[item_schema.ItemResponse])
+# 1.1 (GET /) - 전체 리스트 (커서 페이지네이션)
+@router.get("/", response_model=item_schema.ItemPageResponse)
 async def get_all_lost_items(
-        db: Session = Depends(get_db)
+        request: Request,
+
+        # 'limit': 한 페이지에 반환할 개수
+        limit: int = Query(20, ge=1, le=100),
+
+        # 'cursor': 이전 응답의 next_cursor (첫 페이지는 생략)
+        cursor: Optional[str] = Query(None, max_length=200),
+
+        # 'status': 상태 필터 (예: /?status=보관)
+        status_filter: Optional[LostItemStatus] = Query(None, alias="status"),
+
+        db: Session = Depends(get_db),
+        adb: Optional[AsyncSession] = Depends(get_async_db)
 ):
     """
-    모든 분실물 리스트를 반환합니다.
+    분실물 리스트를 최신 등록순으로 페이지 단위로 반환합니다.
+    - 다음 페이지는 응답의 next_cursor를 cursor로 전달하여 조회합니다.
+    - ETag 캐시: 아이템/태그가 바뀌지 않았다면 DB 조회 없이 응답합니다. (If-None-Match 일치 시 304)
     """
-    items = item_service.get_all_items_with_tags(db=db)
-    return items
+    async def load():
+        if adb is not None:
+            page = await async_item_service.get_items_page(
+                adb, limit=limit, cursor=cursor, status=status_filter
+            )
+        else:
+            page = item_service.get_items_page(
+                db=db, limit=limit, cursor=cursor, status=status_filter
+            )
+
+        if page == "INVALID_CURSOR":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+        return page
+
+    return await cached_response(
+        request,
+        key=("items", limit, cursor, status_filter),
+        depends_on=("items", "tags"),
+        ttl_seconds=settings.RESPONSE_CACHE_ITEMS_TTL_SECONDS,
+        model=item_schema.ItemPageResponse,
+        load=load
+    )
 
 # 1.2 검색어 + 태그 검색 API
 @router.get("/search", response_model=List[item_schema.ItemResponse])
@@ -31,15 +72,20 @@ async def search_lost_items(
         #    (예: /search?tags=1&tags=3)
         tags: Optional[List[int]] = Query(None),
 
+        # 페이지네이션 (관련도 순 정렬이므로 offset 기반)
+        limit: int = Query(20, ge=1, le=100),
+        offset: int = Query(0, ge=0, le=10000),
+
         db: Session = Depends(get_db)
 ):
     """
     (1.2) 검색어(q) 및/또는 태그(tags)로 분실물을 검색합니다.
-    - q: 검색어
+    - q: 검색어 (한글은 부분 일치, 관련도 -> 최신 등록순 정렬)
     - tags: 태그 ID 리스트 (여러 개 가능)
+    - limit / offset: 페이지 크기 / 시작 위치
     """
 
-    items = item_service.search_items(db=db, q=q, tags=tags)
+    items = item_service.search_items(db=db, q=q, tags=tags, limit=limit, offset=offset)
     return items
 
 # 1.5 (GET /me) - 나의 분실물 리스트 (신규)
@@ -47,7 +93,7 @@ async def search_lost_items(
 @router.get("/me", response_model=List[item_schema.ItemResponse])
 async def get_my_claimed_items(
         db: Session = Depends(get_db),
-        current_user: Users = Depends(get_current_user)
+        current_user_id: int = Depends(get_current_user_id)
 ):
     """
     (인증 필요) 현재 로그인한 사용자가 '주인 등록(claim)'한
@@ -55,7 +101,7 @@ async def get_my_claimed_items(
     """
     # (이 로직을 app/service/item_service.py에 추가해야 합니다)
     items = item_service.get_claimed_items_by_user(
-        db=db, current_user=current_user
+        db=db, user_id=current_user_id
     )
     return items
 
@@ -66,7 +112,7 @@ async def cancel_my_reservation(
         item_id: int,
         cancel_data: item_schema.ReservationCancelRequest, # [추가] 취소 사유
         db: Session = Depends(get_db),
-        current_user: Users = Depends(get_current_user)
+        current_user_id: int = Depends(get_current_user_id)
 ):
     """
     (인증 필요) 현재 사용자가 '예약'한 픽업을 취소하고
@@ -76,7 +122,7 @@ async def cancel_my_reservation(
     result = item_service.cancel_reservation(
         db=db,
         item_id=item_id,
-        current_user=current_user,
+        user_id=current_user_id,
         cancel_reason=cancel_data.cancel_reason
     )
 
@@ -109,15 +155,15 @@ async def cancel_my_reservation(
 async def get_my_claimed_item_detail(
         item_id: int,
         db: Session = Depends(get_db),
-        current_user: Users = Depends(get_current_user)
+        current_user_id: int = Depends(get_current_user_id)
 ):
     """
     (인증 필요) 현재 사용자가 '주인 등록'한 특정 아이템의
-    상세 정보와 픽업 코드를 (만료 시 재발급하여) 반환합니다.
+    상세 정보와 픽업 코드를 반환합니다. (만료된 코드는 app.sweeper 가 정리)
     """
 
     data = item_service.get_my_claimed_item_details(
-        db=db, item_id=item_id, current_user=current_user
+        db=db, item_id=item_id, user_id=current_user_id
     )
 
     if data is None:
@@ -141,27 +187,44 @@ async def get_my_claimed_item_detail(
 # 1.3 (GET /{item_id}) - 상세 내역
 @router.get("/{item_id}", response_model=item_schema.ItemResponse)
 async def get_item_by_id(
+        request: Request,
         item_id: int,
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_db),
+        adb: Optional[AsyncSession] = Depends(get_async_db)
 ):
     """
     지정된 ID의 단일 분실물 상세 내역을 반환합니다.
+    - ETag 캐시: 해당 아이템/태그가 바뀌지 않았다면 DB 조회 없이 응답합니다. (If-None-Match 일치 시 304)
     """
-    item = item_service.get_item_by_id_with_tags(db=db, item_id=item_id)
+    async def load():
+        if adb is not None:
+            item = await async_item_service.get_item_by_id_with_tags(adb, item_id=item_id)
+        else:
+            item = item_service.get_item_by_id_with_tags(db=db, item_id=item_id)
 
-    if not item:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Item not found"
-        )
+        if not item:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Item not found"
+            )
+
+        return item
 
-    return item
+    return await cached_response(
+        request,
+        key=("item", item_id),
+        depends_on=(f"item:{item_id}", "tags"),
+        ttl_seconds=settings.RESPONSE_CACHE_ITEM_TTL_SECONDS,
+        model=item_schema.ItemResponse,
+        load=load
+    )
 
 # 1.4 (POST /{item_id}/claim) - 주인 등록
 @router.post("/{item_id}/claim", response_model=item_schema.ClaimResponse)
 async def claim_lost_item(
         item_id: int,
         db: Session = Depends(get_db),
+        adb: Optional[AsyncSession] = Depends(get_async_db),
         current_user: Users = Depends(get_current_user)
 ):
     """
@@ -169,9 +232,14 @@ async def claim_lost_item(
     주인으로 등록(claim)합니다.
     """
 
-    updated_data = item_service.claim_item_by_id(
-        db=db, item_id=item_id, current_user=current_user
-    )
+    if adb is not None:
+        updated_data = await async_item_service.claim_item_by_id(
+            adb, item_id=item_id, current_user=current_user
+        )
+    else:
+        updated_data = item_service.claim_item_by_id(
+            db=db, item_id=item_id, current_user=current_user
+        )
 
     if updated_data is None:
         raise HTTPException(
@@ -1,11 +1,14 @@
 # LostFoundAPI/app/controller/kiosks.py
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
 
-from app.db.session import get_db
-from app.service import kiosk_service, locker_service
+from app.db.session import get_db, get_async_db
+from app.core.config import settings
+from app.service import kiosk_service, async_kiosk_service, locker_service, device_registry_service, device_health_service
 from app.schemas import item as item_schema
 
 router = APIRouter()
@@ -37,12 +40,14 @@ class LockerCloseResponse(BaseModel):
     description=(
         "키오스크에서 손님이 입력한 6자리 픽업 코드를 검증하고 아이템을 '찾음' 상태로 갱신합니다.\n"
         "- 검증이 성공하면 할당된 사물함 번호(`item.locker_id`)와 기기(`item.device_name`)를 찾아 자동으로 사물함을 엽니다.\n"
+        "- 해당 기기의 heartbeat가 끊겨 있으면 코드를 사용 처리하지 않고 503을 반환합니다.\n"
         "- 코드가 만료되었거나 이미 사용된 경우, 상황에 맞는 HTTP 오류를 반환합니다."
     )
 )
 async def complete_item_pickup(
         pickup_data: PickupRequest,
         db: Session = Depends(get_db),
+        adb: Optional[AsyncSession] = Depends(get_async_db),
         background_tasks: BackgroundTasks = None
 ):
     """
@@ -50,11 +55,39 @@ async def complete_item_pickup(
     '보관'에서 '찾음'으로 변경합니다.
     """
 
+    # 사물함 기기의 heartbeat가 끊겼으면 코드를 사용 처리하기 전에 바로 거절 (IoT 발행을 기다리지 않음)
+    if settings.DEVICE_PICKUP_REQUIRE_ONLINE:
+        if adb is not None:
+            pending_item = await async_kiosk_service.fetch_item_by_pickup_code(
+                adb,
+                pickup_code_str=pickup_data.pickup_code
+            )
+        else:
+            pending_item = kiosk_service.fetch_item_by_pickup_code(
+                db=db,
+                pickup_code_str=pickup_data.pickup_code
+            )
+
+        if pending_item != "INVALID_CODE":
+            device, _ = device_registry_service.resolve_item_locker(db, pending_item)
+            if device_health_service.is_device_offline(db, device["thing_name"]):
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="사물함 기기가 응답하지 않습니다. 잠시 후 다시 시도하거나 관리자에게 문의해 주세요.",
+                    headers={"Retry-After": str(settings.DEVICE_HEARTBEAT_PERSIST_SECONDS)}
+                )
+
     # 서비스 로직 호출
-    result = kiosk_service.complete_pickup_by_code(
-        db=db,
-        pickup_code_str=pickup_data.pickup_code
-    )
+    if adb is not None:
+        result = await async_kiosk_service.complete_pickup_by_code(
+            adb,
+            pickup_code_str=pickup_data.pickup_code
+        )
+    else:
+        result = kiosk_service.complete_pickup_by_code(
+            db=db,
+            pickup_code_str=pickup_data.pickup_code
+        )
 
     if result == "INVALID_CODE":
         raise HTTPException(
@@ -66,38 +99,39 @@ async def complete_item_pickup(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="이미 '찾음' 처리된 분실물입니다."
         )
-    if result == "NOT_IN_STORAGE":
+    if result == "NOT_RESERVE":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="보관 상태가 아닌 분실물입니다. (분실 상태이거나, 다른 상태)"
+            detail="예약 상태가 아닌 분실물입니다. (보관/분실 상태이거나, 다른 상태)"
         )
 
-    device_name = "InhaLockerPi2"
-    locker_id = None
-    if hasattr(result, "tags") and result.tags:
-        first_tag = result.tags[0]
-        locker_id = getattr(first_tag, "locker_number", None)
+    # 서비스 결과(ORM 객체 또는 dict)를 응답 스키마로 변환
+    item = item_schema.ItemResponse.model_validate(result)
+
+    # 아이템의 device_name으로 기기 등록부에서 IoT 기기를 찾고,
+    # 배정된 사물함 칸이 있으면 사용하고, 없으면 태그의 기본 사물함 번호 사용
+    device, locker_id = device_registry_service.resolve_item_locker(db, item)
     if locker_id is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="할당된 사물함( locker_number ) 정보를 태그에서 찾을 수 없습니다."
         )
-    # device_name은 장비명을 고정 사용
 
     if background_tasks is not None:
-        background_tasks.add_task(locker_service.open_locker, device_name, locker_id)
+        background_tasks.add_task(
+            locker_service.open_locker, device["thing_name"], locker_id, device["topic_prefix"]
+        )
     else:
-        locker_service.open_locker(device_name, locker_id)
+        await run_in_threadpool(
+            locker_service.open_locker, device["thing_name"], locker_id, device["topic_prefix"]
+        )
 
     # 응답에 사물함 번호를 명시적으로 넣어준다 (locker_id 필드에 매핑)
-    try:
-        setattr(result, "locker_id", locker_id)
-    except Exception:
-        pass
+    item.locker_id = locker_id
 
     return {
         "message": f"픽업 코드 {pickup_data.pickup_code}가 확인되었으며, 아이템이 인계되었습니다.",
-        "item": result
+        "item": item
     }
 
 
@@ -114,6 +148,7 @@ async def complete_item_pickup(
 async def kiosk_close_locker(
         close_data: LockerCloseRequest,
         db: Session = Depends(get_db),
+        adb: Optional[AsyncSession] = Depends(get_async_db),
         background_tasks: BackgroundTasks = None
 ):
     """
@@ -121,10 +156,16 @@ async def kiosk_close_locker(
     해당 사물함을 닫도록 IoT 명령을 발행합니다.
     """
 
-    item = kiosk_service.fetch_item_by_pickup_code(
-        db=db,
-        pickup_code_str=close_data.pickup_code
-    )
+    if adb is not None:
+        item = await async_kiosk_service.fetch_item_by_pickup_code(
+            adb,
+            pickup_code_str=close_data.pickup_code
+        )
+    else:
+        item = kiosk_service.fetch_item_by_pickup_code(
+            db=db,
+            pickup_code_str=close_data.pickup_code
+        )
 
     if item == "INVALID_CODE":
         raise HTTPException(
@@ -132,38 +173,34 @@ async def kiosk_close_locker(
             detail="유효하지 않은 픽업 코드입니다."
         )
 
-    device_name = "InhaLockerPi2"
-    locker_id = None
-    if hasattr(item, "tags") and item.tags:
-        first_tag = item.tags[0]
-        locker_id = getattr(first_tag, "locker_number", None)
+    # 아이템의 device_name으로 기기 등록부에서 IoT 기기를 찾고,
+    # 배정된 사물함 칸이 있으면 사용하고, 없으면 태그의 기본 사물함 번호 사용
+    device, locker_id = device_registry_service.resolve_item_locker(db, item)
 
     if locker_id is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="할당된 사물함( locker_number ) 정보를 태그에서 찾을 수 없습니다."
         )
-    # device_name은 장비명을 고정 사용
 
     if background_tasks is not None:
         background_tasks.add_task(
             locker_service.close_locker,
-            device_name,
+            device["thing_name"],
             locker_id,
-            close_data.pickup_code
+            close_data.pickup_code,
+            device["topic_prefix"]
         )
     else:
-        locker_service.close_locker(device_name, locker_id, close_data.pickup_code)
-
-    try:
-        setattr(item, "locker_id", locker_id)
-    except Exception:
-        pass
+        await run_in_threadpool(
+            locker_service.close_locker,
+            device["thing_name"], locker_id, close_data.pickup_code, device["topic_prefix"]
+        )
 
     return {
         "message": f"사물함 {locker_id}번 닫기 명령이 전송되었습니다.",
         "locker_id": locker_id,
-        "device_name": device_name
+        "device_name": device["thing_name"]
     }
 
 
@@ -180,23 +217,31 @@ class ItemRegisterRequest(BaseModel):
     summary="분실물 등록 촬영 요청",
     description=(
         "키오스크에서 분실물 등록을 시작할 때 호출해 라즈베리파이(혹은 IoT 디바이스)에게 촬영/업로드를 지시합니다.\n"
-        "- `device_name`은 사물함(또는 투입구)이 연결된 장비 이름, `location`은 분실물이 수거된 위치입니다.\n"
-        "- 서버는 `locker/register/{device_name}` 토픽으로 MQTT 메시지를 발행하고, 응답으로 AWS Request ID를 돌려줍니다."
+        "- `device_name`은 사물함(또는 투입구)이 연결된 장비 이름, `location`은 분실물이 수거된 위치입니다. (생략 시 기기 등록부의 위치)\n"
+        "- 서버는 `{topic_prefix}/register/{IoT 기기}` 토픽으로 MQTT 메시지를 발행하고, 응답으로 AWS Request ID를 돌려줍니다."
     )
 )
-async def kiosk_request_item_registration(payload: ItemRegisterRequest):
+async def kiosk_request_item_registration(
+        payload: ItemRegisterRequest,
+        db: Session = Depends(get_db)
+):
     """
     키오스크에서 라즈베리파이에게 촬영 및 업로드를 지시하는 MQTT 명령을 발행합니다.
     """
+    device = device_registry_service.resolve_device(db, payload.device_name)
+
     try:
-        aws_request_id = locker_service.request_item_registration(
-            device_name=payload.device_name,
-            location=payload.location
+        published = await run_in_threadpool(
+            locker_service.request_item_registration,
+            device_name=device["thing_name"],
+            location=payload.location or device["location"],
+            topic_prefix=device["topic_prefix"]
         )
         return {
             "status": "queued",
             "device_name": payload.device_name,
-            "aws_request_id": aws_request_id
+            "aws_request_id": published["request_id"],
+            "correlation_id": published["correlation_id"]
         }
     except Exception as e:
         raise HTTPException(
@@ -216,6 +261,7 @@ class LockerOpenResponse(BaseModel):
     locker_id: int | None
     device_name: str
     aws_request_id: str | None = None
+    correlation_id: str | None = None  # 명령 원장(locker_commands) id
 
 
 @router.post(
@@ -224,17 +270,27 @@ class LockerOpenResponse(BaseModel):
     summary="투입구/사물함 열기",
     description=(
         "키오스크에서 투입구 또는 특정 사물함을 열 때 호출합니다.\n"
-        "- `open_chute=True`이면 투입구 전용 토픽(`locker/chute/{device_name}`)으로 OPEN_CHUTE 명령을 발행합니다.\n"
+        "- `device_name`은 기기 등록부의 이름 또는 IoT 기기 이름입니다.\n"
+        "- `open_chute=True`이면 투입구 전용 토픽(`{topic_prefix}/chute/{IoT 기기}`)으로 OPEN_CHUTE 명령을 발행합니다.\n"
         "- `open_chute=False`이면 `locker_id`가 필수이며, 해당 사물함 문을 여는 MQTT 명령을 발행합니다."
     )
 )
-async def kiosk_open_locker(open_data: LockerOpenRequest):
+async def kiosk_open_locker(
+        open_data: LockerOpenRequest,
+        db: Session = Depends(get_db)
+):
     """
     키오스크에서 투입구/사물함을 열어달라고 요청할 때 호출합니다.
     """
+    device = device_registry_service.resolve_device(db, open_data.device_name)
+
     try:
         if open_data.open_chute:
-            aws_request_id = locker_service.open_chute(open_data.device_name)
+            published = await run_in_threadpool(
+                locker_service.open_chute,
+                device_name=device["thing_name"],
+                topic_prefix=device["topic_prefix"]
+            )
             locker_id = None
         else:
             if open_data.locker_id is None:
@@ -242,9 +298,11 @@ async def kiosk_open_locker(open_data: LockerOpenRequest):
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="open_chute=False일 때는 locker_id가 필요합니다."
                 )
-            aws_request_id = locker_service.open_locker(
-                device_name=open_data.device_name,
-                locker_id=open_data.locker_id
+            published = await run_in_threadpool(
+                locker_service.open_locker,
+                device_name=device["thing_name"],
+                locker_id=open_data.locker_id,
+                topic_prefix=device["topic_prefix"]
             )
             locker_id = open_data.locker_id
         return {
@@ -252,7 +310,8 @@ async def kiosk_open_locker(open_data: LockerOpenRequest):
             else f"사물함 {open_data.locker_id}번 열기 명령이 전송되었습니다.",
             "locker_id": locker_id,
             "device_name": open_data.device_name,
-            "aws_request_id": aws_request_id
+            "aws_request_id": published["request_id"],
+            "correlation_id": published["correlation_id"]
         }
     except Exception as e:
         raise HTTPException(
@@ -1,5 +1,12 @@
-from fastapi import APIRouter, HTTPException, status
-from app.service import locker_service
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.dependencies import verify_locker_webhook
+from app.service import locker_service, command_ledger_service, device_health_service
+from app.schemas import locker_command as locker_command_schema
+from app.schemas import device as device_schema
 
 router = APIRouter()
 
@@ -18,13 +25,16 @@ async def open_smart_locker(locker_id: int, device_name: str):
     """
 
     try:
-        aws_request_id = locker_service.open_locker(device_name=device_name, locker_id=locker_id)
+        published = await run_in_threadpool(
+            locker_service.open_locker, device_name=device_name, locker_id=locker_id
+        )
 
         return {
             "status": "success",
             "message": f"사물함 {locker_id}번 열기 명령 전송 완료",
             "locker_id": locker_id,
-            "aws_request_id": aws_request_id
+            "aws_request_id": published["request_id"],
+            "correlation_id": published["correlation_id"]
         }
 
     except Exception as e:
@@ -32,3 +42,64 @@ async def open_smart_locker(locker_id: int, device_name: str):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"명령 전송 실패: {str(e)}"
         )
+
+
+# ==================================================
+# 기기 명령 응답(ack) 수신
+# ==================================================
+@router.post(
+    "/ack",
+    response_model=locker_command_schema.LockerCommandResponse,
+    summary="사물함 명령 응답(ack) 수신",
+    dependencies=[Depends(verify_locker_webhook)]
+)
+async def receive_locker_ack(
+        ack: locker_command_schema.LockerCommandAck,
+        db: Session = Depends(get_db)
+):
+    """
+    라즈베리파이가 `locker/ack/{device_name}` 토픽으로 보낸 응답을 받아 명령 원장에 기록합니다.
+    (AWS IoT Rule의 HTTP 액션으로 이 API를 호출하도록 설정)
+    - IoT Rule HTTP 액션의 헤더에 `X-Locker-Secret: <LOCKER_WEBHOOK_SECRET>`를 추가해야 합니다.
+    - **correlation_id**: 명령 메시지에 포함되어 전달된 id
+    - **ok**: 기기에서 명령 수행 성공 여부
+    """
+    command = command_ledger_service.record_ack(db, ack.correlation_id, ok=ack.ok, error=ack.error)
+
+    if command is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown correlation_id"
+        )
+
+    return command
+
+
+# ==================================================
+# 기기 heartbeat 수신
+# ==================================================
+@router.post(
+    "/heartbeat",
+    response_model=device_schema.DeviceHealth,
+    summary="사물함 기기 heartbeat 수신",
+    dependencies=[Depends(verify_locker_webhook)]
+)
+async def receive_device_heartbeat(
+        heartbeat: device_schema.DeviceHeartbeat,
+        db: Session = Depends(get_db)
+):
+    """
+    라즈베리파이가 `locker/heartbeat/{device_name}` 토픽으로 주기적으로 보낸 상태를 기록합니다.
+    (AWS IoT Rule의 HTTP 액션으로 이 API를 호출하도록 설정)
+    - /locker/ack와 같이 `X-Locker-Secret` 헤더가 필요합니다.
+    - **device_name**: IoT 기기 이름
+    - **firmware**: 펌웨어 버전
+    - **doors**: 사물함 번호(또는 "chute")별 문 상태 ("OPEN" / "CLOSED")
+    """
+    return device_health_service.record_heartbeat(
+        db,
+        heartbeat.device_name,
+        firmware=heartbeat.firmware,
+        doors=heartbeat.doors,
+        uptime_seconds=heartbeat.uptime_seconds
+    )
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 from typing import List
 
+from app.core.config import settings
+from app.core.response_cache import cached_response
 from app.db.session import get_db
 from app.schemas.tag import TagResponse
 from app.service import tag_service
@@ -10,10 +12,21 @@ router = APIRouter()
 
 @router.get("/", response_model=List[TagResponse])
 async def get_all_tags(
+        request: Request,
         db: Session = Depends(get_db)
 ):
     """
     DB에 저장된 모든 태그 리스트를 반환합니다.
+    - ETag 캐시: 태그가 바뀌지 않았다면 DB 조회 없이 응답합니다. (If-None-Match 일치 시 304)
     """
-    tags = tag_service.get_all_tags(db=db)
-    return tags
+    async def load():
+        return tag_service.get_all_tags(db=db)
+
+    return await cached_response(
+        request,
+        key=("tags",),
+        depends_on=("tags",),
+        ttl_seconds=settings.RESPONSE_CACHE_TAGS_TTL_SECONDS,
+        model=List[TagResponse],
+        load=load
+    )
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
 
 from app.schemas import user as user_schema
 from app.db.session import get_db
 from app.service import user_service
-from app.service import verification_service, email_service
+from app.service import verification_service, mail_queue
 from app.core.config import settings
 
 router = APIRouter()
@@ -39,7 +40,7 @@ async def create_user(
             detail="Email already registered"
         )
 
-    created_user = user_service.create_new_user(db, user_in=user_in)
+    created_user = await user_service.create_new_user(db, user_in=user_in)
     return created_user
 
 # ============================================================
@@ -53,7 +54,9 @@ async def create_user(
     
     - 인증 번호의 유효 시간은 **5분**입니다.
     - 이미 가입된 이메일이라면 400 에러를 반환합니다.
-    - 이메일 발송에 실패하면 500 에러를 반환합니다.
+    - 메일 큐(SQS)가 설정되어 있으면 적재 직후 응답하고 실제 발송은 메일 워커가 처리하며,
+      설정되어 있지 않으면 메일을 보낸 뒤 응답합니다.
+    - 메일 큐 적재(또는 발송)에 실패하면 500 에러를 반환합니다.
     """,
     responses={
         400: {"description": "이미 가입된 이메일"},
@@ -67,11 +70,13 @@ async def request_email_verification(
     if user_service.check_email_exists(db, request.email):
         raise HTTPException(status_code=400, detail="이미 가입된 이메일입니다.")
 
-    code = verification_service.create_verification_code(request.email)
+    # DynamoDB / SQS 호출은 블로킹이므로 이벤트 루프 밖(스레드풀)에서 실행
+    code = await run_in_threadpool(verification_service.create_verification_code, request.email)
     if not code:
         raise HTTPException(status_code=500, detail="서버 오류: 인증 코드 생성 실패")
 
-    if not email_service.send_verification_email(request.email, code):
+    # SQS면 큐에 넣은 뒤 바로 응답 (실제 전송은 메일 워커가 담당), 큐가 없으면 여기서 전송
+    if not await run_in_threadpool(mail_queue.enqueue_verification_email, request.email, code):
         raise HTTPException(status_code=500, detail="이메일 발송 실패")
 
     return {"message": "인증 번호가 발송되었습니다."}
@@ -96,7 +101,7 @@ async def request_email_verification(
 )
 async def verify_email_code(request: user_schema.VerificationRequest):
 
-    result = verification_service.verify_code(request.email, request.code)
+    result = await run_in_threadpool(verification_service.verify_code, request.email, request.code)
 
     if result == "EXPIRED" or result is None:
         raise HTTPException(status_code=400, detail="인증 시간이 만료되었거나 잘못된 요청입니다.")
@@ -144,7 +149,7 @@ async def create_user_verified(
     if user_service.check_email_exists(db, user_in.email):
         raise HTTPException(status_code=400, detail="이미 가입된 이메일입니다.")
 
-    return user_service.create_new_user(db, user_in=user_in)
+    return await user_service.create_new_user(db, user_in=user_in)
 
 # ============================================================
 # 로그인 API
@@ -167,7 +172,7 @@ async def login_for_access_token(
         user_in: user_schema.UserLogin,
         db: Session = Depends(get_db)
 ):
-    access_token = user_service.authenticate_user(db, user_in=user_in)
+    access_token = await user_service.authenticate_user(db, user_in=user_in)
 
     if not access_token:
         raise HTTPException(
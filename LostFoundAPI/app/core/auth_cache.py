@@ -0,0 +1,88 @@
+import time
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models import Users
+
+
+class PrincipalCache:
+    """
+    검증된 토큰 -> {claims, principal} LRU 캐시
+    - 토큰 만료 시각(최대 AUTH_CACHE_MAX_TTL_SECONDS)까지 유효합니다.
+    - principal은 세션에서 분리(expunge)된 Users 객체이며,
+      요청마다 db.merge(..., load=False)로 다시 붙여 사용합니다.
+    - 컨테이너(프로세스) 단위 캐시이므로, 다른 컨테이너의 변경은 최대 TTL 후 반영됩니다.
+      (그래서 관리자는 claims만 캐시하고, is_active/role은 요청마다 DB에서 확인합니다.)
+    """
+
+    def __init__(self, max_entries: int, max_ttl_seconds: int):
+        self.max_entries = max_entries
+        self.max_ttl_seconds = max_ttl_seconds
+        self.entries = OrderedDict()  # (kind, token) -> entry
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, kind: str, token: str):
+        key = (kind, token)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry["expires_at"] <= time.time():
+                self.entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, kind: str, token: str, claims: dict, principal=None) -> dict:
+        expires_at = min(claims.get("exp", 0), time.time() + self.max_ttl_seconds)
+        entry = {"claims": claims, "principal": principal, "expires_at": expires_at}
+
+        with self.lock:
+            self.entries[(kind, token)] = entry
+            self.entries.move_to_end((kind, token))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+        return entry
+
+    def invalidate(self, email: str = None):
+        """
+        email이 주어지면 해당 주체의 토큰만, 아니면 전체를 무효화합니다.
+        """
+        with self.lock:
+            if email is None:
+                self.entries.clear()
+                return
+            for key in [key for key, entry in self.entries.items() if entry["claims"].get("sub") == email]:
+                del self.entries[key]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    max_ttl_seconds=settings.AUTH_CACHE_MAX_TTL_SECONDS
+)
+
+
+# 사용자 변경 / 삭제 시 캐시된 주체를 무효화
+@event.listens_for(Users, "after_update")
+@event.listens_for(Users, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    principal_cache.invalidate(target.email)
@@ -8,6 +8,18 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     SECRET_KEY: str
 
+    # DB 커넥션 풀 설정 (Lambda warm 컨테이너 재사용 기준)
+    DB_POOL_SIZE: int = 2
+    DB_MAX_OVERFLOW: int = 3
+    DB_POOL_RECYCLE: int = 60 * 30  # 초 단위, RDS idle timeout 보다 짧게
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_TIMEOUT: int = 10
+    DB_USE_EXTERNAL_POOLER: bool = False  # RDS Proxy 사용 시 True (NullPool)
+
+    # 비동기 DB 모드 (asyncpg + AsyncSession)
+    DB_ASYNC_MODE: bool = False
+    ASYNC_DATABASE_URL: str | None = None  # 미설정 시 DATABASE_URL의 드라이버를 asyncpg로 바꿔 사용
+
     AWS_REGION: str = "us-west-2"
     DYNAMODB_TABLE_VERIFICATION: str = "inha-capstone-14-VerificationCodes"
     AWS_IOT_ENDPOINT: str
@@ -15,6 +27,66 @@ class Settings(BaseSettings):
     GMAIL_USER: str
     GMAIL_PASSWORD: str
 
+    # 메일 큐(SQS + app.mail_worker): URL이 없으면 요청 안에서 바로 SMTP로 전송합니다.
+    EMAIL_QUEUE_URL: str | None = None
+    EMAIL_BATCH_SIZE: int = 10
+    EMAIL_MAX_ATTEMPTS: int = 3
+    EMAIL_RETRY_BASE_SECONDS: float = 1.0
+    EMAIL_SMTP_IDLE_CHECK_SECONDS: float = 30.0
+
+    # 공개 조회 API 응답 캐시 (ETag): 최대 항목 수 / 엔드포인트별 유지 시간(초)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+    RESPONSE_CACHE_TAGS_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_ITEMS_TTL_SECONDS: int = 10
+    RESPONSE_CACHE_ITEM_TTL_SECONDS: int = 30
+
+    # 사물함 명령 발행: https(iot-data) / mqtt(상시 연결) / memory(테스트용)
+    LOCKER_TRANSPORT: str = "https"
+    LOCKER_PUBLISH_MAX_ATTEMPTS: int = 3
+    LOCKER_PUBLISH_RETRY_BASE_SECONDS: float = 0.1
+    LOCKER_COALESCE_WINDOW_MS: int = 500  # 같은 토픽에 연속된 같은 명령의 중복 발행 방지 구간 (0이면 진행 중인 명령만 공유)
+    IOT_MQTT_HOST: str | None = None  # 미설정 시 AWS_IOT_ENDPOINT의 호스트 사용
+    IOT_MQTT_PORT: int = 8883
+    IOT_MQTT_CLIENT_ID: str = "lostfound-api"
+    IOT_MQTT_CA_PATH: str | None = None
+    IOT_MQTT_CERT_PATH: str | None = None
+    IOT_MQTT_KEY_PATH: str | None = None
+    IOT_MQTT_PUBLISH_TIMEOUT_SECONDS: float = 3.0
+    LOCKER_ACK_TIMEOUT_SECONDS: int = 10  # 기기 ack가 이 시간 안에 오지 않으면 시간초과
+    # IoT Rule HTTP 액션이 X-Locker-Secret 헤더로 보내는 공유 비밀값 (미설정 시 /locker/ack, /locker/heartbeat 요청을 거절)
+    LOCKER_WEBHOOK_SECRET: str | None = None
+
+    # 사물함 기기 등록부 캐시 유지 시간 (초) / 등록부에 없는 기기의 분실물을 보낼 기본 IoT 기기
+    DEVICE_REGISTRY_TTL_SECONDS: int = 300
+    DEFAULT_DEVICE_THING_NAME: str = "InhaLockerPi2"
+
+    # 기기 heartbeat: 이 시간(초) 동안 heartbeat가 없으면 오프라인 / 상태 스냅샷 저장 주기(초, 오프라인 기준보다 짧게)
+    DEVICE_OFFLINE_AFTER_SECONDS: int = 90
+    DEVICE_HEARTBEAT_PERSIST_SECONDS: int = 30
+    DEVICE_PICKUP_REQUIRE_ONLINE: bool = True  # 오프라인 기기의 픽업 요청을 바로 거절
+
+    # Idempotency-Key 저장소: db(PostgreSQL, 인스턴스 간 공유) / memory(로컬)
+    IDEMPOTENCY_STORE: str = "db"
+    IDEMPOTENCY_TTL_SECONDS: int = 86400  # 첫 응답을 재사용하는 기간
+    IDEMPOTENCY_LOCK_SECONDS: int = 30  # 처리 중 요청이 이 시간 안에 끝나지 않으면 같은 키로 재처리 허용
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0  # 처리 중인 같은 키의 응답을 기다리는 최대 시간
+
+    # 태그 캐시 유지 시간 (초)
+    TAG_CACHE_TTL_SECONDS: int = 300
+
+    # 만료 코드 정리 작업(app.sweeper) 배치 설정
+    SWEEPER_BATCH_SIZE: int = 500
+    SWEEPER_MAX_BATCHES: int = 100
+
+    # 인증(토큰 -> 사용자) 캐시: 최대 항목 수 / 최대 유지 시간(초, 토큰 만료가 더 빠르면 그 시각까지)
+    AUTH_CACHE_MAX_ENTRIES: int = 1024
+    AUTH_CACHE_MAX_TTL_SECONDS: int = 300
+
+    # 비밀번호 해싱: bcrypt cost(변경 시 로그인할 때 새 cost로 재해싱) / 전용 워커 수(0이면 이벤트 루프에서 직접 실행) / 대기열 크기
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+
     # JWT 관련 설정
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
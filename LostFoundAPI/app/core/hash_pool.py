@@ -0,0 +1,78 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+
+class PasswordHashPool:
+    """
+    bcrypt 해싱/검증 전용 워커 풀
+    - 이벤트 루프에서 bcrypt(~250ms)를 직접 실행하지 않도록 별도 스레드에서 처리합니다.
+    - 워커 수 + 대기열 크기를 넘는 요청은 503으로 즉시 거절합니다.
+    - 워커 수가 0이면 이벤트 루프에서 바로 실행합니다. (풀 도입 전 동작, tests/bench_login.py 비교용)
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash") if max_workers > 0 else None
+        self.lock = threading.Lock()
+
+        self.in_flight = 0  # 대기 + 실행 중
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_ms = 0.0
+        self.total_run_ms = 0.0
+
+    def _task(self, submitted: float, fn, args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with self.lock:
+                self.total_wait_ms += (started - submitted) * 1000
+                self.total_run_ms += (finished - started) * 1000
+
+    async def run(self, fn, *args):
+        if self.executor is None:
+            result = self._task(time.perf_counter(), fn, args)
+            with self.lock:
+                self.completed += 1
+            return result
+
+        with self.lock:
+            if self.in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many authentication requests. Please retry shortly.",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.in_flight - self.max_workers)
+
+        try:
+            future = self.executor.submit(self._task, time.perf_counter(), fn, args)
+            return await asyncio.wrap_future(future)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def stats(self) -> dict:
+        completed = self.completed or 1
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.max_workers),
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_ms / completed, 2),
+            "avg_run_ms": round(self.total_run_ms / completed, 2),
+        }
@@ -0,0 +1,421 @@
+import re
+import json
+import time
+import asyncio
+import hashlib
+import datetime
+import threading
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update, delete, and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import IdempotencyKeys
+
+# 저장된 키 상태
+IN_PROGRESS = "IN_PROGRESS"
+COMPLETED = "COMPLETED"
+
+# begin() 결과
+NEW = "NEW"            # 이 요청이 처리 권한을 얻음
+REPLAY = "REPLAY"      # 저장된 첫 응답을 그대로 반환
+BUSY = "BUSY"          # 같은 키의 요청이 아직 처리 중
+MISMATCH = "MISMATCH"  # 같은 키로 본문이 다른 요청
+
+MAX_KEY_LENGTH = 255
+
+# Idempotency-Key를 받는 쓰기 API (POST, 경로 끝부분 기준 - API Gateway 스테이지 접두사 무관)
+IDEMPOTENT_PATHS = [
+    re.compile(r"/kiosk/pickup$"),
+    re.compile(r"/kiosk/locker/(open|close)$"),
+    re.compile(r"/kiosk/register/request$"),
+    re.compile(r"/items/\d+/claim$"),
+]
+
+# 컨테이너 단위 통계 (/dev/idempotency-stats)
+idempotency_stats = {"processed": 0, "stored": 0, "replayed": 0, "waited": 0, "busy": 0, "mismatched": 0, "released": 0}
+
+
+def _existing(record: dict, request_hash: str):
+    if record["request_hash"] != request_hash:
+        return MISMATCH, None
+    if record["status"] == COMPLETED:
+        return REPLAY, record["response"]
+    return BUSY, None
+
+
+class MemoryIdempotencyStore:
+    """
+    로컬/테스트용 저장소 (프로세스 단위이므로 여러 Lambda 인스턴스 간에는 공유되지 않음)
+    """
+
+    def __init__(self, ttl_seconds: int, lock_seconds: int, max_entries: int = 10000):
+        self.ttl = datetime.timedelta(seconds=ttl_seconds)
+        self.lock_timeout = datetime.timedelta(seconds=lock_seconds)
+        self.max_entries = max_entries
+        self.records = {}
+        self.lock = threading.Lock()
+
+    def begin(self, key: str, request_hash: str, now: datetime.datetime):
+        with self.lock:
+            if len(self.records) >= self.max_entries:
+                self._purge_expired(now)
+
+            record = self.records.get(key)
+
+            if record is None or record["expires_at"] <= now or (
+                record["status"] == IN_PROGRESS
+                and record["locked_until"] <= now
+                and record["request_hash"] == request_hash
+            ):
+                self.records[key] = {
+                    "request_hash": request_hash,
+                    "status": IN_PROGRESS,
+                    "locked_until": now + self.lock_timeout,
+                    "expires_at": now + self.ttl,
+                    "response": None,
+                }
+                return NEW, None
+
+            return _existing(record, request_hash)
+
+    def complete(self, key: str, response: dict):
+        with self.lock:
+            record = self.records.get(key)
+            if record is not None:
+                record.update(status=COMPLETED, locked_until=None, response=response)
+
+    def release(self, key: str):
+        with self.lock:
+            record = self.records.get(key)
+            if record is not None and record["status"] == IN_PROGRESS:
+                del self.records[key]
+
+    def _purge_expired(self, now: datetime.datetime):
+        for key in [key for key, record in self.records.items() if record["expires_at"] <= now]:
+            del self.records[key]
+
+
+class DatabaseIdempotencyStore:
+    """
+    PostgreSQL(idempotency_keys) 저장소: 여러 Lambda 인스턴스가 같은 키를 공유합니다.
+    - 키 선점은 INSERT ... ON CONFLICT DO NOTHING 한 번으로 처리하고,
+      만료되었거나 처리 중 비정상 종료된 키만 조건부 UPDATE로 다시 선점합니다.
+    """
+
+    def __init__(self, ttl_seconds: int, lock_seconds: int):
+        self.ttl = datetime.timedelta(seconds=ttl_seconds)
+        self.lock_timeout = datetime.timedelta(seconds=lock_seconds)
+
+    def begin(self, key: str, request_hash: str, now: datetime.datetime):
+        claim = {
+            "request_hash": request_hash,
+            "status": IN_PROGRESS,
+            "locked_until": now + self.lock_timeout,
+            "expires_at": now + self.ttl,
+        }
+
+        db = SessionLocal()
+        try:
+            claimed = db.execute(
+                pg_insert(IdempotencyKeys)
+                .values(key=key, **claim)
+                .on_conflict_do_nothing(index_elements=[IdempotencyKeys.key])
+                .returning(IdempotencyKeys.id)
+            ).first()
+
+            if claimed is None:
+                claimed = db.execute(
+                    update(IdempotencyKeys)
+                    .where(
+                        IdempotencyKeys.key == key,
+                        or_(
+                            IdempotencyKeys.expires_at <= now,
+                            and_(
+                                IdempotencyKeys.status == IN_PROGRESS,
+                                IdempotencyKeys.locked_until <= now,
+                                IdempotencyKeys.request_hash == request_hash
+                            )
+                        )
+                    )
+                    .values(response_status=None, response_headers=None, response_body=None, **claim)
+                    .returning(IdempotencyKeys.id)
+                ).first()
+
+            if claimed is not None:
+                db.commit()
+                return NEW, None
+
+            row = db.execute(
+                select(
+                    IdempotencyKeys.request_hash,
+                    IdempotencyKeys.status,
+                    IdempotencyKeys.response_status,
+                    IdempotencyKeys.response_headers,
+                    IdempotencyKeys.response_body,
+                )
+                .where(IdempotencyKeys.key == key)
+            ).first()
+            db.commit()
+
+            if row is None:
+                # 처리 중이던 요청이 실패해 키가 방금 해제됨 -> 다음 시도에서 다시 선점
+                return BUSY, None
+
+            return _existing({
+                "request_hash": row.request_hash,
+                "status": row.status,
+                "response": {"status": row.response_status, "headers": row.response_headers or [], "body": row.response_body},
+            }, request_hash)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def complete(self, key: str, response: dict):
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(IdempotencyKeys)
+                .where(IdempotencyKeys.key == key)
+                .values(
+                    status=COMPLETED,
+                    locked_until=None,
+                    response_status=response["status"],
+                    response_headers=response["headers"],
+                    response_body=response["body"]
+                )
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def release(self, key: str):
+        db = SessionLocal()
+        try:
+            db.execute(
+                delete(IdempotencyKeys)
+                .where(IdempotencyKeys.key == key, IdempotencyKeys.status == IN_PROGRESS)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+def _create_store():
+    if settings.IDEMPOTENCY_STORE == "memory":
+        return MemoryIdempotencyStore(settings.IDEMPOTENCY_TTL_SECONDS, settings.IDEMPOTENCY_LOCK_SECONDS)
+    return DatabaseIdempotencyStore(settings.IDEMPOTENCY_TTL_SECONDS, settings.IDEMPOTENCY_LOCK_SECONDS)
+
+
+idempotency_store = _create_store()
+
+
+def purge_expired_keys_batch(db: Session, now: datetime.datetime, batch_size: int) -> int:
+    """
+    만료된 Idempotency-Key를 최대 batch_size개 삭제합니다. (app.sweeper)
+    """
+    key_ids = [
+        key_id for (key_id,) in db.execute(
+            select(IdempotencyKeys.id)
+            .where(IdempotencyKeys.expires_at <= now)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+    ]
+
+    if not key_ids:
+        return 0
+
+    db.execute(delete(IdempotencyKeys).where(IdempotencyKeys.id.in_(key_ids)))
+    db.commit()
+    return len(key_ids)
+
+
+def get_idempotency_stats() -> dict:
+    return {"store": type(idempotency_store).__name__, **idempotency_stats}
+
+
+def _is_idempotent_path(path: str) -> bool:
+    return any(pattern.search(path) for pattern in IDEMPOTENT_PATHS)
+
+
+def _storage_key(path: str, authorization: str, idempotency_key: str) -> str:
+    """같은 키라도 API 경로 / 호출자(토큰)가 다르면 다른 요청으로 봅니다."""
+    return hashlib.sha256(f"api\n{path}\n{authorization or ''}\n{idempotency_key}".encode()).hexdigest()
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay_receive(body: bytes, receive):
+    """미리 읽은 본문을 다운스트림 앱에 한 번 더 전달"""
+    delivered = False
+
+    async def wrapped():
+        nonlocal delivered
+        if not delivered:
+            delivered = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return wrapped
+
+
+async def _send_response(send, status_code: int, headers: list, body: bytes):
+    raw_headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+    raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+    await send({"type": "http.response.start", "status": status_code, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_error(send, status_code: int, detail: str, headers: list = None):
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+    await _send_response(send, status_code, [["content-type", "application/json"]] + (headers or []), body)
+
+
+class IdempotencyMiddleware:
+    """
+    Idempotency-Key 헤더가 있는 쓰기 요청(IDEMPOTENT_PATHS)의 첫 응답을 저장하고,
+    같은 키로 재시도된 요청에는 DB 작업/사물함 명령 없이 저장된 응답을 돌려줍니다.
+    - 같은 키의 요청이 처리 중이면 끝날 때까지(최대 IDEMPOTENCY_WAIT_SECONDS) 기다렸다가 그 응답을 돌려줍니다.
+    - 5xx 응답과 예외는 저장하지 않으므로 재시도 시 다시 처리됩니다.
+    """
+
+    def __init__(self, app, store=None):
+        self.app = app
+        self.store = store if store is not None else idempotency_store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not _is_idempotent_path(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            await _send_error(send, 400, f"Idempotency-Key는 {MAX_KEY_LENGTH}자 이하여야 합니다.")
+            return
+
+        body = await _read_body(receive)
+        key = _storage_key(scope["path"], headers.get("authorization"), idempotency_key)
+
+        state, stored = await self._begin(key, hashlib.sha256(body).hexdigest())
+
+        if state == REPLAY:
+            idempotency_stats["replayed"] += 1
+            await _send_response(
+                send, stored["status"], stored["headers"] + [["idempotent-replayed", "true"]], stored["body"].encode("utf-8")
+            )
+            return
+
+        if state == MISMATCH:
+            idempotency_stats["mismatched"] += 1
+            await _send_error(send, 422, "같은 Idempotency-Key로 다른 요청이 이미 처리되었습니다.")
+            return
+
+        if state == BUSY:
+            idempotency_stats["busy"] += 1
+            await _send_error(
+                send, 409, "같은 Idempotency-Key의 요청이 아직 처리 중입니다. 잠시 후 다시 시도해 주세요.",
+                headers=[["retry-after", "1"]]
+            )
+            return
+
+        idempotency_stats["processed"] += 1
+        await self._process(scope, _replay_receive(body, receive), send, key)
+
+    async def _begin(self, key: str, request_hash: str):
+        """처리 중인 같은 키가 있으면 끝날 때까지 점점 간격을 늘려가며 다시 확인"""
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        delay = 0.05
+
+        while True:
+            state, stored = await run_in_threadpool(
+                self.store.begin, key, request_hash, datetime.datetime.utcnow()
+            )
+            if state != BUSY or time.monotonic() >= deadline:
+                return state, stored
+
+            idempotency_stats["waited"] += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    async def _process(self, scope, receive, send, key: str):
+        response = {"status": None, "headers": [], "chunks": []}
+        finished = False
+
+        async def capture(message):
+            nonlocal finished
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in message.get("headers", [])
+                    if name.lower() != b"content-length"
+                ]
+            elif message["type"] == "http.response.body":
+                response["chunks"].append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    # 응답을 보내기 전에 저장 -> 직후 도착한 재시도도 저장된 응답을 받음
+                    # (키오스크 픽업의 사물함 열기 같은 BackgroundTasks는 이후에 한 번만 실행)
+                    finished = True
+                    await self._finish(key, response["status"], response["headers"], b"".join(response["chunks"]))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture)
+        except Exception:
+            if not finished:
+                await self._release(key)
+            raise
+
+        if not finished:
+            await self._release(key)
+
+    async def _finish(self, key: str, status_code: int, headers: list, body: bytes):
+        if status_code >= 500:
+            await self._release(key)
+            return
+
+        try:
+            await run_in_threadpool(
+                self.store.complete, key, {"status": status_code, "headers": headers, "body": body.decode("utf-8")}
+            )
+            idempotency_stats["stored"] += 1
+        except Exception as e:
+            print(f"[Idempotency Error] 응답 저장 실패: {str(e)}")
+            await self._release(key)
+
+    async def _release(self, key: str):
+        try:
+            await run_in_threadpool(self.store.release, key)
+            idempotency_stats["released"] += 1
+        except Exception as e:
+            print(f"[Idempotency Error] 키 해제 실패: {str(e)}")
@@ -0,0 +1,127 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+
+class EntityVersions:
+    """
+    엔티티별 버전 카운터 ("items", "item:{id}", "tags")
+    - 서비스의 쓰기 작업이 버전을 올리면, 그 버전에 의존하는 캐시 응답은 더 이상 사용되지 않습니다.
+    - 컨테이너(프로세스) 단위이므로, 다른 컨테이너/Lambda의 쓰기는 TTL 이후 반영됩니다.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def bump(self, *names: str):
+        with self.lock:
+            for name in names:
+                self.counters[name] = self.counters.get(name, 0) + 1
+
+    def snapshot(self, names) -> tuple:
+        return tuple(self.counters.get(name, 0) for name in names)
+
+
+class ResponseCache:
+    """
+    직렬화된 응답 본문 + 강한 ETag 캐시 (LRU, TTL)
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (versions, expires_at, etag, body)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key, versions: tuple):
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached is None or cached[0] != versions or cached[1] <= time.time():
+                self.entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return cached[2], cached[3]
+
+    def put(self, key, versions: tuple, ttl_seconds: int, etag: str, body: bytes):
+        with self.lock:
+            self.entries[key] = (versions, time.time() + ttl_seconds, etag, body)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+entity_versions = EntityVersions()
+response_cache = ResponseCache(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def item_changed(item_id: int = None):
+    """아이템 생성/상태 변경 시 호출 (목록 + 해당 아이템 상세 캐시 무효화)"""
+    if item_id is None:
+        entity_versions.bump("items")
+    else:
+        entity_versions.bump("items", f"item:{item_id}")
+
+
+def tags_changed():
+    """태그 생성/수정/삭제 시 호출 (태그 목록 + 태그를 포함한 아이템 응답 캐시 무효화)"""
+    entity_versions.bump("tags")
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+async def cached_response(request: Request, key, depends_on, ttl_seconds: int, model, load) -> Response:
+    """
+    캐시된 응답을 반환하거나, 없으면 load()로 데이터를 만들어 캐시합니다.
+    - model: 응답 스키마 (response_model과 동일한 타입으로 직렬화)
+    - load: 데이터를 반환하는 async 함수 (오류 시 HTTPException을 발생시키면 캐시되지 않습니다)
+    - If-None-Match가 ETag와 같으면 본문 없이 304를 반환합니다.
+    """
+    versions = entity_versions.snapshot(depends_on)
+    cached = response_cache.get(key, versions)
+
+    if cached is None:
+        data = await load()
+        adapter = TypeAdapter(model)
+        body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        response_cache.put(key, versions, ttl_seconds, etag, body)
+        cache_status = "MISS"
+    else:
+        etag, body = cached
+        cache_status = "HIT"
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Cache": cache_status}
+
+    if _etag_matches(request, etag):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
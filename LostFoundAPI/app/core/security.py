@@ -6,8 +6,21 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import APIKeyHeader
 
 from app.core.config import settings # .env에서 읽어온 설정값
+from app.core.hash_pool import PasswordHashPool
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max를 설정값으로 고정해, cost가 바뀌면 기존 해시가 needs_update 대상이 됩니다.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+password_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -15,6 +28,25 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    """
+    비밀번호를 검증하고, 해시의 cost가 현재 설정과 다르면 새 해시를 함께 반환합니다.
+    Returns: (검증 결과, 새 해시 또는 None)
+    """
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False, None
+
+    if pwd_context.needs_update(hashed_password):
+        return True, pwd_context.hash(plain_password)
+
+    return True, None
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_pool.run(get_password_hash, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str):
+    return await password_pool.run(verify_and_update_password, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
 
@@ -34,20 +66,28 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
 
 oauth2_scheme = APIKeyHeader(name="Authorization")
 
-def verify_access_token(token: str, credentials_exception: HTTPException):
+# IoT Rule HTTP 액션 -> 서버 웹훅 인증용 공유 비밀값 헤더
+locker_webhook_scheme = APIKeyHeader(name="X-Locker-Secret", auto_error=False)
+
+def decode_access_token(token: str, credentials_exception: HTTPException) -> dict:
     """
-    JWT 토큰을 검증하고, 유효하면 payload(sub: email)를 반환합니다.
+    JWT 토큰을 검증하고, 유효하면 payload 전체(sub, exp, uid ...)를 반환합니다.
     """
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
 
-        email: str = payload.get("sub")
-        if email is None:
+        if payload.get("sub") is None:
             raise credentials_exception
 
-        return email
+        return payload
 
     except JWTError:
         raise credentials_exception
+
+def verify_access_token(token: str, credentials_exception: HTTPException):
+    """
+    JWT 토큰을 검증하고, 유효하면 payload(sub: email)를 반환합니다.
+    """
+    return decode_access_token(token, credentials_exception)["sub"]
@@ -1,16 +1,114 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL
-)
+# ============================================================
+# 엔진 / 커넥션 풀 설정
+# - Lambda 컨테이너가 warm 상태로 재사용되는 동안 커넥션을 유지합니다.
+# - RDS Proxy 등 외부 풀러를 사용할 때는 DB_USE_EXTERNAL_POOLER=true 로
+#   앱 내부 풀을 끄고(NullPool) 매 요청마다 프록시에 연결합니다.
+# ============================================================
+
+if settings.DB_USE_EXTERNAL_POOLER:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        poolclass=NullPool
+    )
+else:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_timeout=settings.DB_POOL_TIMEOUT
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 풀 사용 통계 (checkout 중 새 물리 커넥션을 연 경우 miss, 재사용이면 hit)
+pool_stats = {"checkouts": 0, "connects": 0}
+
+
+@event.listens_for(engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    pool_stats["connects"] += 1
+
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_stats["checkouts"] += 1
+
+
+def get_pool_stats() -> dict:
+    """
+    커넥션 풀 hit/miss 통계를 반환합니다. (cold/warm 비용 측정용)
+    """
+    checkouts = pool_stats["checkouts"]
+    misses = min(pool_stats["connects"], checkouts)
+    return {
+        "mode": "external" if settings.DB_USE_EXTERNAL_POOLER else "internal",
+        "checkouts": checkouts,
+        "hits": checkouts - misses,
+        "misses": misses,
+        "pool_status": engine.pool.status()
+    }
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# ============================================================
+# 비동기 엔진 (DB_ASYNC_MODE=true 일 때만 생성)
+# ============================================================
+
+def _async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_ASYNC_MODE:
+    if settings.DB_USE_EXTERNAL_POOLER:
+        async_engine = create_async_engine(
+            _async_database_url(),
+            poolclass=NullPool
+        )
+    else:
+        async_engine = create_async_engine(
+            _async_database_url(),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_timeout=settings.DB_POOL_TIMEOUT
+        )
+
+    # 커밋 후 lazy load가 일어나지 않도록 expire_on_commit=False
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+
+async def get_async_db():
+    """
+    비동기 모드일 때 AsyncSession을, 아니면 None을 반환하는 의존성
+    (None이면 컨트롤러는 기존 동기 Session 경로를 사용합니다)
+    """
+    if AsyncSessionLocal is None:
+        yield None
+        return
+
+    async with AsyncSessionLocal() as adb:
+        yield adb
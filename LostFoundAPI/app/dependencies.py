@@ -1,20 +1,54 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+import time
+
+from fastapi import Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
-from app.core.security import oauth2_scheme, verify_access_token
+from app.core.config import settings
+from app.core.security import oauth2_scheme, locker_webhook_scheme, decode_access_token
+from app.core.auth_cache import principal_cache
 from app.db.session import get_db
-from app.service import user_service
+from app.service import user_service, manager_service
 from app.models import Users
 from app.models.manager import Managers, ManagerRole
 
+def _bearer_token(authorization: str, credentials_exception: HTTPException) -> str:
+    if not authorization or not authorization.startswith("Bearer "):
+        raise credentials_exception
+
+    return authorization.split("Bearer ")[1]
+
+def _cached_claims(kind: str, token: str, credentials_exception: HTTPException):
+    """
+    캐시에 있으면 JWT 디코딩 없이 (entry, True), 없으면 검증 후 캐시에 넣고 (entry, False)
+    """
+    entry = principal_cache.get(kind, token)
+    if entry is not None:
+        return entry, True
+
+    claims = decode_access_token(token, credentials_exception)
+    return principal_cache.put(kind, token, claims), False
+
+def _report_auth_time(response: Response, started: float, cache_hit: bool):
+    """
+    인증 오버헤드를 응답 헤더(Server-Timing)로 보고합니다.
+    """
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    response.headers["Server-Timing"] = (
+        f'auth;dur={elapsed_ms:.2f};desc="{"hit" if cache_hit else "miss"}"'
+    )
+
 def get_current_user(
+        response: Response,
         authorization: str = Depends(oauth2_scheme),
         db: Session = Depends(get_db)
 ) -> Users:
     """
     토큰을 검증하고, DB에서 현재 사용자 객체를 찾아 반환하는 의존성
     (APIKeyHeader 방식: 'Bearer ' 접두사 수동 파싱)
+    - 검증된 토큰 -> 사용자는 principal_cache에 보관되어, 캐시 적중 시 DB를 조회하지 않습니다.
     """
+    started = time.perf_counter()
 
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -22,41 +56,75 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    if not authorization or not authorization.startswith("Bearer "):
-        raise credentials_exception
+    token = _bearer_token(authorization, credentials_exception)
+    entry, cache_hit = _cached_claims("user", token, credentials_exception)
 
-    token = authorization.split("Bearer ")[1]
+    user = entry["principal"]
+    if user is None:
+        cache_hit = False
+        user = user_service.get_user_by_email(db, email=entry["claims"]["sub"])
 
-    email = verify_access_token(token, credentials_exception)
+        if user is None:
+            raise credentials_exception
 
-    user = user_service.get_user_by_email(db, email=email)
+        db.expunge(user)
+        principal_cache.put("user", token, entry["claims"], principal=user)
 
-    if user is None:
-        raise credentials_exception
+    user = db.merge(user, load=False)
 
+    _report_auth_time(response, started, cache_hit)
     return user
 
+def get_current_user_id(
+        response: Response,
+        authorization: str = Depends(oauth2_scheme),
+        db: Session = Depends(get_db)
+) -> int:
+    """
+    현재 사용자 id만 필요한 핸들러용 의존성
+    - 토큰에 담긴 'uid'를 사용하므로 DB를 조회하지 않습니다.
+    - 'uid'가 없는 (이전에 발급된) 토큰은 get_current_user로 처리합니다.
+    """
+    started = time.perf_counter()
+
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    token = _bearer_token(authorization, credentials_exception)
+    entry, cache_hit = _cached_claims("user", token, credentials_exception)
+
+    user_id = entry["claims"].get("uid")
+    if user_id is None:
+        return get_current_user(response, authorization, db).id
+
+    _report_auth_time(response, started, cache_hit)
+    return user_id
+
 def get_current_admin(
+        response: Response,
         authorization: str = Depends(oauth2_scheme),
         db: Session = Depends(get_db)
 ) -> Managers:
     """
     토큰을 검증하고, 현재 요청한 사용자가 '관리자(Manager)'인지 확인합니다.
+    - 캐시는 토큰 검증(claims)에만 사용하고, 관리자 행은 요청마다 DB에서 읽습니다.
+      (다른 컨테이너에서 비활성화/권한 변경된 관리자가 캐시 TTL 동안 권한을 유지하지 않도록)
     """
+    started = time.perf_counter()
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate admin credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    if not authorization or not authorization.startswith("Bearer "):
-        raise credentials_exception
-
-    token = authorization.split("Bearer ")[1]
-
-    email = verify_access_token(token, credentials_exception)
+    token = _bearer_token(authorization, credentials_exception)
+    entry, cache_hit = _cached_claims("manager", token, credentials_exception)
 
-    manager = db.query(Managers).filter(Managers.email == email).first()
+    manager = manager_service.get_manager_by_email(db, email=entry["claims"]["sub"])
 
     if manager is None:
         raise credentials_exception
@@ -64,6 +132,7 @@ def get_current_admin(
     if not manager.is_active:
         raise HTTPException(status_code=400, detail="Inactive admin account")
 
+    _report_auth_time(response, started, cache_hit)
     return manager
 
 # 최고 관리자(ADMIN)만 접근 가능한 의존성 추가
@@ -76,3 +145,22 @@ def get_super_admin(
             detail="Not enough permissions"
         )
     return current_admin
+
+def verify_locker_webhook(
+        secret: str | None = Depends(locker_webhook_scheme)
+) -> None:
+    """
+    IoT Rule HTTP 액션이 보낸 X-Locker-Secret 헤더를 LOCKER_WEBHOOK_SECRET과 비교합니다.
+    - 비밀값이 설정되지 않은 서버는 모든 웹훅 요청을 거절합니다.
+    """
+    if not settings.LOCKER_WEBHOOK_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Locker webhook secret is not configured"
+        )
+
+    if not secret or not hmac.compare_digest(secret.encode(), settings.LOCKER_WEBHOOK_SECRET.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid locker webhook secret"
+        )
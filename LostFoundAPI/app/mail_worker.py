@@ -0,0 +1,60 @@
+"""
+메일 큐(SQS) 소비 작업
+
+- Lambda (SQS 트리거, ReportBatchItemFailures 사용): 핸들러 `app.mail_worker.handler`
+- CLI: `python -m app.mail_worker` (SQS를 롱 폴링하며 계속 전송)
+"""
+import json
+
+from app.core.config import settings
+from app.service import email_service
+from app.service.mail_queue import mail_queue, SQSMailQueue
+
+
+def _send_message(body: str, message_id: str):
+    """
+    메시지 하나를 전송합니다.
+    Returns: 전송 성공 여부, 형식이 잘못된 메시지(JSON 오류, to/code 누락 등)는 None
+    (잘못된 메시지는 재시도해도 실패하므로 큐에서 제거하고, 같은 배치의 다른 메시지는 계속 처리)
+    """
+    try:
+        return email_service.send_payload(json.loads(body))
+    except (ValueError, KeyError) as e:
+        print(f"[Mail Worker] invalid message {message_id}: {str(e)}")
+        return None
+
+
+def handler(event, context):
+    """
+    배치의 모든 메일을 하나의 SMTP 연결로 보내고, 실패한 메시지만 SQS에 되돌립니다.
+    """
+    failures = []
+
+    for record in event.get("Records", []):
+        if _send_message(record["body"], record.get("messageId")) is False:
+            failures.append({"itemIdentifier": record["messageId"]})
+
+    print(f"[Mail Worker] {json.dumps(email_service.smtp_sender.stats)}")
+    return {"batchItemFailures": failures}
+
+
+def poll_forever():
+    if not isinstance(mail_queue, SQSMailQueue):
+        raise SystemExit("EMAIL_QUEUE_URL is not set")
+
+    while True:
+        response = mail_queue.client.receive_message(
+            QueueUrl=mail_queue.queue_url,
+            MaxNumberOfMessages=min(settings.EMAIL_BATCH_SIZE, 10),
+            WaitTimeSeconds=20
+        )
+
+        for message in response.get("Messages", []):
+            if _send_message(message["Body"], message.get("MessageId")) is not False:
+                mail_queue.client.delete_message(
+                    QueueUrl=mail_queue.queue_url, ReceiptHandle=message["ReceiptHandle"]
+                )
+
+
+if __name__ == "__main__":
+    poll_forever()
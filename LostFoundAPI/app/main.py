@@ -10,6 +10,7 @@ from app.controller import kiosks as kiosks_router
 from app.controller import dev as dev_router
 from app.controller import admin as admin_router
 from app.controller import locker as locker_router
+from app.core.idempotency import IdempotencyMiddleware
 
 app = FastAPI(
     title="Inha LostFound API",
@@ -25,6 +26,9 @@ origins = [
     "https://jong-sul-kiosk.vercel.app" #키오스크 Web 배포 주소
 ]
 
+# 키오스크/주인 등록 쓰기 요청의 Idempotency-Key 재시도 처리 (CORS 안쪽 -> 재사용 응답에도 CORS 헤더 적용)
+app.add_middleware(IdempotencyMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
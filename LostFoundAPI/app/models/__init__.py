@@ -6,3 +6,8 @@ from .lost_item_tag import LostItem_Tags
 from .user import Users
 from .pickup_code import PickupCodes
 from .manager import Managers, ManagerRole
+from .locker import Lockers
+from .locker_command import LockerCommands, LockerCommandStatus
+from .device import Devices
+from .device_heartbeat import DeviceHeartbeats
+from .idempotency_key import IdempotencyKeys
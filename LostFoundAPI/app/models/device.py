@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, BigInteger, Integer, Boolean
+from .base import Base, TimestampMixin
+
+# 사물함 기기 등록부: 분실물/사물함 칸에 저장된 device_name을 실제 IoT 기기와 설치 위치로 연결합니다.
+class Devices(Base, TimestampMixin):
+    __tablename__ = "devices"
+
+    id = Column(BigInteger, primary_key=True, index=True)
+
+    # LostItems.device_name / Lockers.device_name 과 같은 값 (예: '60주년-1')
+    device_name = Column(String(255), unique=True, nullable=False)
+
+    # MQTT 토픽에 쓰이는 IoT 기기 이름 (예: 'InhaLockerPi2') -> {topic_prefix}/compartment/{thing_name}
+    thing_name = Column(String(255), nullable=False)
+    topic_prefix = Column(String(64), default="locker", nullable=False)
+
+    location = Column(String(255), nullable=True)
+    compartments = Column(Integer, default=0, nullable=False)  # 사물함 칸 수
+
+    is_active = Column(Boolean, default=True, nullable=False)
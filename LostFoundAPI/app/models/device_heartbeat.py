@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, JSON
+from .base import Base, TimestampMixin
+
+# 사물함 기기 상태(heartbeat) 스냅샷: 인메모리 상태를 주기적으로 저장해 다른 인스턴스/재시작 후에도 조회합니다.
+class DeviceHeartbeats(Base, TimestampMixin):
+    __tablename__ = "device_heartbeats"
+
+    id = Column(BigInteger, primary_key=True, index=True)
+
+    # heartbeat를 보낸 IoT 기기 이름 (Devices.thing_name, 토픽 {topic_prefix}/heartbeat/{device_name})
+    device_name = Column(String(255), unique=True, nullable=False)
+
+    last_seen_at = Column(DateTime, nullable=False)
+    firmware = Column(String(64), nullable=True)
+    door_states = Column(JSON, nullable=True)  # {"1": "CLOSED", "2": "OPEN", "chute": "CLOSED"}
+    uptime_seconds = Column(BigInteger, nullable=True)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, BigInteger, Integer, DateTime, Text, JSON, Index
+from .base import Base, TimestampMixin
+
+# Idempotency-Key 저장소: 같은 키로 재시도된 쓰기 요청에 첫 응답을 그대로 돌려줍니다.
+# (LostFoundAPI 미들웨어와 ItemRegister Lambda가 함께 사용)
+class IdempotencyKeys(Base, TimestampMixin):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # 만료 키 정리 (app.sweeper)
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    id = Column(BigInteger, primary_key=True, index=True)
+
+    # sha256(범위 + 호출자 + Idempotency-Key) hex
+    key = Column(String(64), unique=True, nullable=False)
+    request_hash = Column(String(64), nullable=False)  # 요청 본문 sha256 (같은 키의 다른 요청 감지)
+
+    status = Column(String(16), nullable=False)  # IN_PROGRESS / COMPLETED
+    locked_until = Column(DateTime, nullable=True)  # 처리 중 요청이 비정상 종료된 경우 이 시각 이후 재처리 허용
+
+    response_status = Column(Integer, nullable=True)
+    response_headers = Column(JSON, nullable=True)  # [[name, value], ...]
+    response_body = Column(Text, nullable=True)
+
+    expires_at = Column(DateTime, nullable=False)
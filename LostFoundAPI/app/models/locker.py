@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, BigInteger, Integer, Boolean, UniqueConstraint
+from .base import Base, TimestampMixin
+
+class Lockers(Base, TimestampMixin):
+    __tablename__ = "lockers"
+    __table_args__ = (
+        UniqueConstraint("device_name", "locker_number", name="uq_lockers_device_name_locker_number"),
+    )
+
+    id = Column(BigInteger, primary_key=True, index=True)
+
+    # 사물함이 연결된 기기 이름과 기기 내 칸 번호 (LostItems.locker_id와 동일한 번호)
+    device_name = Column(String(255), nullable=False, index=True)
+    locker_number = Column(BigInteger, nullable=False)
+
+    capacity = Column(Integer, default=1, nullable=False)   # 보관 가능한 최대 분실물 수
+    occupancy = Column(Integer, default=0, nullable=False)  # 현재 보관 중인 분실물 수
+
+    is_active = Column(Boolean, default=True, nullable=False)
@@ -0,0 +1,46 @@
+import enum
+from sqlalchemy import Column, String, BigInteger, Integer, Float, DateTime, Text, Enum, Index
+from .base import Base, TimestampMixin
+import datetime
+
+class LockerCommandStatus(str, enum.Enum):
+    PENDING = "대기"
+    ACKED = "완료"
+    TIMEOUT = "시간초과"
+    FAILED = "실패"
+
+# 사물함 명령 원장: 발행한 명령과 기기의 응답(ack)을 correlation_id로 연결합니다.
+class LockerCommands(Base, TimestampMixin):
+    __tablename__ = "locker_commands"
+    __table_args__ = (
+        # 관리자 통계 조회 (기기별 / 최근 구간)
+        Index("ix_locker_commands_device_name_published_at", "device_name", "published_at"),
+        # 응답 시간 초과 처리 (app.sweeper)
+        Index("ix_locker_commands_status_published_at", "status", "published_at"),
+    )
+
+    id = Column(BigInteger, primary_key=True, index=True)
+    correlation_id = Column(String(32), unique=True, nullable=False)
+
+    device_name = Column(String(255), nullable=False)
+    locker_id = Column(BigInteger, nullable=True)
+    action = Column(String(32), nullable=False)
+    topic = Column(String(255), nullable=False)
+
+    status = Column(
+        Enum(LockerCommandStatus,
+             name="locker_command_status",
+             create_type=False,
+             native_enum=False,
+             values_callable=lambda obj: [e.value for e in obj]
+             ),
+        default=LockerCommandStatus.PENDING,
+        nullable=False
+    )
+
+    attempts = Column(Integer, default=0, nullable=False)  # 발행 시도 횟수 (재시도 포함)
+    publish_latency_ms = Column(Float, nullable=True)      # 브로커 발행 소요 시간
+    published_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    acked_at = Column(DateTime, nullable=True)
+    ack_latency_ms = Column(Float, nullable=True)          # 발행 요청 -> 기기 ack 까지 소요 시간
+    error = Column(Text, nullable=True)
@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, String, BigInteger, DateTime, Text, ForeignKey, Enum
+from sqlalchemy import Column, String, BigInteger, DateTime, Text, ForeignKey, Enum, Index, func, literal_column
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 import datetime
@@ -12,9 +12,17 @@ class LostItemStatus(str, enum.Enum):
 
 class LostItems(Base, TimestampMixin):
     __tablename__ = "lostitems"
+    __table_args__ = (
+        # GET /items 키셋 페이지네이션용 (registered_at DESC, id DESC 정렬)
+        Index("ix_lostitems_registered_at_id", "registered_at", "id"),
+        Index("ix_lostitems_status_registered_at_id", "status", "registered_at", "id"),
+        # ItemRegister 중복 등록 판별용 (기기별 최근 등록 조회)
+        Index("ix_lostitems_device_name_registered_at", "device_name", "registered_at"),
+    )
 
     id = Column(BigInteger, primary_key=True, index=True)
     photo_url = Column(String(2048), nullable=False)
+    photo_phash = Column(String(16), nullable=True)  # 64bit perceptual hash (hex, 중복 등록 판별용)
     device_name = Column(String(255))
     location = Column(String(255), index=True)
     locker_id = Column(BigInteger, nullable=True, index=True)
@@ -56,3 +64,22 @@ class LostItems(Base, TimestampMixin):
     @property
     def pickup_code(self):
         return self.pickup_codes[0] if self.pickup_codes else None
+
+
+# 검색용 tsvector 표현식 (search_service의 쿼리와 동일한 식이어야 인덱스를 사용)
+search_vector = func.to_tsvector(
+    literal_column("'simple'"),
+    func.coalesce(LostItems.description, "") + " " + func.coalesce(LostItems.location, "")
+)
+
+# 전문 검색 / 부분 일치(pg_trgm) 인덱스 - PostgreSQL 전용
+# (DB에 CREATE EXTENSION IF NOT EXISTS pg_trgm; 이 선행되어야 합니다)
+Index("ix_lostitems_search_tsv", search_vector, postgresql_using="gin").ddl_if(dialect="postgresql")
+Index(
+    "ix_lostitems_description_trgm", LostItems.description,
+    postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_lostitems_location_trgm", LostItems.location,
+    postgresql_using="gin", postgresql_ops={"location": "gin_trgm_ops"}
+).ddl_if(dialect="postgresql")
@@ -1,13 +1,32 @@
-from sqlalchemy import Column, String, BigInteger, DateTime, Boolean, ForeignKey, Text  # <-- Text 추가
+from sqlalchemy import Column, String, BigInteger, DateTime, Boolean, ForeignKey, Text, Index, Sequence, text  # <-- Text 추가
 from sqlalchemy.orm import relationship
 from .base import Base, TimestampMixin
 import datetime
 
+# 6자리 픽업 코드 공간 (100000 ~ 999999)
+CODE_OFFSET = 100000
+CODE_SPACE = 900000
+
+# 픽업 코드 할당용 순환 시퀀스 (pickup_code_service에서 순열로 섞어 사용)
+pickup_code_seq = Sequence(
+    "pickup_code_seq", start=0, minvalue=0, maxvalue=CODE_SPACE - 1, cycle=True, metadata=Base.metadata
+)
+
 class PickupCodes(Base, TimestampMixin):
     __tablename__ = "pickupcodes"
+    __table_args__ = (
+        # 키오스크 픽업 검증용 - 사용/취소되지 않은 활성 코드만 담는 부분 인덱스
+        # (활성 코드끼리만 유일하면 되므로, 사용/취소된 코드는 재활용 가능)
+        Index(
+            "ix_pickupcodes_active_code", "code",
+            unique=True,
+            postgresql_where=text("is_used = false AND cancelled_at IS NULL"),
+            sqlite_where=text("is_used = 0 AND cancelled_at IS NULL")
+        ),
+    )
 
     id = Column(BigInteger, primary_key=True, index=True)
-    code = Column(String(6), unique=True, nullable=False, index=True)
+    code = Column(String(6), nullable=False, index=True)
 
     # Mixin의 created_at과 별개인, 코드 '생성' 및 '만료' 시각
     generated_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
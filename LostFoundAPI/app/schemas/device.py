@@ -0,0 +1,43 @@
+from typing import Optional, Dict
+from pydantic import BaseModel, Field
+import datetime
+
+# 기기 상태 응답 스키마 (status: ONLINE / OFFLINE / UNKNOWN)
+class DeviceHealth(BaseModel):
+    device_name: str
+    status: str
+    last_seen_at: Optional[datetime.datetime] = None
+    seconds_since_seen: Optional[float] = None
+    firmware: Optional[str] = None
+    doors: Dict[str, str] = {}
+    uptime_seconds: Optional[int] = None
+
+# 사물함 기기 응답 스키마
+class DeviceResponse(BaseModel):
+    id: int
+    device_name: str
+    thing_name: str
+    topic_prefix: str
+    location: Optional[str] = None
+    compartments: int
+    is_active: bool
+    health: Optional[DeviceHealth] = None  # 관리자 목록 조회 시 채워짐
+
+    class Config:
+        from_attributes = True
+
+# 관리자용 사물함 기기 등록/수정 스키마 (device_name 기준 upsert)
+class DeviceUpsert(BaseModel):
+    device_name: str
+    thing_name: str
+    topic_prefix: str = "locker"
+    location: Optional[str] = None
+    compartments: int = Field(0, ge=0)
+    is_active: bool = True
+
+# 기기 -> 서버 heartbeat 스키마 (IoT Rule HTTP 액션 또는 기기 직접 호출)
+class DeviceHeartbeat(BaseModel):
+    device_name: str  # IoT 기기 이름
+    firmware: Optional[str] = None
+    doors: Dict[str, str] = {}  # 사물함 번호(또는 "chute") -> "OPEN" / "CLOSED"
+    uptime_seconds: Optional[int] = None
@@ -19,6 +19,11 @@ class ItemResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# 1.1 API를 위한 페이지 응답 스키마 (키셋 페이지네이션)
+class ItemPageResponse(BaseModel):
+    items: List[ItemResponse] = []
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
+
 # 1.4 API를 위한 전용 응답 스키마
 class ClaimResponse(BaseModel):
     item: ItemResponse
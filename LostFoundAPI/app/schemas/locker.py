@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+
+# 사물함 칸 응답 스키마
+class LockerResponse(BaseModel):
+    id: int
+    device_name: str
+    locker_number: int
+    capacity: int
+    occupancy: int
+    is_active: bool
+
+    class Config:
+        from_attributes = True
+
+# 관리자용 사물함 칸 등록/수정 스키마 (device_name + locker_number 기준 upsert)
+class LockerUpsert(BaseModel):
+    device_name: str
+    locker_number: int
+    capacity: int = Field(1, ge=0)
+    is_active: bool = True
@@ -0,0 +1,40 @@
+from typing import Optional
+from pydantic import BaseModel
+import datetime
+
+# 기기 -> 서버 명령 응답(ack) 스키마 (IoT Rule HTTP 액션 또는 기기 직접 호출)
+class LockerCommandAck(BaseModel):
+    correlation_id: str
+    device_name: Optional[str] = None
+    ok: bool = True
+    error: Optional[str] = None
+
+# 관리자용 명령 이력 응답 스키마
+class LockerCommandResponse(BaseModel):
+    id: int
+    correlation_id: str
+    device_name: str
+    locker_id: Optional[int] = None
+    action: str
+    status: str
+    attempts: int
+    publish_latency_ms: Optional[float] = None
+    published_at: datetime.datetime
+    acked_at: Optional[datetime.datetime] = None
+    ack_latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+# 관리자용 기기/사물함별 명령 통계 응답 스키마
+class LockerCommandStats(BaseModel):
+    device_name: str
+    locker_id: Optional[int] = None
+    commands: int
+    acked: int
+    timeouts: int
+    failed: int
+    retries: int
+    avg_ack_latency_ms: Optional[float] = None
+    max_ack_latency_ms: Optional[float] = None
@@ -0,0 +1,80 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.core import response_cache
+from app.models import LostItems, LostItemStatus, Users
+from app.service import async_pickup_code_service
+from app.service.item_service import (
+    decode_item_cursor,
+    items_page_statement,
+    split_page,
+    tags_by_item_ids_statement,
+    group_tags_by_item,
+    to_item_dicts,
+)
+
+# item_service의 AsyncSession 버전 (DB_ASYNC_MODE)
+# - 쿼리 구성은 item_service와 공유하고, 실행만 await 합니다.
+
+async def get_items_page(
+        adb: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+        status: Optional[LostItemStatus] = None
+):
+    """
+    분실물 리스트를 (registered_at, id) 키셋 기준 최신순으로 한 페이지씩 조회합니다.
+    """
+    cursor_key = None
+    if cursor:
+        cursor_key = decode_item_cursor(cursor)
+        if cursor_key is None:
+            return "INVALID_CURSOR"
+
+    rows = (await adb.execute(items_page_statement(limit, cursor_key, status))).all()
+    rows, next_cursor = split_page(rows, limit)
+
+    item_ids = [row.id for row in rows]
+    tags_by_item = {}
+    if item_ids:
+        tag_rows = (await adb.execute(tags_by_item_ids_statement(item_ids))).all()
+        tags_by_item = group_tags_by_item(item_ids, tag_rows)
+
+    return {"items": to_item_dicts(rows, tags_by_item), "next_cursor": next_cursor}
+
+async def get_item_by_id_with_tags(adb: AsyncSession, item_id: int):
+    """
+    ID로 단일 분실물을 (연관된 태그와 함께) 조회합니다.
+    """
+    result = await adb.execute(
+        select(LostItems)
+        .options(selectinload(LostItems.tags))
+        .where(LostItems.id == item_id)
+    )
+    return result.scalars().first()
+
+async def claim_item_by_id(adb: AsyncSession, item_id: int, current_user: Users):
+    """
+    현재 사용자가 특정 분실물을 '보관'에서 '예약' 상태로 등록하고
+    픽업 코드를 생성합니다.
+    """
+    item = await get_item_by_id_with_tags(adb, item_id)
+
+    if not item:
+        return None  # 404: 아이템 없음
+
+    if item.status != LostItemStatus.STORAGE:
+        return "ALREADY_CLAIMED"  # 400
+
+    item.status = LostItemStatus.RESERVED
+    item.found_by_user_id = current_user.id
+
+    new_code = await async_pickup_code_service.create_pickup_code(
+        adb, item=item, user_id=current_user.id
+    )
+
+    await adb.commit()
+    response_cache.item_changed(item_id)
+
+    return {"item": item, "pickup_code": new_code}
@@ -0,0 +1,59 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import datetime
+
+from app.core import response_cache
+from app.models import PickupCodes
+from app.service.async_item_service import get_item_by_id_with_tags
+from app.service.kiosk_service import (
+    REDEEM_PICKUP_CODE_SQL,
+    redemption_params,
+    redeemed_item,
+    failure_reason_statement,
+    failure_reason_from_status,
+)
+
+# kiosk_service의 AsyncSession 버전 (DB_ASYNC_MODE)
+
+
+async def complete_pickup_by_code(adb: AsyncSession, pickup_code_str: str):
+    """
+    픽업 코드를 검증하고, 유효하면 아이템 상태를 '찾음'으로 변경합니다.
+    (kiosk_service와 동일한 단일 UPDATE ... RETURNING 문 사용)
+    """
+    now = datetime.datetime.utcnow()
+
+    result = await adb.execute(REDEEM_PICKUP_CODE_SQL, redemption_params(pickup_code_str, now))
+    row = result.first()
+
+    if row is None:
+        await adb.rollback()
+        item_status = (await adb.execute(failure_reason_statement(pickup_code_str, now))).scalar()
+        return failure_reason_from_status(item_status)
+
+    await adb.commit()
+    response_cache.item_changed(row.id)
+    return redeemed_item(row)
+
+
+async def fetch_item_by_pickup_code(adb: AsyncSession, pickup_code_str: str):
+    """
+    픽업 코드로 아이템 정보를 조회합니다. (상태 변경 없음)
+    """
+    result = await adb.execute(
+        select(PickupCodes.lost_item_id)
+        .where(PickupCodes.code == pickup_code_str)
+        .order_by(PickupCodes.id.desc())
+        .limit(1)
+    )
+    lost_item_id = result.scalar()
+
+    if lost_item_id is None:
+        return "INVALID_CODE"
+
+    item = await get_item_by_id_with_tags(adb, item_id=lost_item_id)
+
+    if not item:
+        return "INVALID_CODE"
+
+    return item
@@ -0,0 +1,41 @@
+import datetime
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import LostItems, PickupCodes
+from app.models.pickup_code import pickup_code_seq
+from app.service.pickup_code_service import code_from_index, is_code_conflict, PICKUP_CODE_MAX_ATTEMPTS
+
+# pickup_code_service의 AsyncSession 버전 (DB_ASYNC_MODE)
+
+async def generate_unique_code(adb: AsyncSession, length: int = 6) -> str:
+    """
+    6자리 '숫자' 코드를 생성합니다. (시퀀스 + 순열, 활성 코드와의 충돌은 create_pickup_code에서 재할당)
+    """
+    index = (await adb.execute(select(pickup_code_seq.next_value()))).scalar()
+    return code_from_index(index)
+
+async def create_pickup_code(adb: AsyncSession, item: LostItems, user_id: int) -> PickupCodes:
+    """
+    특정 아이템과 사용자에 대한 픽업 코드를 생성합니다.
+    """
+    expires_at = datetime.datetime.utcnow() + datetime.timedelta(days=7)
+
+    for attempt in range(PICKUP_CODE_MAX_ATTEMPTS):
+        db_pickup_code = PickupCodes(
+            lost_item_id=item.id,
+            user_id=user_id,
+            code=await generate_unique_code(adb),
+            expires_at=expires_at,
+            is_used=False
+        )
+
+        try:
+            # 코드가 활성 코드와 겹치면 이 INSERT만 되돌리고 다음 시퀀스 값으로 재시도
+            async with adb.begin_nested():
+                adb.add(db_pickup_code)
+            return db_pickup_code
+        except IntegrityError as e:
+            if not is_code_conflict(e) or attempt + 1 == PICKUP_CODE_MAX_ATTEMPTS:
+                raise
+            print(f"[Pickup Code] 활성 코드와 충돌하여 다시 할당합니다: {db_pickup_code.code}")
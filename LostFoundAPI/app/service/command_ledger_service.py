@@ -0,0 +1,197 @@
+import datetime
+from typing import Optional
+from sqlalchemy import select, update, func, case, and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import LockerCommands, LockerCommandStatus
+
+# 기기 ack 토픽 ({topic_prefix}/ack/{device_name})
+ACK_TOPIC_FILTER = "+/ack/+"
+
+
+class CommandLedger:
+    """
+    locker_transport의 발행 전/후 기록을 locker_commands 테이블에 남깁니다.
+    (발행 스레드에서 호출되므로 요청 세션과 별도의 세션을 사용)
+    """
+
+    def command_started(self, correlation_id: str, topic: str, message: dict):
+        db = SessionLocal()
+        try:
+            db.add(LockerCommands(
+                correlation_id=correlation_id,
+                device_name=topic.rsplit("/", 1)[-1],
+                locker_id=message.get("locker_id"),
+                action=message.get("action", "UNKNOWN"),
+                topic=topic,
+                status=LockerCommandStatus.PENDING,
+                published_at=datetime.datetime.utcnow()
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[Command Ledger Error] {str(e)}")
+        finally:
+            db.close()
+
+    def command_finished(self, correlation_id: str, attempts: int, publish_latency_ms: Optional[float], error: Optional[str]):
+        values = {"attempts": attempts, "publish_latency_ms": publish_latency_ms}
+        if error is not None:
+            values.update(status=LockerCommandStatus.FAILED, error=error)
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(LockerCommands)
+                .where(LockerCommands.correlation_id == correlation_id)
+                .values(**values)
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[Command Ledger Error] {str(e)}")
+        finally:
+            db.close()
+
+
+def record_ack(db: Session, correlation_id: str, ok: bool = True, error: Optional[str] = None):
+    """
+    기기 ack를 명령에 연결하고 발행 -> ack 지연을 기록합니다.
+    - 대기 중인 명령만 완료/실패로 바뀌며, 시간 초과 후 도착한 ack는 지연만 기록합니다.
+    - 같은 ack가 중복 도착해도 처음 기록을 유지합니다.
+    """
+    command = (
+        db.query(LockerCommands)
+        .filter(LockerCommands.correlation_id == correlation_id)
+        .with_for_update()
+        .first()
+    )
+
+    if not command:
+        return None
+    if command.acked_at is not None:
+        return command
+
+    now = datetime.datetime.utcnow()
+    command.acked_at = now
+    command.ack_latency_ms = (now - command.published_at).total_seconds() * 1000
+
+    if command.status == LockerCommandStatus.PENDING:
+        command.status = LockerCommandStatus.ACKED if ok else LockerCommandStatus.FAILED
+    if error:
+        command.error = error
+
+    db.commit()
+    db.refresh(command)
+    return command
+
+
+def _on_ack_message(topic: str, message: dict):
+    """MQTT / 인메모리 브로커 구독 콜백"""
+    correlation_id = message.get("correlation_id")
+    if not correlation_id:
+        return
+
+    db = SessionLocal()
+    try:
+        record_ack(db, correlation_id, ok=message.get("ok", True), error=message.get("error"))
+    except Exception as e:
+        db.rollback()
+        print(f"[Command Ledger Error] {str(e)}")
+    finally:
+        db.close()
+
+
+def install(transport):
+    """
+    발행기에 원장을 연결하고, 구독 가능한 브로커라면 ack 토픽을 구독합니다.
+    """
+    transport.ledger = CommandLedger()
+    try:
+        transport.backend.subscribe(ACK_TOPIC_FILTER, _on_ack_message)
+    except Exception as e:
+        print(f"[Command Ledger] ack 토픽 구독 실패: {e}")
+
+
+def timeout_commands_batch(db: Session, now: datetime.datetime, batch_size: int) -> int:
+    """
+    응답 대기 시간이 지난 명령을 최대 batch_size개 '시간초과'로 표시합니다. (app.sweeper)
+    """
+    deadline = now - datetime.timedelta(seconds=settings.LOCKER_ACK_TIMEOUT_SECONDS)
+
+    command_ids = [
+        command_id for (command_id,) in db.execute(
+            select(LockerCommands.id)
+            .where(LockerCommands.status == LockerCommandStatus.PENDING, LockerCommands.published_at <= deadline)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+    ]
+
+    if not command_ids:
+        return 0
+
+    db.execute(
+        update(LockerCommands)
+        .where(LockerCommands.id.in_(command_ids), LockerCommands.status == LockerCommandStatus.PENDING)
+        .values(status=LockerCommandStatus.TIMEOUT)
+    )
+    db.commit()
+    return len(command_ids)
+
+
+def get_recent_commands(db: Session, limit: int, device_name: Optional[str] = None):
+    query = db.query(LockerCommands)
+    if device_name:
+        query = query.filter(LockerCommands.device_name == device_name)
+    return query.order_by(LockerCommands.published_at.desc()).limit(limit).all()
+
+
+def get_command_stats(db: Session, since_minutes: int, device_name: Optional[str] = None) -> list:
+    """
+    기기/사물함별 명령 수, 완료/시간초과/실패/재시도 수, ack 지연(평균/최대)을 집계합니다.
+    (아직 sweeper가 표시하지 않은 대기 초과 명령도 시간초과로 계산)
+    """
+    now = datetime.datetime.utcnow()
+    deadline = now - datetime.timedelta(seconds=settings.LOCKER_ACK_TIMEOUT_SECONDS)
+
+    overdue = and_(LockerCommands.status == LockerCommandStatus.PENDING, LockerCommands.published_at <= deadline)
+
+    def count_if(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    statement = (
+        select(
+            LockerCommands.device_name,
+            LockerCommands.locker_id,
+            func.count(LockerCommands.id).label("commands"),
+            count_if(LockerCommands.status == LockerCommandStatus.ACKED).label("acked"),
+            count_if(or_(LockerCommands.status == LockerCommandStatus.TIMEOUT, overdue)).label("timeouts"),
+            count_if(LockerCommands.status == LockerCommandStatus.FAILED).label("failed"),
+            func.sum(case((LockerCommands.attempts > 1, LockerCommands.attempts - 1), else_=0)).label("retries"),
+            func.avg(LockerCommands.ack_latency_ms).label("avg_ack_latency_ms"),
+            func.max(LockerCommands.ack_latency_ms).label("max_ack_latency_ms"),
+        )
+        .where(LockerCommands.published_at >= now - datetime.timedelta(minutes=since_minutes))
+        .group_by(LockerCommands.device_name, LockerCommands.locker_id)
+        .order_by(LockerCommands.device_name, LockerCommands.locker_id)
+    )
+    if device_name:
+        statement = statement.where(LockerCommands.device_name == device_name)
+
+    return [
+        {
+            "device_name": row.device_name,
+            "locker_id": row.locker_id,
+            "commands": row.commands,
+            "acked": row.acked or 0,
+            "timeouts": row.timeouts or 0,
+            "failed": row.failed or 0,
+            "retries": row.retries or 0,
+            "avg_ack_latency_ms": round(row.avg_ack_latency_ms, 1) if row.avg_ack_latency_ms is not None else None,
+            "max_ack_latency_ms": round(row.max_ack_latency_ms, 1) if row.max_ack_latency_ms is not None else None,
+        }
+        for row in db.execute(statement).all()
+    ]
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from app.models import LostItems, Tags, Users, PickupCodes
 from app.models.lost_item import LostItemStatus
 from app.service import tag_service  # (기존 tag_service 활용)
+from app.core import response_cache
 
 # 미리 정의된 태그 목록 (랜덤 선택용)
 DUMMY_TAGS = ["지갑", "휴대폰", "에어팟", "카드", "학생증", "우산", "노트북", "가방"]
@@ -60,6 +61,7 @@ def create_dummy_items(db: Session, count: int) -> list[LostItems]:
 
     # 4. DB에 일괄 커밋
     db.commit()
+    response_cache.item_changed()
 
     # 5. 생성된 객체 반환
     return created_items
@@ -87,4 +89,6 @@ def delete_dummy_items(db: Session) -> int:
     ).delete(synchronize_session=False)
 
     db.commit()
+    for item_id in item_ids:
+        response_cache.item_changed(item_id)
     return item_count
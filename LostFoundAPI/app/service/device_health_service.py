@@ -0,0 +1,219 @@
+import time
+import datetime
+import threading
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import DeviceHeartbeats
+
+# 기기 heartbeat 토픽 ({topic_prefix}/heartbeat/{device_name})
+HEARTBEAT_TOPIC_FILTER = "+/heartbeat/+"
+
+ONLINE = "ONLINE"
+OFFLINE = "OFFLINE"
+UNKNOWN = "UNKNOWN"  # heartbeat를 한 번도 보내지 않은 기기 (구버전 펌웨어)
+
+
+class DeviceHealthStore:
+    """
+    device_name -> {last_seen, firmware, doors, uptime_seconds} 인메모리 상태
+    - heartbeat마다 메모리만 갱신하고, 펌웨어/문 상태가 바뀌었거나
+      persist_interval_seconds가 지났을 때만 device_heartbeats 테이블에 저장합니다.
+    - 다른 인스턴스가 받은 heartbeat는 저장된 스냅샷을 읽어 합칩니다.
+    """
+
+    def __init__(self, offline_after_seconds: int, persist_interval_seconds: int):
+        self.offline_after_seconds = offline_after_seconds
+        self.persist_interval_seconds = persist_interval_seconds
+        self.states = {}
+        self.lock = threading.Lock()
+
+    def record(self, device_name: str, firmware: Optional[str], doors: dict, uptime_seconds: Optional[int], seen_at: float):
+        """
+        heartbeat를 반영하고 (상태, 저장 필요 여부)를 반환합니다.
+        """
+        with self.lock:
+            previous = self.states.get(device_name)
+            state = {
+                "last_seen": seen_at,
+                "firmware": firmware if firmware is not None else (previous or {}).get("firmware"),
+                "doors": doors,
+                "uptime_seconds": uptime_seconds,
+                "persisted_at": (previous or {}).get("persisted_at", 0.0),
+            }
+
+            should_persist = (
+                previous is None
+                or previous["firmware"] != state["firmware"]
+                or previous["doors"] != state["doors"]
+                or seen_at - state["persisted_at"] >= self.persist_interval_seconds
+            )
+            if should_persist:
+                state["persisted_at"] = seen_at
+
+            self.states[device_name] = state
+            return dict(state), should_persist
+
+    def merge(self, device_name: str, state: dict):
+        """저장된 스냅샷이 메모리 상태보다 최신이면 교체합니다."""
+        with self.lock:
+            current = self.states.get(device_name)
+            if current is None or current["last_seen"] < state["last_seen"]:
+                self.states[device_name] = state
+
+    def get(self, device_name: str) -> Optional[dict]:
+        with self.lock:
+            state = self.states.get(device_name)
+            return dict(state) if state else None
+
+    def is_fresh(self, state: Optional[dict], now: float) -> bool:
+        return state is not None and now - state["last_seen"] <= self.offline_after_seconds
+
+
+health_store = DeviceHealthStore(
+    offline_after_seconds=settings.DEVICE_OFFLINE_AFTER_SECONDS,
+    persist_interval_seconds=settings.DEVICE_HEARTBEAT_PERSIST_SECONDS
+)
+
+
+def _to_epoch(value: datetime.datetime) -> float:
+    return value.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+def _from_epoch(value: float) -> datetime.datetime:
+    return datetime.datetime.utcfromtimestamp(value)
+
+
+def _row_to_state(row: DeviceHeartbeats) -> dict:
+    last_seen = _to_epoch(row.last_seen_at)
+    return {
+        "last_seen": last_seen,
+        "firmware": row.firmware,
+        "doors": row.door_states or {},
+        "uptime_seconds": row.uptime_seconds,
+        "persisted_at": last_seen,
+    }
+
+
+def _to_health(device_name: str, state: Optional[dict], now: float) -> dict:
+    if state is None:
+        return {"device_name": device_name, "status": UNKNOWN}
+
+    return {
+        "device_name": device_name,
+        "status": ONLINE if health_store.is_fresh(state, now) else OFFLINE,
+        "last_seen_at": _from_epoch(state["last_seen"]),
+        "seconds_since_seen": round(now - state["last_seen"], 1),
+        "firmware": state["firmware"],
+        "doors": state["doors"],
+        "uptime_seconds": state["uptime_seconds"],
+    }
+
+
+def _persist(db: Session, device_name: str, state: dict):
+    row = db.query(DeviceHeartbeats).filter(DeviceHeartbeats.device_name == device_name).first()
+
+    if row is None:
+        row = DeviceHeartbeats(device_name=device_name)
+        db.add(row)
+
+    row.last_seen_at = _from_epoch(state["last_seen"])
+    row.firmware = state["firmware"]
+    row.door_states = state["doors"]
+    row.uptime_seconds = state["uptime_seconds"]
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # 다른 인스턴스가 같은 기기의 첫 스냅샷을 먼저 저장한 경우 (다음 주기에 갱신)
+        db.rollback()
+
+
+def record_heartbeat(db: Session, device_name: str, firmware: Optional[str] = None, doors: Optional[dict] = None, uptime_seconds: Optional[int] = None) -> dict:
+    """
+    기기 heartbeat를 기록하고 현재 상태를 반환합니다. (대부분 DB 쓰기 없음)
+    """
+    now = time.time()
+    doors = {str(key): str(value) for key, value in (doors or {}).items()}
+
+    state, should_persist = health_store.record(device_name, firmware, doors, uptime_seconds, seen_at=now)
+    if should_persist:
+        _persist(db, device_name, state)
+
+    return _to_health(device_name, state, now)
+
+
+def _on_heartbeat_message(topic: str, message: dict):
+    """MQTT / 인메모리 브로커 구독 콜백"""
+    device_name = message.get("device_name") or topic.rsplit("/", 1)[-1]
+
+    db = SessionLocal()
+    try:
+        record_heartbeat(
+            db,
+            device_name,
+            firmware=message.get("firmware"),
+            doors=message.get("doors"),
+            uptime_seconds=message.get("uptime_seconds")
+        )
+    except Exception as e:
+        db.rollback()
+        print(f"[Device Health Error] {str(e)}")
+    finally:
+        db.close()
+
+
+def install(transport):
+    """
+    구독 가능한 브로커라면 heartbeat 토픽을 구독합니다.
+    (HTTPS 방식은 IoT Rule -> POST /locker/heartbeat 로 받습니다.)
+    """
+    try:
+        transport.backend.subscribe(HEARTBEAT_TOPIC_FILTER, _on_heartbeat_message)
+    except Exception as e:
+        print(f"[Device Health] heartbeat 토픽 구독 실패: {e}")
+
+
+def get_device_health(db: Session, device_name: str) -> dict:
+    """
+    기기 상태를 조회합니다.
+    - 메모리 상태가 최신(온라인)이면 DB 조회 없이 반환하고,
+      아니면 다른 인스턴스가 저장한 스냅샷을 읽어 합칩니다.
+    """
+    now = time.time()
+    state = health_store.get(device_name)
+
+    if not health_store.is_fresh(state, now):
+        row = db.query(DeviceHeartbeats).filter(DeviceHeartbeats.device_name == device_name).first()
+        if row is not None:
+            health_store.merge(device_name, _row_to_state(row))
+            state = health_store.get(device_name)
+
+    return _to_health(device_name, state, now)
+
+
+def is_device_offline(db: Session, device_name: str) -> bool:
+    """
+    heartbeat가 끊긴 기기인지 확인합니다. (한 번도 heartbeat를 보내지 않은 기기는 막지 않음)
+    """
+    return get_device_health(db, device_name)["status"] == OFFLINE
+
+
+def get_all_device_health(db: Session) -> dict:
+    """
+    저장된 스냅샷과 메모리 상태를 합쳐 device_name -> 상태 dict를 반환합니다. (관리자 조회)
+    """
+    for row in db.query(DeviceHeartbeats).all():
+        health_store.merge(row.device_name, _row_to_state(row))
+
+    now = time.time()
+    with health_store.lock:
+        states = dict(health_store.states)
+
+    return {
+        device_name: _to_health(device_name, state, now)
+        for device_name, state in sorted(states.items())
+    }
@@ -0,0 +1,117 @@
+import time
+import threading
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from app.models import Devices
+from app.core.config import settings
+
+
+class DeviceRegistry:
+    """
+    device_name -> {thing_name, topic_prefix, location, compartments, is_active} 인메모리 캐시
+    - 전체 기기 목록을 한 번에 읽어 두고, TTL이 지나거나 관리자 수정 시 다시 읽습니다.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.entries = {}
+        self.expires_at = 0.0
+        self.lock = threading.Lock()
+
+    def _load(self, db: Session):
+        entries = {
+            device.device_name: _to_entry(device)
+            for device in db.query(Devices).all()
+        }
+        with self.lock:
+            self.entries = entries
+            self.expires_at = time.time() + self.ttl_seconds
+
+    def get(self, db: Session, device_name: Optional[str]) -> Optional[dict]:
+        if self.expires_at <= time.time():
+            self._load(db)
+
+        return self.entries.get(device_name)
+
+    def invalidate(self):
+        with self.lock:
+            self.expires_at = 0.0
+
+
+device_registry = DeviceRegistry(ttl_seconds=settings.DEVICE_REGISTRY_TTL_SECONDS)
+
+
+def _to_entry(device: Devices) -> dict:
+    return {
+        "device_name": device.device_name,
+        "thing_name": device.thing_name,
+        "topic_prefix": device.topic_prefix,
+        "location": device.location,
+        "compartments": device.compartments,
+        "is_active": device.is_active,
+    }
+
+
+def _unregistered_entry(device_name: str, thing_name: str) -> dict:
+    return {
+        "device_name": device_name,
+        "thing_name": thing_name,
+        "topic_prefix": "locker",
+        "location": None,
+        "compartments": 0,
+        "is_active": True,
+    }
+
+
+def resolve_device(db: Session, device_name: str) -> dict:
+    """
+    키오스크 요청의 device_name으로 명령을 보낼 기기 정보를 찾습니다. (캐시 적중 시 DB 조회 없음)
+    - 등록부에 없으면 같은 이름의 IoT 기기로 간주합니다.
+    """
+    entry = device_registry.get(db, device_name)
+    return entry if entry is not None else _unregistered_entry(device_name, device_name)
+
+
+def resolve_item_locker(db: Session, item):
+    """
+    아이템의 device_name / locker_id 로 (기기 정보, 사물함 번호)를 찾습니다.
+    - 배정된 사물함 칸이 없으면 첫 번째 태그의 기본 사물함 번호를 사용합니다.
+    - 사물함 번호를 알 수 없으면 (기기 정보, None)
+    """
+    locker_id = item.locker_id
+    if locker_id is None and item.tags:
+        locker_id = item.tags[0].locker_number
+
+    entry = device_registry.get(db, item.device_name)
+    if entry is None:
+        # 등록부에 없는 기기의 분실물은 기본 IoT 기기로 보냅니다. (등록부 도입 이전 동작)
+        entry = _unregistered_entry(item.device_name, settings.DEFAULT_DEVICE_THING_NAME)
+
+    return entry, locker_id
+
+
+def get_all_devices(db: Session):
+    return db.query(Devices).order_by(Devices.device_name).all()
+
+
+def upsert_device(db: Session, device_in):
+    """
+    device_name 기준으로 기기를 등록하거나 IoT 기기/위치/칸 수/사용 여부를 수정합니다.
+    """
+    device = db.query(Devices).filter(Devices.device_name == device_in.device_name).first()
+
+    if device is None:
+        device = Devices(device_name=device_in.device_name)
+        db.add(device)
+
+    device.thing_name = device_in.thing_name
+    device.topic_prefix = device_in.topic_prefix
+    device.location = device_in.location
+    device.compartments = device_in.compartments
+    device.is_active = device_in.is_active
+
+    db.commit()
+    db.refresh(device)
+    device_registry.invalidate()
+    return device
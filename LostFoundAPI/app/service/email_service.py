@@ -1,22 +1,18 @@
+import time
+import html
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.core.config import settings
 
-def send_verification_email(to_email: str, code: str) -> bool:
-    """
-    Gmail SMTP를 사용하여 인증 코드를 전송합니다.
-    Returns:
-        bool: 전송 성공 여부
-    """
-    smtp_server = "smtp.gmail.com"
-    smtp_port = 465
-    sender_email = settings.GMAIL_USER
-    password = settings.GMAIL_PASSWORD
+SMTP_SERVER = "smtp.gmail.com"
+SMTP_PORT = 465
 
-    subject = "[인하분실물센터] 회원가입 인증번호 안내"
+VERIFICATION_SUBJECT = "[인하분실물센터] 회원가입 인증번호 안내"
 
-    body = f"""
+# 인증 메일 본문은 코드 자리만 바뀌므로, 앞/뒤 HTML을 모듈 로드 시 한 번만 만들어 둡니다.
+_VERIFICATION_HTML_HEAD = """
     <html>
     <head>
         <style>
@@ -47,7 +43,8 @@ def send_verification_email(to_email: str, code: str) -> bool:
 
                 <div style="background-color: #f8f9fa; border: 1px solid #e9ecef; border-radius: 6px; padding: 20px; margin-bottom: 30px;">
                     <span style="color: #002855; font-size: 32px; font-weight: 800; letter-spacing: 8px; display: block;">
-                        {code}
+                        """
+_VERIFICATION_HTML_TAIL = """
                     </span>
                 </div>
 
@@ -67,19 +64,114 @@ def send_verification_email(to_email: str, code: str) -> bool:
         </div>
     </body>
     </html>
-    """
+"""
+
+
+def render_verification_email(code: str) -> str:
+    return _VERIFICATION_HTML_HEAD + html.escape(code) + _VERIFICATION_HTML_TAIL
+
 
+def build_verification_message(to_email: str, code: str) -> MIMEMultipart:
     msg = MIMEMultipart()
-    msg["From"] = sender_email
+    msg["From"] = settings.GMAIL_USER
     msg["To"] = to_email
-    msg["Subject"] = subject
-    msg.attach(MIMEText(body, "html"))
-
-    try:
-        with smtplib.SMTP_SSL(smtp_server, smtp_port) as server:
-            server.login(sender_email, password)
-            server.send_message(msg)
-        return True
-    except Exception as e:
-        print(f"[Email Send Error] {str(e)}")
+    msg["Subject"] = VERIFICATION_SUBJECT
+    msg.attach(MIMEText(render_verification_email(code), "html"))
+    return msg
+
+
+# 템플릿 이름 -> 메시지 생성 함수 (메일 큐 메시지의 "template" 값)
+TEMPLATES = {
+    "verification": lambda payload: build_verification_message(payload["to"], payload["code"]),
+}
+
+
+class SMTPSender:
+    """
+    로그인된 SMTP_SSL 연결을 유지하며 메일을 보냅니다.
+    - 유휴 시간이 길었다면 NOOP으로 연결을 확인하고, 끊겼으면 다시 연결합니다.
+    - 전송 실패 시 재연결 후 지수 백오프로 재시도합니다.
+    """
+
+    def __init__(self, max_attempts: int, retry_base_seconds: float, idle_check_seconds: float):
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.idle_check_seconds = idle_check_seconds
+        self.server = None
+        self.last_used = 0.0
+        self.lock = threading.Lock()
+        self.stats = {"sent": 0, "failed": 0, "retries": 0, "connections": 0}
+
+    def _connect(self):
+        server = smtplib.SMTP_SSL(SMTP_SERVER, SMTP_PORT, timeout=10)
+        server.login(settings.GMAIL_USER, settings.GMAIL_PASSWORD)
+        self.server = server
+        self.stats["connections"] += 1
+
+    def _ensure_connection(self):
+        if self.server is not None and time.time() - self.last_used > self.idle_check_seconds:
+            try:
+                if self.server.noop()[0] != 250:
+                    self.close()
+            except smtplib.SMTPException:
+                self.close()
+            except OSError:
+                self.close()
+
+        if self.server is None:
+            self._connect()
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+        self.server = None
+
+    def send(self, msg) -> bool:
+        with self.lock:
+            for attempt in range(self.max_attempts):
+                try:
+                    self._ensure_connection()
+                    self.server.send_message(msg)
+                    self.last_used = time.time()
+                    self.stats["sent"] += 1
+                    return True
+                except Exception as e:
+                    print(f"[Email Send Error] attempt {attempt + 1}/{self.max_attempts}: {str(e)}")
+                    self.close()
+                    if attempt + 1 < self.max_attempts:
+                        self.stats["retries"] += 1
+                        time.sleep(self.retry_base_seconds * (2 ** attempt))
+
+            self.stats["failed"] += 1
+            return False
+
+
+smtp_sender = SMTPSender(
+    max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+    retry_base_seconds=settings.EMAIL_RETRY_BASE_SECONDS,
+    idle_check_seconds=settings.EMAIL_SMTP_IDLE_CHECK_SECONDS
+)
+
+
+def send_payload(payload: dict) -> bool:
+    """
+    메일 큐 메시지({"template", "to", ...})를 템플릿으로 만들어 전송합니다.
+    """
+    build = TEMPLATES.get(payload.get("template"))
+    if build is None:
+        print(f"[Email Send Error] unknown template: {payload.get('template')}")
         return False
+
+    return smtp_sender.send(build(payload))
+
+
+def send_verification_email(to_email: str, code: str) -> bool:
+    """
+    Gmail SMTP를 사용하여 인증 코드를 즉시 전송합니다. (요청 경로에서는 mail_queue를 사용)
+    Returns:
+        bool: 전송 성공 여부
+    """
+    return smtp_sender.send(build_verification_message(to_email, code))
@@ -1,9 +1,16 @@
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session, joinedload
 from app.models import LostItems, Users, Tags, LostItem_Tags, LostItemStatus, PickupCodes
 from typing import List, Optional
+import base64
+import binascii
 import datetime
+import json
 from app.service import pickup_code_service
 from app.service import tag_service
+from app.service import search_service
+from app.service import locker_inventory_service
+from app.core import response_cache
 
 def get_all_items_with_tags(db: Session):
     """
@@ -15,6 +22,146 @@ def get_all_items_with_tags(db: Session):
         .all()
     )
 
+# ItemResponse에 필요한 컬럼만 조회 (ORM 객체 전체 로딩 방지)
+ITEM_LIST_COLUMNS = (
+    LostItems.id,
+    LostItems.photo_url,
+    LostItems.location,
+    LostItems.locker_id,
+    LostItems.device_name,
+    LostItems.status,
+    LostItems.registered_at,
+)
+
+def encode_item_cursor(registered_at: datetime.datetime, item_id: int) -> str:
+    """
+    (registered_at, id) 키셋을 불투명한 커서 문자열로 인코딩합니다.
+    """
+    raw = json.dumps({"r": registered_at.isoformat(), "i": item_id})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_item_cursor(cursor: str):
+    """
+    커서 문자열을 (registered_at, id)로 복원합니다. 형식이 잘못되면 None을 반환합니다.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.datetime.fromisoformat(data["r"]), int(data["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+        return None
+
+def tags_by_item_ids_statement(item_ids: List[int]):
+    """
+    여러 분실물의 태그를 한 번에 조회하는 SELECT 문 (동기/비동기 공용)
+    """
+    return (
+        select(LostItem_Tags.lost_item_id, Tags.id, Tags.name, Tags.locker_number)
+        .join(Tags, Tags.id == LostItem_Tags.tag_id)
+        .where(LostItem_Tags.lost_item_id.in_(item_ids))
+        .order_by(LostItem_Tags.id)
+    )
+
+def group_tags_by_item(item_ids: List[int], rows) -> dict:
+    """
+    태그 조회 결과를 {item_id: [tag, ...]} 형태로 묶습니다.
+    """
+    tags_by_item = {item_id: [] for item_id in item_ids}
+    for lost_item_id, tag_id, name, locker_number in rows:
+        tags_by_item[lost_item_id].append(
+            {"id": tag_id, "name": name, "locker_number": locker_number}
+        )
+    return tags_by_item
+
+def get_tags_by_item_ids(db: Session, item_ids: List[int]) -> dict:
+    """
+    여러 분실물의 태그를 한 번의 쿼리로 조회하여 {item_id: [tag, ...]} 형태로 반환합니다.
+    """
+    if not item_ids:
+        return {}
+    rows = db.execute(tags_by_item_ids_statement(item_ids)).all()
+    return group_tags_by_item(item_ids, rows)
+
+def to_item_dicts(rows, tags_by_item: dict) -> list:
+    """
+    ITEM_LIST_COLUMNS로 조회한 행들을 태그를 포함한 ItemResponse 형태의 dict로 변환합니다.
+    """
+    return [
+        {
+            "id": row.id,
+            "photo_url": row.photo_url,
+            "location": row.location,
+            "locker_id": row.locker_id,
+            "device_name": row.device_name,
+            "status": row.status,
+            "registered_at": row.registered_at,
+            "tags": tags_by_item.get(row.id, []),
+        }
+        for row in rows
+    ]
+
+def _to_item_dicts(db: Session, rows) -> list:
+    return to_item_dicts(rows, get_tags_by_item_ids(db, [row.id for row in rows]))
+
+def items_page_statement(limit: int, cursor_key=None, status: Optional[LostItemStatus] = None):
+    """
+    (registered_at, id) 키셋 페이지 조회 SELECT 문 (동기/비동기 공용)
+    - 다음 페이지 존재 여부 확인을 위해 limit + 1개를 조회합니다.
+    """
+    stmt = select(*ITEM_LIST_COLUMNS)
+
+    if status is not None:
+        stmt = stmt.where(LostItems.status == status)
+
+    if cursor_key is not None:
+        cursor_at, cursor_id = cursor_key
+        stmt = stmt.where(
+            or_(
+                LostItems.registered_at < cursor_at,
+                and_(LostItems.registered_at == cursor_at, LostItems.id < cursor_id)
+            )
+        )
+
+    return (
+        stmt.order_by(LostItems.registered_at.desc(), LostItems.id.desc())
+        .limit(limit + 1)
+    )
+
+def split_page(rows, limit: int):
+    """
+    limit + 1개로 조회한 결과를 (현재 페이지 행, 다음 커서)로 나눕니다.
+    """
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_next and rows:
+        last = rows[-1]
+        next_cursor = encode_item_cursor(last.registered_at, last.id)
+
+    return rows, next_cursor
+
+def get_items_page(
+        db: Session,
+        limit: int,
+        cursor: Optional[str] = None,
+        status: Optional[LostItemStatus] = None
+):
+    """
+    분실물 리스트를 (registered_at, id) 키셋 기준 최신순으로 한 페이지씩 조회합니다.
+    - 커서가 잘못된 경우 "INVALID_CURSOR"를 반환합니다.
+    """
+    cursor_key = None
+    if cursor:
+        cursor_key = decode_item_cursor(cursor)
+        if cursor_key is None:
+            return "INVALID_CURSOR"
+
+    rows = db.execute(items_page_statement(limit, cursor_key, status)).all()
+    rows, next_cursor = split_page(rows, limit)
+
+    return {"items": _to_item_dicts(db, rows), "next_cursor": next_cursor}
+
 def get_item_by_id_with_tags(db: Session, item_id: int):
     """
     ID로 단일 분실물을 (연관된 태그와 함께) 조회합니다.
@@ -52,23 +199,24 @@ def claim_item_by_id(db: Session, item_id: int, current_user: Users):
     )
 
     db.commit()
+    response_cache.item_changed(item_id)
     db.refresh(item)
     db.refresh(new_code)
 
     return {"item": item, "pickup_code": new_code}
 
-def get_claimed_items_by_user(db: Session, current_user: Users):
+def get_claimed_items_by_user(db: Session, user_id: int):
     """
     나의 분실물 리스트 조회
     """
     return (
         db.query(LostItems)
-        .filter(LostItems.found_by_user_id == current_user.id)
+        .filter(LostItems.found_by_user_id == user_id)
         .options(joinedload(LostItems.tags))
         .all()
     )
 
-def get_my_claimed_item_details(db: Session, item_id: int, current_user: Users):
+def get_my_claimed_item_details(db: Session, item_id: int, user_id: int):
     """
     나의 분실물 상세 + 픽업 코드 확인
     """
@@ -80,47 +228,30 @@ def get_my_claimed_item_details(db: Session, item_id: int, current_user: Users):
     )
 
     if not item: return None
-    if item.found_by_user_id != current_user.id: return "FORBIDDEN"
+    if item.found_by_user_id != user_id: return "FORBIDDEN"
 
     pickup_code = item.pickup_code
     if not pickup_code:
         return "CODE_NOT_FOUND"
 
-    if pickup_code.expires_at <= datetime.datetime.utcnow():
-        print(f"Pickup code {pickup_code.code} expired. Reissuing...")
-
-        new_code_str = pickup_code_service.generate_unique_code(db)
-        new_expires_at = datetime.datetime.utcnow() + datetime.timedelta(days=7)
-
-        # 만료 시 갱신 (새 코드를 생성하지 않고 기존 최신 코드를 연장)
-        pickup_code.code = new_code_str
-        pickup_code.expires_at = new_expires_at
-        pickup_code.generated_at = datetime.datetime.utcnow()
-        pickup_code.is_used = False
-
-        db.commit()
-        db.refresh(pickup_code)
-
+    # 만료된 코드는 app.sweeper 가 정리하므로 조회 경로에서는 쓰기를 하지 않습니다.
     return {"item": item, "pickup_code": pickup_code}
 
-def search_items(db: Session, q: Optional[str], tags: Optional[List[int]]):
-    query = (
-        db.query(LostItems)
-        .options(joinedload(LostItems.tags))
-    )
-    if q:
-        search_query = f"%{q}%"
-        query = query.filter(
-            (LostItems.description.ilike(search_query)) |
-            (LostItems.location.ilike(search_query))
-        )
-    if tags:
-        query = query.join(LostItem_Tags).filter(LostItem_Tags.tag_id.in_(tags))
+def search_items(db: Session, q: Optional[str], tags: Optional[List[int]], limit: int = 20, offset: int = 0):
+    """
+    검색어/태그로 분실물을 관련도 및 최신순으로 검색합니다. (search_service 참고)
+    """
+    item_ids = search_service.search_item_ids(db, q=q, tags=tags, limit=limit, offset=offset)
+    if not item_ids:
+        return []
 
-    query = query.group_by(LostItems.id)
-    return query.all()
+    rows_by_id = {
+        row.id: row for row in db.query(*ITEM_LIST_COLUMNS).filter(LostItems.id.in_(item_ids)).all()
+    }
+    rows = [rows_by_id[item_id] for item_id in item_ids if item_id in rows_by_id]
+    return _to_item_dicts(db, rows)
 
-def cancel_reservation(db: Session, item_id: int, current_user: Users, cancel_reason: str):
+def cancel_reservation(db: Session, item_id: int, user_id: int, cancel_reason: str):
     """
     예약 취소 (이력 보존)
     """
@@ -129,7 +260,7 @@ def cancel_reservation(db: Session, item_id: int, current_user: Users, cancel_re
     ).filter(LostItems.id == item_id).first()
 
     if not item: return None
-    if item.found_by_user_id != current_user.id: return "FORBIDDEN"
+    if item.found_by_user_id != user_id: return "FORBIDDEN"
     if item.status != LostItemStatus.RESERVED: return "NOT_YOURS"
 
     # 가장 최신의 유효한 코드를 찾음
@@ -159,6 +290,7 @@ def cancel_reservation(db: Session, item_id: int, current_user: Users, cancel_re
     item.found_at = None
 
     db.commit()
+    response_cache.item_changed(item_id)
     db.refresh(item)
     db.refresh(pickup_code)
 
@@ -174,12 +306,23 @@ def create_lost_item(db: Session, item_in):
         status=LostItemStatus.STORAGE
     )
 
-    for tag_name in item_in.tags:
-        tag = tag_service.get_or_create_tag(db, tag_name)
-        new_item.tags.append(tag)
+    # 태그 일괄 조회/생성 (태그 개수와 무관하게 최대 2~3회 왕복)
+    tags = tag_service.get_or_create_tags(db, item_in.tags)
+
+    # 사물함 칸 배정 (태그 기본 칸 우선, 가득 찼으면 여유 있는 칸)
+    preferred_locker_number = tags[0]["locker_number"] if tags else None
+    new_item.locker_id = locker_inventory_service.reserve_compartment(
+        db, new_item.device_name, preferred_locker_number
+    )
 
     db.add(new_item)
+    db.flush()
+
+    db.add_all([
+        LostItem_Tags(lost_item_id=new_item.id, tag_id=tag["id"]) for tag in tags
+    ])
     db.commit()
+    response_cache.item_changed(new_item.id)
     db.refresh(new_item)
 
     return new_item
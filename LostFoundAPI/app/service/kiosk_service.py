@@ -1,19 +1,129 @@
 # LostFoundAPI/app/service/kiosk_service.py
+from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 import datetime
+import json
 
-from app.models import PickupCodes, LostItemStatus
+from app.core import response_cache
+from app.models import PickupCodes, LostItems, LostItemStatus
 from app.service.item_service import get_item_by_id_with_tags
+from app.service.locker_inventory_service import release_compartment
+
+
+# 키오스크 픽업 코드 사용 처리 (PostgreSQL, 단일 문장)
+# - 유효한 코드 소비 + 아이템 '찾음' 처리 + 사물함 칸 반납을 한 번에 수행하고
+#   응답에 필요한 아이템 정보와 태그를 함께 돌려줍니다.
+# - 코드 조회는 활성 코드 부분 인덱스(ix_pickupcodes_active_code)를 사용합니다.
+REDEEM_PICKUP_CODE_SQL = text("""
+WITH code AS (
+    UPDATE pickupcodes
+    SET is_used = true, updated_at = :now
+    WHERE code = :code
+      AND is_used = false
+      AND cancelled_at IS NULL
+      AND expires_at > :now
+      AND EXISTS (
+          SELECT 1 FROM lostitems
+          WHERE lostitems.id = pickupcodes.lost_item_id AND lostitems.status = :reserved
+      )
+    RETURNING lost_item_id
+),
+item AS (
+    UPDATE lostitems
+    SET status = :found, found_at = :now, updated_at = :now
+    FROM code
+    WHERE lostitems.id = code.lost_item_id
+    RETURNING lostitems.id, lostitems.photo_url, lostitems.location, lostitems.locker_id,
+              lostitems.device_name, lostitems.status, lostitems.registered_at
+),
+released AS (
+    UPDATE lockers
+    SET occupancy = lockers.occupancy - 1, updated_at = :now
+    FROM item
+    WHERE lockers.device_name = item.device_name
+      AND lockers.locker_number = item.locker_id
+      AND lockers.occupancy > 0
+)
+SELECT item.*,
+       COALESCE((
+           SELECT json_agg(json_build_object('id', t.id, 'name', t.name, 'locker_number', t.locker_number) ORDER BY lt.id)
+           FROM lostitem_tags lt JOIN tags t ON t.id = lt.tag_id
+           WHERE lt.lost_item_id = item.id
+       ), '[]') AS tags
+FROM item
+""")
+
+
+def redemption_params(pickup_code_str: str, now: datetime.datetime) -> dict:
+    return {
+        "code": pickup_code_str,
+        "now": now,
+        "reserved": LostItemStatus.RESERVED.value,
+        "found": LostItemStatus.FOUND.value
+    }
+
+
+def redeemed_item(row) -> dict:
+    """REDEEM_PICKUP_CODE_SQL 결과 행을 ItemResponse 형태의 dict로 변환"""
+    item = dict(row._mapping)
+    item["status"] = LostItemStatus(item["status"])
+    # asyncpg는 json 컬럼을 문자열로 돌려줌
+    if isinstance(item["tags"], str):
+        item["tags"] = json.loads(item["tags"])
+    return item
+
+
+def failure_reason_statement(pickup_code_str: str, now: datetime.datetime):
+    """
+    코드 사용 처리가 실패했을 때 원인 판별용 SELECT 문 (실패 경로에서만 실행)
+    """
+    return (
+        select(LostItems.status)
+        .join(PickupCodes, PickupCodes.lost_item_id == LostItems.id)
+        .where(
+            PickupCodes.code == pickup_code_str,
+            PickupCodes.expires_at > now,
+            PickupCodes.is_used == False
+        )
+        .limit(1)
+    )
+
+
+def failure_reason_from_status(item_status) -> str:
+    if item_status is None:
+        return "INVALID_CODE"
+    if item_status == LostItemStatus.FOUND:
+        return "ALREADY_PICKED_UP"
+    return "NOT_RESERVE"
 
 
 def complete_pickup_by_code(db: Session, pickup_code_str: str):
     """
     픽업 코드를 검증하고, 유효하면 아이템 상태를 '찾음'으로 변경합니다.
+    - PostgreSQL에서는 단일 UPDATE ... RETURNING 문으로 처리합니다.
     """
-
-    # 유효하고 만료되지 않은 픽업 코드를 찾습니다.
     now = datetime.datetime.utcnow()
 
+    if db.get_bind().dialect.name == "postgresql":
+        row = db.execute(REDEEM_PICKUP_CODE_SQL, redemption_params(pickup_code_str, now)).first()
+        if row is None:
+            db.rollback()
+            item_status = db.execute(failure_reason_statement(pickup_code_str, now)).scalar()
+            return failure_reason_from_status(item_status)
+
+        db.commit()
+        response_cache.item_changed(row.id)
+        return redeemed_item(row)
+
+    return _complete_pickup_by_code_orm(db, pickup_code_str, now)
+
+
+def _complete_pickup_by_code_orm(db: Session, pickup_code_str: str, now: datetime.datetime):
+    """
+    (PostgreSQL 외 DB) ORM으로 픽업 코드를 검증하고 아이템 상태를 변경합니다.
+    """
+
+    # 유효하고 만료되지 않은 픽업 코드를 찾습니다.
     pickup_code_record = db.query(PickupCodes).filter(
         PickupCodes.code == pickup_code_str,
         PickupCodes.expires_at > now,
@@ -41,7 +151,11 @@ def complete_pickup_by_code(db: Session, pickup_code_str: str):
 
     pickup_code_record.is_used = True
 
+    # 비워진 사물함 칸 반납
+    release_compartment(db, item.device_name, item.locker_id)
+
     db.commit()
+    response_cache.item_changed(item.id)
     db.refresh(item)
 
     return item
@@ -51,9 +165,10 @@ def fetch_item_by_pickup_code(db: Session, pickup_code_str: str):
     """
     픽업 코드로 아이템 정보를 조회합니다. (상태 변경 없음)
     """
+    # 코드는 재활용될 수 있으므로 가장 최근에 발급된 기록을 사용
     pickup_code_record = db.query(PickupCodes).filter(
         PickupCodes.code == pickup_code_str
-    ).first()
+    ).order_by(PickupCodes.id.desc()).first()
 
     if not pickup_code_record:
         return "INVALID_CODE"
@@ -0,0 +1,108 @@
+from typing import Optional
+from sqlalchemy import select, update, case
+from sqlalchemy.orm import Session
+from app.models import Lockers
+
+# 사물함 칸 재고(용량/점유) 관리
+# - 등록 시 빈 칸을 원자적으로 예약하고, 픽업 완료 시 반납합니다.
+# - 기기에 등록된 칸이 없으면 None을 반환하며, 호출한 쪽은 태그의 기본 사물함 번호를 사용합니다.
+
+
+def select_free_compartment_statement(device_name: str, preferred_locker_number: Optional[int] = None):
+    """
+    예약할 칸을 고르는 SELECT ... FOR UPDATE SKIP LOCKED 문
+    - 태그 기본 칸에 여유가 있으면 우선, 아니면 남은 용량이 가장 큰 칸
+    - 다른 트랜잭션이 잠근 칸은 기다리지 않고 건너뜁니다.
+    """
+    preferred_first = case((Lockers.locker_number == preferred_locker_number, 0), else_=1)
+
+    return (
+        select(Lockers.id, Lockers.locker_number)
+        .where(
+            Lockers.device_name == device_name,
+            Lockers.is_active == True,
+            Lockers.occupancy < Lockers.capacity
+        )
+        .order_by(preferred_first, (Lockers.capacity - Lockers.occupancy).desc(), Lockers.locker_number)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def reserve_statement(locker_row_id: int):
+    return (
+        update(Lockers)
+        .where(Lockers.id == locker_row_id)
+        .values(occupancy=Lockers.occupancy + 1)
+    )
+
+
+def release_statement(device_name: str, locker_number: int):
+    return (
+        update(Lockers)
+        .where(
+            Lockers.device_name == device_name,
+            Lockers.locker_number == locker_number,
+            Lockers.occupancy > 0
+        )
+        .values(occupancy=Lockers.occupancy - 1)
+    )
+
+
+def reserve_compartment(db: Session, device_name: str, preferred_locker_number: Optional[int] = None) -> Optional[int]:
+    """
+    기기의 빈 칸 하나를 예약(occupancy + 1)하고 칸 번호를 반환합니다. (커밋은 호출한 쪽에서)
+    빈 칸이 없으면 None을 반환합니다.
+    """
+    row = db.execute(select_free_compartment_statement(device_name, preferred_locker_number)).first()
+    if row is None:
+        return None
+
+    db.execute(reserve_statement(row.id))
+    return row.locker_number
+
+
+def release_compartment(db: Session, device_name: Optional[str], locker_number: Optional[int]):
+    """
+    픽업 완료 등으로 비워진 칸의 점유 수를 1 줄입니다. (커밋은 호출한 쪽에서)
+    """
+    if device_name is None or locker_number is None:
+        return
+    db.execute(release_statement(device_name, locker_number))
+
+
+def get_all_lockers(db: Session):
+    return (
+        db.query(Lockers)
+        .order_by(Lockers.device_name, Lockers.locker_number)
+        .all()
+    )
+
+
+def upsert_locker(db: Session, locker_in):
+    """
+    (device_name, locker_number) 기준으로 사물함 칸을 등록하거나 용량/활성 여부를 수정합니다.
+    """
+    locker = (
+        db.query(Lockers)
+        .filter(
+            Lockers.device_name == locker_in.device_name,
+            Lockers.locker_number == locker_in.locker_number
+        )
+        .first()
+    )
+
+    if locker is None:
+        locker = Lockers(
+            device_name=locker_in.device_name,
+            locker_number=locker_in.locker_number,
+            occupancy=0
+        )
+        db.add(locker)
+
+    locker.capacity = locker_in.capacity
+    locker.is_active = locker_in.is_active
+
+    db.commit()
+    db.refresh(locker)
+    return locker
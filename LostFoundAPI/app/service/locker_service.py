@@ -1,49 +1,25 @@
-def open_chute(device_name: str) -> str:
-    message = {
-        "action": "OPEN_CHUTE"
-    }
-    topic = f"locker/chute/{device_name}"
-    return _publish(topic, message)
-
-
-def close_chute(device_name: str) -> str:
-    message = {
-        "action": "CLOSE_CHUTE"
-    }
-    topic = f"locker/chute/{device_name}"
-    return _publish(topic, message)
-import json
-import boto3
-
-from app.core.config import settings
-
-AWS_REGION = settings.AWS_REGION
-IOT_ENDPOINT = settings.AWS_IOT_ENDPOINT
+from app.service.locker_transport import transport
+from app.service import command_ledger_service, device_health_service
 
-try:
-    iot_client = boto3.client(
-        "iot-data",
-        region_name=AWS_REGION,
-        endpoint_url=IOT_ENDPOINT
-    )
-except Exception as e:
-    print(f"Locker AWS IoT Client 초기화 실패: {e}")
-    iot_client = None
+# 발행하는 모든 명령을 locker_commands 원장에 기록하고 기기 ack를 연결합니다.
+# (MQTT 연결이면 기기 heartbeat도 같은 연결로 구독)
+if transport is not None:
+    command_ledger_service.install(transport)
+    device_health_service.install(transport)
 
 
-def _publish(topic: str, message: dict) -> str:
-    if iot_client is None:
-        raise RuntimeError("AWS IoT 클라이언트가 초기화되지 않았습니다.")
+def _publish(topic: str, message: dict) -> dict:
+    """
+    Returns: {"request_id": 브로커 응답 id, "correlation_id": 명령 id}
+    (각 명령 함수의 device_name은 IoT 기기 이름, 토픽은 {topic_prefix}/.../{device_name})
+    """
+    if transport is None:
+        raise RuntimeError("사물함 명령 발행기가 초기화되지 않았습니다.")
 
-    response = iot_client.publish(
-        topic=topic,
-        qos=1,
-        payload=json.dumps(message)
-    )
-    return response.get("ResponseMetadata", {}).get("RequestId")
+    return transport.publish(topic, message)
 
 
-def request_item_registration(device_name: str, location: str | None) -> str:
+def request_item_registration(device_name: str, location: str | None, topic_prefix: str = "locker") -> dict:
     message = {
         "action": "REQUEST_REGISTER",
         "device_name": device_name,
@@ -51,25 +27,41 @@ def request_item_registration(device_name: str, location: str | None) -> str:
             "location": location
         }
     }
-    topic = f"locker/register/{device_name}"
+    topic = f"{topic_prefix}/register/{device_name}"
     return _publish(topic, message)
 
 
-def open_locker(device_name: str, locker_id: int) -> str:
+def open_locker(device_name: str, locker_id: int, topic_prefix: str = "locker") -> dict:
     message = {
         "action": "OPEN",
         "locker_id": locker_id
     }
-    topic = f"locker/compartment/{device_name}"
+    topic = f"{topic_prefix}/compartment/{device_name}"
     return _publish(topic, message)
 
 
-def close_locker(device_name: str, locker_id: int, pickup_code: str | None = None) -> str:
+def close_locker(device_name: str, locker_id: int, pickup_code: str | None = None, topic_prefix: str = "locker") -> dict:
     message = {
         "action": "CLOSE",
         "locker_id": locker_id,
         "pickup_code": pickup_code
     }
-    topic = f"locker/compartment/{device_name}"
+    topic = f"{topic_prefix}/compartment/{device_name}"
     return _publish(topic, message)
 
+
+
+def open_chute(device_name: str, topic_prefix: str = "locker") -> dict:
+    message = {
+        "action": "OPEN_CHUTE"
+    }
+    topic = f"{topic_prefix}/chute/{device_name}"
+    return _publish(topic, message)
+
+
+def close_chute(device_name: str, topic_prefix: str = "locker") -> dict:
+    message = {
+        "action": "CLOSE_CHUTE"
+    }
+    topic = f"{topic_prefix}/chute/{device_name}"
+    return _publish(topic, message)
@@ -0,0 +1,345 @@
+import json
+import time
+import uuid
+import bisect
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import Future
+
+import boto3
+
+from app.core.config import settings
+
+try:
+    import paho.mqtt.client as mqtt
+except ImportError:
+    mqtt = None
+
+
+class LockerPublishError(RuntimeError):
+    pass
+
+
+def topic_matches(topic_filter: str, topic: str) -> bool:
+    """MQTT 토픽 필터(+, #) 일치 여부"""
+    filter_levels = topic_filter.split("/")
+    topic_levels = topic.split("/")
+
+    for index, level in enumerate(filter_levels):
+        if level == "#":
+            return True
+        if index >= len(topic_levels):
+            return False
+        if level != "+" and level != topic_levels[index]:
+            return False
+
+    return len(filter_levels) == len(topic_levels)
+
+
+class HttpsIotBackend:
+    """
+    AWS IoT Data Plane HTTPS publish (요청마다 SigV4 서명 + 왕복 1회)
+    """
+
+    def __init__(self, region: str, endpoint_url: str):
+        self.client = boto3.client("iot-data", region_name=region, endpoint_url=endpoint_url)
+
+    def publish(self, topic: str, payload: str) -> str:
+        response = self.client.publish(topic=topic, qos=1, payload=payload)
+        return response.get("ResponseMetadata", {}).get("RequestId")
+
+    def subscribe(self, topic_filter: str, callback):
+        # HTTPS 방식은 구독할 수 없으므로, ack는 IoT Rule -> POST /locker/ack 로 받습니다.
+        pass
+
+
+class MqttBackend:
+    """
+    AWS IoT Core에 상시 연결된 MQTT(8883, X.509 인증서) 클라이언트
+    - 첫 publish 때 연결하고, 이후에는 paho 네트워크 스레드가 연결 유지/재연결을 담당합니다.
+    """
+
+    def __init__(self, host: str, port: int, client_id: str, ca_path: str, cert_path: str, key_path: str, publish_timeout: float):
+        if mqtt is None:
+            raise RuntimeError("LOCKER_TRANSPORT=mqtt 사용 시 paho-mqtt 설치가 필요합니다.")
+
+        self.host = host
+        self.port = port
+        self.publish_timeout = publish_timeout
+        self.lock = threading.Lock()
+        self.connected = False
+        self.subscriptions = []  # (topic_filter, callback)
+
+        if hasattr(mqtt, "CallbackAPIVersion"):
+            self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, client_id=client_id)
+        else:
+            self.client = mqtt.Client(client_id=client_id)
+        self.client.tls_set(ca_certs=ca_path, certfile=cert_path, keyfile=key_path)
+        self.client.on_connect = self._on_connect
+        self.client.on_message = self._on_message
+
+    def _on_connect(self, client, userdata, *args):
+        # 재연결 시에도 구독을 다시 등록
+        for topic_filter, _ in self.subscriptions:
+            client.subscribe(topic_filter, qos=1)
+
+    def _on_message(self, client, userdata, msg):
+        try:
+            payload = json.loads(msg.payload)
+        except ValueError:
+            print(f"[MQTT] invalid payload on {msg.topic}")
+            return
+
+        for topic_filter, callback in self.subscriptions:
+            if topic_matches(topic_filter, msg.topic):
+                callback(msg.topic, payload)
+
+    def _ensure_connection(self):
+        with self.lock:
+            if not self.connected:
+                self.client.connect(self.host, self.port, keepalive=60)
+                self.client.loop_start()
+                self.connected = True
+
+    def publish(self, topic: str, payload: str) -> str:
+        self._ensure_connection()
+
+        info = self.client.publish(topic, payload, qos=1)
+        info.wait_for_publish(timeout=self.publish_timeout)
+        if not info.is_published():
+            raise TimeoutError(f"MQTT publish timeout ({topic})")
+
+        return str(info.mid)
+
+    def subscribe(self, topic_filter: str, callback):
+        self.subscriptions.append((topic_filter, callback))
+        self._ensure_connection()
+        self.client.subscribe(topic_filter, qos=1)
+
+
+class InMemoryBroker:
+    """
+    테스트/로컬용 브로커: 발행된 메시지를 메모리에 보관합니다.
+    """
+
+    def __init__(self):
+        self.messages = []  # (topic, payload dict)
+        self.subscriptions = []  # (topic_filter, callback)
+        self.lock = threading.Lock()
+
+    def publish(self, topic: str, payload: str) -> str:
+        message = json.loads(payload)
+        with self.lock:
+            self.messages.append((topic, message))
+            callbacks = [callback for topic_filter, callback in self.subscriptions if topic_matches(topic_filter, topic)]
+
+        for callback in callbacks:
+            callback(topic, message)
+        return uuid.uuid4().hex
+
+    def subscribe(self, topic_filter: str, callback):
+        with self.lock:
+            self.subscriptions.append((topic_filter, callback))
+
+    def published(self, topic: str = None) -> list:
+        with self.lock:
+            return [message for message in self.messages if topic is None or message[0] == topic]
+
+
+# 발행 지연 히스토그램 구간 (ms)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["le_inf"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class LockerCommandTransport:
+    """
+    사물함 명령 발행기
+    - 같은 토픽으로 같은 명령이 연속해서 몰리면(키오스크 연타 등) 진행 중이거나 방금 보낸 결과를 공유합니다.
+      (사이에 다른 명령이 들어오면 병합하지 않음: OPEN -> CLOSE -> OPEN은 세 번 모두 발행)
+    - 실패 시 지수 백오프로 최대 max_attempts회 재시도합니다.
+    - 명령(action)별 발행 지연 히스토그램을 기록합니다.
+    - 명령마다 correlation_id와 응답 토픽(reply_to)을 붙이고, ledger가 있으면 발행 전/후를 기록합니다.
+    """
+
+    def __init__(self, backend, max_attempts: int, retry_base_seconds: float, coalesce_window_seconds: float):
+        self.backend = backend
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.coalesce_window_seconds = coalesce_window_seconds
+        self.lock = threading.Lock()
+
+        self.in_flight = {}  # (topic, payload) -> Future
+        self.recent = {}  # (topic, payload) -> (published_at, result)
+        self.last_command = {}  # topic -> 마지막으로 요청된 (topic, payload)
+        self.histograms = {}  # action -> LatencyHistogram
+        self.counters = {"published": 0, "coalesced": 0, "retries": 0, "failed": 0}
+        self.ledger = None  # command_started(...) / command_finished(...) 를 가진 객체
+
+    def _recent_result(self, key, now: float):
+        for stale_key in [k for k, (published_at, _) in self.recent.items()
+                          if now - published_at >= self.coalesce_window_seconds]:
+            del self.recent[stale_key]
+
+        recent = self.recent.get(key)
+        return recent[1] if recent else None
+
+    def _forget_topic(self, topic: str):
+        """다른 명령이 들어온 토픽의 최근 결과/진행 중 명령을 더 이상 공유하지 않습니다."""
+        for key in [k for k in self.recent if k[0] == topic]:
+            del self.recent[key]
+        for key in [k for k in self.in_flight if k[0] == topic]:
+            del self.in_flight[key]
+
+    def publish(self, topic: str, message: dict) -> dict:
+        """
+        Returns: {"request_id": 브로커 응답 id, "correlation_id": 명령 id}
+        (병합된 요청은 실제로 발행된 명령의 결과를 함께 받습니다.)
+        """
+        key = (topic, json.dumps(message, sort_keys=True, ensure_ascii=False))
+
+        with self.lock:
+            previous = self.last_command.get(topic)
+            if previous is not None and previous != key:
+                self._forget_topic(topic)
+            self.last_command[topic] = key
+
+            result = self._recent_result(key, time.monotonic())
+            if result is not None:
+                self.counters["coalesced"] += 1
+                return result
+
+            future = self.in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.in_flight[key] = future
+            else:
+                self.counters["coalesced"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = self._publish_command(topic, message)
+            future.set_result(result)
+            with self.lock:
+                # 발행 중에 다른 명령이 끼어들었다면 이 결과는 다음 요청과 공유하지 않음
+                if self.in_flight.get(key) is future:
+                    self.recent[key] = (time.monotonic(), result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                if self.in_flight.get(key) is future:
+                    del self.in_flight[key]
+
+    def _publish_command(self, topic: str, message: dict) -> dict:
+        correlation_id = uuid.uuid4().hex
+        topic_prefix, device_name = topic.split("/", 1)[0], topic.rsplit("/", 1)[-1]
+        message = {**message, "correlation_id": correlation_id, "reply_to": f"{topic_prefix}/ack/{device_name}"}
+
+        if self.ledger is not None:
+            self.ledger.command_started(correlation_id, topic, message)
+
+        attempts = 0
+        try:
+            request_id, attempts, elapsed_ms = self._publish_with_retry(
+                topic, json.dumps(message, ensure_ascii=False), message.get("action", "UNKNOWN")
+            )
+        except LockerPublishError as e:
+            if self.ledger is not None:
+                self.ledger.command_finished(correlation_id, self.max_attempts, None, str(e))
+            raise
+
+        if self.ledger is not None:
+            self.ledger.command_finished(correlation_id, attempts, elapsed_ms, None)
+
+        return {"request_id": request_id, "correlation_id": correlation_id}
+
+    def _publish_with_retry(self, topic: str, payload: str, action: str):
+        """
+        Returns: (브로커 응답 id, 시도 횟수, 마지막 시도의 발행 지연 ms)
+        """
+        for attempt in range(self.max_attempts):
+            started = time.perf_counter()
+            try:
+                result = self.backend.publish(topic, payload)
+            except Exception as e:
+                print(f"[Locker Publish Error] {topic} attempt {attempt + 1}/{self.max_attempts}: {str(e)}")
+                if attempt + 1 == self.max_attempts:
+                    with self.lock:
+                        self.counters["failed"] += 1
+                    raise LockerPublishError(f"사물함 명령 발행 실패 ({topic}): {str(e)}") from e
+
+                with self.lock:
+                    self.counters["retries"] += 1
+                time.sleep(self.retry_base_seconds * (2 ** attempt))
+                continue
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self.lock:
+                self.counters["published"] += 1
+                self.histograms.setdefault(action, LatencyHistogram()).observe(elapsed_ms)
+            return result, attempt + 1, elapsed_ms
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "backend": type(self.backend).__name__,
+                **self.counters,
+                "latency": {action: histogram.to_dict() for action, histogram in self.histograms.items()},
+            }
+
+
+def _create_backend():
+    if settings.LOCKER_TRANSPORT == "memory":
+        return InMemoryBroker()
+
+    if settings.LOCKER_TRANSPORT == "mqtt":
+        return MqttBackend(
+            host=settings.IOT_MQTT_HOST or urlparse(settings.AWS_IOT_ENDPOINT).hostname or settings.AWS_IOT_ENDPOINT,
+            port=settings.IOT_MQTT_PORT,
+            client_id=settings.IOT_MQTT_CLIENT_ID,
+            ca_path=settings.IOT_MQTT_CA_PATH,
+            cert_path=settings.IOT_MQTT_CERT_PATH,
+            key_path=settings.IOT_MQTT_KEY_PATH,
+            publish_timeout=settings.IOT_MQTT_PUBLISH_TIMEOUT_SECONDS
+        )
+
+    return HttpsIotBackend(region=settings.AWS_REGION, endpoint_url=settings.AWS_IOT_ENDPOINT)
+
+
+try:
+    transport = LockerCommandTransport(
+        backend=_create_backend(),
+        max_attempts=settings.LOCKER_PUBLISH_MAX_ATTEMPTS,
+        retry_base_seconds=settings.LOCKER_PUBLISH_RETRY_BASE_SECONDS,
+        coalesce_window_seconds=settings.LOCKER_COALESCE_WINDOW_MS / 1000
+    )
+except Exception as e:
+    print(f"Locker 명령 발행기 초기화 실패: {e}")
+    transport = None
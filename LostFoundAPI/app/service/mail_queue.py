@@ -0,0 +1,68 @@
+import json
+
+import boto3
+from botocore.exceptions import ClientError
+
+from app.core.config import settings
+from app.service import email_service
+
+
+class DirectMailSender:
+    """
+    큐가 설정되지 않았을 때(EMAIL_QUEUE_URL 미설정)의 기본 경로: 요청 안에서 바로 SMTP로 전송합니다.
+    - Lambda는 응답 후 컨테이너를 멈추므로 백그라운드 스레드에 맡기지 않습니다.
+    - 전송은 email_service.smtp_sender의 상시 연결과 재시도를 그대로 사용합니다.
+    """
+
+    def enqueue(self, payload: dict) -> bool:
+        return email_service.send_payload(payload)
+
+    def depth(self) -> int:
+        return 0
+
+
+class SQSMailQueue:
+    """
+    SQS 메일 큐: 메시지는 app.mail_worker 핸들러(SQS 트리거 Lambda)가 전송합니다.
+    """
+
+    def __init__(self, queue_url: str):
+        self.queue_url = queue_url
+        self.client = boto3.client("sqs", region_name=settings.AWS_REGION)
+
+    def enqueue(self, payload: dict) -> bool:
+        try:
+            self.client.send_message(QueueUrl=self.queue_url, MessageBody=json.dumps(payload))
+            return True
+        except ClientError as e:
+            print(f"[SQS Error] {str(e)}")
+            return False
+
+    def depth(self) -> int:
+        try:
+            attributes = self.client.get_queue_attributes(
+                QueueUrl=self.queue_url, AttributeNames=["ApproximateNumberOfMessages"]
+            )["Attributes"]
+            return int(attributes["ApproximateNumberOfMessages"])
+        except ClientError as e:
+            print(f"[SQS Error] {str(e)}")
+            return -1
+
+
+if settings.EMAIL_QUEUE_URL:
+    mail_queue = SQSMailQueue(settings.EMAIL_QUEUE_URL)
+else:
+    mail_queue = DirectMailSender()
+
+
+def enqueue_verification_email(to_email: str, code: str) -> bool:
+    """
+    인증 메일을 메일 큐에 넣습니다. (SQS: 전송은 워커가 담당 / 큐 미설정: 바로 전송)
+    Returns:
+        bool: 큐 적재(또는 전송) 성공 여부
+    """
+    return mail_queue.enqueue({"template": "verification", "to": to_email, "code": code})
+
+
+def get_mail_stats() -> dict:
+    return {"queue_depth": mail_queue.depth(), **email_service.smtp_sender.stats}
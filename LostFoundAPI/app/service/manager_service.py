@@ -6,17 +6,25 @@ from app.schemas.manager import ManagerLogin
 def get_manager_by_email(db: Session, email: str):
     return db.query(Managers).filter(Managers.email == email).first()
 
-def authenticate_manager(db: Session, login_data: ManagerLogin):
+async def authenticate_manager(db: Session, login_data: ManagerLogin):
     """
     이메일과 비밀번호를 검증하여 관리자 객체를 반환합니다.
     실패 시 None 반환.
+    (bcrypt cost 설정이 바뀌었다면 새 cost로 재해싱하여 저장합니다.)
     """
     manager = get_manager_by_email(db, login_data.email)
 
     if not manager:
         return None
 
-    if not security.verify_password(login_data.password, manager.hashed_password):
+    verified, new_hash = await security.verify_and_update_password_async(
+        login_data.password, manager.hashed_password
+    )
+    if not verified:
         return None
 
+    if new_hash:
+        manager.hashed_password = new_hash
+        db.commit()
+
     return manager
@@ -1,16 +1,91 @@
-import random
+import hmac
+import hashlib
+import secrets
 import datetime
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
+from app.core.config import settings
 from app.models import PickupCodes, LostItems, Users
+from app.models.pickup_code import pickup_code_seq, CODE_SPACE, CODE_OFFSET
+
+# ============================================================
+# 픽업 코드 할당기
+# - DB 시퀀스(0 ~ 899999 순환)의 다음 값을 비밀키 기반 순열(Feistel)로 섞어
+#   100000 ~ 999999 범위의 6자리 코드로 변환합니다.
+# - 순열은 전단사이므로 시퀀스 값끼리는 한 바퀴 돌기 전까지 겹치지 않아,
+#   중복 확인용 SELECT 없이 1회 왕복(nextval)으로 할당됩니다.
+# - 다만 도입 전의 난수 코드, 아직 정리되지 않은 만료 코드, 한 바퀴 돈 뒤에도 살아 있는 코드와는
+#   겹칠 수 있으므로, 저장 시 활성 코드 유일 인덱스 위반이 나면 SAVEPOINT만 되돌리고 다시 할당합니다.
+# ============================================================
+
+_FEISTEL_HALF_BITS = 10  # 2^20 = 1,048,576 >= 900,000
+_FEISTEL_HALF_MASK = (1 << _FEISTEL_HALF_BITS) - 1
+_FEISTEL_ROUNDS = 4
+
+# 활성 코드 충돌 시 다시 할당하는 최대 횟수
+PICKUP_CODE_MAX_ATTEMPTS = 5
+
+# 코드 충돌로 볼 유일 인덱스 (ix_pickupcodes_code: migrations/0002 적용 전의 테이블 전체 UNIQUE)
+_CODE_UNIQUE_INDEXES = ("ix_pickupcodes_active_code", "ix_pickupcodes_code")
+
+# 모든 Lambda 컨테이너가 같은 순열을 써야 하므로 SECRET_KEY에서 키를 파생
+_PERMUTATION_KEY = hmac.new(
+    settings.SECRET_KEY.encode("utf-8"), b"pickup-code-permutation", hashlib.sha256
+).digest()
+
+
+def _feistel_round(value: int, round_index: int) -> int:
+    digest = hmac.new(
+        _PERMUTATION_KEY, f"{round_index}:{value}".encode("ascii"), hashlib.sha256
+    ).digest()
+    return int.from_bytes(digest[:4], "big") & _FEISTEL_HALF_MASK
+
+
+def _feistel(value: int) -> int:
+    left, right = value >> _FEISTEL_HALF_BITS, value & _FEISTEL_HALF_MASK
+    for round_index in range(_FEISTEL_ROUNDS):
+        left, right = right, left ^ _feistel_round(right, round_index)
+    return (left << _FEISTEL_HALF_BITS) | right
+
+
+def permute_code_index(index: int) -> int:
+    """
+    [0, CODE_SPACE) 범위의 전단사 순열 (20bit Feistel + cycle-walking)
+    """
+    value = _feistel(index)
+    while value >= CODE_SPACE:
+        value = _feistel(value)
+    return value
+
+
+def code_from_index(index: int) -> str:
+    return str(CODE_OFFSET + permute_code_index(index % CODE_SPACE))
+
+
+def is_code_conflict(error: IntegrityError) -> bool:
+    """픽업 코드 유일 인덱스 위반인지 확인합니다. (다른 제약 위반은 그대로 전파)"""
+    message = str(error.orig)
+    return any(f'"{index_name}"' in message for index_name in _CODE_UNIQUE_INDEXES)
+
 
 def generate_unique_code(db: Session, length: int = 6) -> str:
     """
-    DB에서 중복되지 않는 6자리 '숫자' 코드를 생성합니다.
+    6자리 '숫자' 코드를 생성합니다. (활성 코드와의 충돌은 create_pickup_code에서 재할당)
+    - PostgreSQL: 시퀀스 + 순열 (중복 확인 쿼리 없음)
+    - 그 외 DB: secrets 난수 + 중복 확인
     """
+    if db.get_bind().dialect.name == "postgresql":
+        return code_from_index(db.execute(select(pickup_code_seq.next_value())).scalar())
+
     while True:
-        code = str(random.randint(100000, 999999))
+        code = str(CODE_OFFSET + secrets.randbelow(CODE_SPACE))
 
-        existing_code = db.query(PickupCodes).filter(PickupCodes.code == code).first()
+        existing_code = db.query(PickupCodes.id).filter(
+            PickupCodes.code == code,
+            PickupCodes.is_used == False,
+            PickupCodes.cancelled_at == None
+        ).first()
 
         if not existing_code:
             return code
@@ -21,19 +96,24 @@ def create_pickup_code(db: Session, item: LostItems, user: Users) -> PickupCodes
     """
     expires_at = datetime.datetime.utcnow() + datetime.timedelta(days=7)
 
-    unique_code = generate_unique_code(db)
-
-    db_pickup_code = PickupCodes(
-        lost_item_id=item.id,
-        user_id=user.id,
-        code=unique_code,
-        expires_at=expires_at,
-        is_used=False
-    )
-
-    db.add(db_pickup_code)
+    for attempt in range(PICKUP_CODE_MAX_ATTEMPTS):
+        db_pickup_code = PickupCodes(
+            lost_item_id=item.id,
+            user_id=user.id,
+            code=generate_unique_code(db),
+            expires_at=expires_at,
+            is_used=False
+        )
 
-    return db_pickup_code
+        try:
+            # 코드가 활성 코드와 겹치면 이 INSERT만 되돌리고 다음 시퀀스 값으로 재시도
+            with db.begin_nested():
+                db.add(db_pickup_code)
+            return db_pickup_code
+        except IntegrityError as e:
+            if not is_code_conflict(e) or attempt + 1 == PICKUP_CODE_MAX_ATTEMPTS:
+                raise
+            print(f"[Pickup Code] 활성 코드와 충돌하여 다시 할당합니다: {db_pickup_code.code}")
 
 # 전체 픽업 로그 조회 (최신순)
 def get_all_pickup_logs(db: Session):
@@ -0,0 +1,183 @@
+import re
+import threading
+from typing import List, Optional
+
+from sqlalchemy import func, literal, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from app.models import LostItems, LostItem_Tags
+from app.models.lost_item import search_vector
+
+# ============================================================
+# 토크나이저 (한글은 2-gram, 그 외는 단어 단위)
+# ============================================================
+
+_TOKEN_PATTERN = re.compile(r"[0-9a-zA-Z]+|[가-힣]+")
+_HANGUL_PATTERN = re.compile(r"[가-힣]+")
+
+# 검색어 n-gram 중 이 비율 이상이 일치해야 결과에 포함 (Python 인덱스)
+MIN_COVERAGE = 0.6
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    텍스트를 검색용 토큰으로 분리합니다.
+    - 한글은 띄어쓰기/조사와 무관하게 매칭되도록 2글자 n-gram으로 자릅니다. (예: "검정지갑" -> 검정, 정지, 지갑)
+    - 영문/숫자는 소문자 단어 단위로 사용합니다.
+    """
+    if not text:
+        return []
+
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text.lower()):
+        if _HANGUL_PATTERN.fullmatch(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+# ============================================================
+# 순수 Python 역색인 (PostgreSQL이 아닌 DB, 예: SQLite 테스트용)
+# ============================================================
+
+class InvertedIndex:
+    """
+    토큰 -> 분실물 ID 집합을 저장하는 간단한 역색인입니다.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.registered_at = {}
+        self.signature = None
+
+    def clear(self):
+        self.postings.clear()
+        self.registered_at.clear()
+        self.signature = None
+
+    def add(self, item_id: int, text: str, registered_at):
+        self.registered_at[item_id] = registered_at
+        for token in set(tokenize(text)):
+            self.postings.setdefault(token, set()).add(item_id)
+
+    def search(self, q: str) -> List[int]:
+        """
+        검색어와 일치하는 ID를 (일치율, 등록일) 내림차순으로 반환합니다.
+        """
+        query_tokens = set(tokenize(q))
+        if not query_tokens:
+            return []
+
+        hits = {}
+        for token in query_tokens:
+            for item_id in self.postings.get(token, ()):
+                hits[item_id] = hits.get(item_id, 0) + 1
+
+        min_hits = max(1, int(len(query_tokens) * MIN_COVERAGE + 0.5))
+        matched = [item_id for item_id, count in hits.items() if count >= min_hits]
+
+        matched.sort(
+            key=lambda item_id: (hits[item_id], self.registered_at[item_id], item_id),
+            reverse=True
+        )
+        return matched
+
+
+_fallback_index = InvertedIndex()
+_fallback_lock = threading.Lock()
+
+
+def _sync_fallback_index(db: Session) -> InvertedIndex:
+    """
+    테이블의 (건수, 최종 수정 시각)이 바뀌었으면 역색인을 다시 만듭니다.
+    """
+    signature = tuple(db.query(func.count(LostItems.id), func.max(LostItems.updated_at)).one())
+
+    with _fallback_lock:
+        if _fallback_index.signature != signature:
+            _fallback_index.clear()
+            rows = db.query(
+                LostItems.id, LostItems.description, LostItems.location, LostItems.registered_at
+            ).all()
+            for item_id, description, location, registered_at in rows:
+                _fallback_index.add(item_id, f"{description or ''} {location or ''}", registered_at)
+            _fallback_index.signature = signature
+
+    return _fallback_index
+
+
+# ============================================================
+# 검색
+# ============================================================
+
+def _tag_filter(tags: List[int]):
+    return LostItems.id.in_(
+        select(LostItem_Tags.lost_item_id).where(LostItem_Tags.tag_id.in_(tags))
+    )
+
+
+def _search_ids_postgresql(db: Session, q: Optional[str], tags: Optional[List[int]], limit: int, offset: int):
+    """
+    tsvector(@@) + pg_trgm 유사도로 검색하고 (관련도, 등록일) 순으로 정렬합니다.
+    - 한글 부분 일치는 description/location의 gin_trgm_ops 인덱스로 처리됩니다.
+    """
+    query = db.query(LostItems.id)
+
+    if tags:
+        query = query.filter(_tag_filter(tags))
+
+    if q:
+        ts_query = func.plainto_tsquery(literal_column("'simple'"), q)
+        pattern = f"%{q}%"
+        query = query.filter(
+            or_(
+                search_vector.op("@@")(ts_query),
+                LostItems.description.ilike(pattern),
+                LostItems.location.ilike(pattern),
+                # 오타 허용 (pg_trgm.word_similarity_threshold 기준)
+                literal(q).op("<%")(LostItems.description)
+            )
+        )
+        rank = func.ts_rank(search_vector, ts_query) + func.greatest(
+            func.word_similarity(q, func.coalesce(LostItems.description, "")),
+            func.word_similarity(q, func.coalesce(LostItems.location, ""))
+        )
+        query = query.order_by(rank.desc(), LostItems.registered_at.desc(), LostItems.id.desc())
+    else:
+        query = query.order_by(LostItems.registered_at.desc(), LostItems.id.desc())
+
+    return [item_id for (item_id,) in query.offset(offset).limit(limit).all()]
+
+
+def _search_ids_fallback(db: Session, q: Optional[str], tags: Optional[List[int]], limit: int, offset: int):
+    """
+    순수 Python 역색인으로 검색합니다. (PostgreSQL 외 DB)
+    """
+    if not q:
+        query = db.query(LostItems.id)
+        if tags:
+            query = query.filter(_tag_filter(tags))
+        query = query.order_by(LostItems.registered_at.desc(), LostItems.id.desc())
+        return [item_id for (item_id,) in query.offset(offset).limit(limit).all()]
+
+    ranked_ids = _sync_fallback_index(db).search(q)
+
+    if tags and ranked_ids:
+        allowed = {
+            item_id for (item_id,) in db.query(LostItem_Tags.lost_item_id)
+            .filter(LostItem_Tags.tag_id.in_(tags), LostItem_Tags.lost_item_id.in_(ranked_ids))
+            .all()
+        }
+        ranked_ids = [item_id for item_id in ranked_ids if item_id in allowed]
+
+    return ranked_ids[offset:offset + limit]
+
+
+def search_item_ids(db: Session, q: Optional[str], tags: Optional[List[int]], limit: int, offset: int) -> List[int]:
+    """
+    검색어(q)/태그(tags)로 분실물 ID를 관련도 순으로 조회합니다.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_ids_postgresql(db, q, tags, limit, offset)
+    return _search_ids_fallback(db, q, tags, limit, offset)
@@ -0,0 +1,130 @@
+import time
+import datetime
+from sqlalchemy import select, update, and_, exists
+from sqlalchemy.orm import Session
+from app.models import PickupCodes, LostItems, LostItemStatus
+from app.service import command_ledger_service
+from app.core.idempotency import purge_expired_keys_batch
+
+# 만료 처리 사유 (PickupCodes.cancel_reason)
+EXPIRED_REASON = "EXPIRED"
+
+
+def _active_code_filter():
+    return and_(PickupCodes.is_used == False, PickupCodes.cancelled_at == None)
+
+
+def expire_pickup_codes_batch(db: Session, now: datetime.datetime, batch_size: int):
+    """
+    만료된 활성 픽업 코드를 최대 batch_size개 만료 처리하고,
+    해당 코드로 '예약' 중이던 아이템을 '보관'으로 되돌립니다.
+    Returns: (만료 처리한 코드 수, 되돌린 아이템 수)
+    """
+    rows = db.execute(
+        select(PickupCodes.id, PickupCodes.lost_item_id)
+        .where(_active_code_filter(), PickupCodes.expires_at <= now)
+        .order_by(PickupCodes.expires_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    if not rows:
+        return 0, 0
+
+    code_ids = [row.id for row in rows]
+    item_ids = list({row.lost_item_id for row in rows})
+
+    db.execute(
+        update(PickupCodes)
+        .where(PickupCodes.id.in_(code_ids))
+        .values(is_used=True, cancelled_at=now, cancel_reason=EXPIRED_REASON)
+    )
+
+    released = db.execute(
+        update(LostItems)
+        .where(LostItems.id.in_(item_ids), LostItems.status == LostItemStatus.RESERVED)
+        .values(status=LostItemStatus.STORAGE, found_by_user_id=None)
+    ).rowcount
+
+    db.commit()
+    return len(code_ids), released
+
+
+def release_orphan_reservations_batch(db: Session, batch_size: int) -> int:
+    """
+    활성 픽업 코드가 하나도 없는 '예약' 아이템을 최대 batch_size개 '보관'으로 되돌립니다.
+    """
+    has_active_code = exists().where(
+        PickupCodes.lost_item_id == LostItems.id,
+        _active_code_filter()
+    )
+
+    item_ids = [
+        item_id for (item_id,) in db.execute(
+            select(LostItems.id)
+            .where(LostItems.status == LostItemStatus.RESERVED, ~has_active_code)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+    ]
+
+    if not item_ids:
+        return 0
+
+    released = db.execute(
+        update(LostItems)
+        .where(LostItems.id.in_(item_ids), LostItems.status == LostItemStatus.RESERVED)
+        .values(status=LostItemStatus.STORAGE, found_by_user_id=None)
+    ).rowcount
+
+    db.commit()
+    return released
+
+
+def sweep(db: Session, batch_size: int, max_batches: int) -> dict:
+    """
+    만료 코드 / 방치된 예약 / 응답 없는 사물함 명령 / 만료된 Idempotency-Key를 배치 단위로 정리하고 처리 건수와 소요 시간을 반환합니다.
+    """
+    started = time.perf_counter()
+    now = datetime.datetime.utcnow()
+
+    stats = {
+        "expired_codes": 0,
+        "released_items": 0,
+        "orphan_reservations": 0,
+        "timed_out_commands": 0,
+        "expired_idempotency_keys": 0,
+        "batches": 0,
+    }
+
+    while stats["batches"] < max_batches:
+        expired, released = expire_pickup_codes_batch(db, now, batch_size)
+        stats["batches"] += 1
+        stats["expired_codes"] += expired
+        stats["released_items"] += released
+        if expired < batch_size:
+            break
+
+    while stats["batches"] < max_batches:
+        released = release_orphan_reservations_batch(db, batch_size)
+        stats["batches"] += 1
+        stats["orphan_reservations"] += released
+        if released < batch_size:
+            break
+
+    while stats["batches"] < max_batches:
+        timed_out = command_ledger_service.timeout_commands_batch(db, now, batch_size)
+        stats["batches"] += 1
+        stats["timed_out_commands"] += timed_out
+        if timed_out < batch_size:
+            break
+
+    while stats["batches"] < max_batches:
+        purged = purge_expired_keys_batch(db, now, batch_size)
+        stats["batches"] += 1
+        stats["expired_idempotency_keys"] += purged
+        if purged < batch_size:
+            break
+
+    stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return stats
@@ -1,5 +1,51 @@
+import time
+import threading
+from typing import List
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.models import Tags
+from app.core.config import settings
+from app.core import response_cache
+
+
+class TagCache:
+    """
+    태그 이름 -> {id, name, locker_number} 인메모리 캐시
+    - TTL이 지나거나 관리자 수정으로 버전이 바뀌면 무효화됩니다.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self.entries = {}  # name -> (version, expires_at, entry)
+        self.lock = threading.Lock()
+
+    def get(self, name: str):
+        cached = self.entries.get(name)
+        if cached is None:
+            return None
+        version, expires_at, entry = cached
+        if version != self.version or expires_at <= time.time():
+            self.entries.pop(name, None)
+            return None
+        return entry
+
+    def put(self, entry: dict):
+        with self.lock:
+            self.entries[entry["name"]] = (self.version, time.time() + self.ttl_seconds, entry)
+
+    def invalidate(self):
+        with self.lock:
+            self.version += 1
+            self.entries.clear()
+
+
+tag_cache = TagCache(ttl_seconds=settings.TAG_CACHE_TTL_SECONDS)
+
+
+def _to_entry(tag_id: int, name: str, locker_number) -> dict:
+    return {"id": tag_id, "name": name, "locker_number": locker_number}
+
 
 def get_all_tags(db: Session):
     return db.query(Tags).all()
@@ -12,6 +58,8 @@ def create_tag(db: Session, name: str):
     db.add(tag)
     db.commit()
     db.refresh(tag)
+    tag_cache.invalidate()
+    response_cache.tags_changed()
     return tag
 
 def update_tag(db: Session, tag_id: int, name: str):
@@ -20,6 +68,8 @@ def update_tag(db: Session, tag_id: int, name: str):
         tag.name = name
         db.commit()
         db.refresh(tag)
+        tag_cache.invalidate()
+        response_cache.tags_changed()
     return tag
 
 def delete_tag(db: Session, tag_id: int):
@@ -27,6 +77,8 @@ def delete_tag(db: Session, tag_id: int):
     if tag:
         db.delete(tag)
         db.commit()
+        tag_cache.invalidate()
+        response_cache.tags_changed()
         return True
     return False
 
@@ -35,3 +87,61 @@ def get_or_create_tag(db: Session, tag_name: str):
     if not tag:
         tag = create_tag(db, tag_name)
     return tag
+
+def get_or_create_tags(db: Session, names: List[str]) -> List[dict]:
+    """
+    태그 이름 리스트를 한 번에 조회/생성하여 [{id, name, locker_number}, ...]를 (입력 순서대로) 반환합니다.
+    - 캐시 miss인 이름만 SELECT ... WHERE name IN (...) 1회로 조회
+    - 그래도 없는 이름은 INSERT ... ON CONFLICT DO NOTHING 1회로 생성 (커밋은 호출한 쪽에서)
+    """
+    names = list(dict.fromkeys(name for name in names if name))
+    resolved = {}
+
+    for name in names:
+        entry = tag_cache.get(name)
+        if entry is not None:
+            resolved[name] = entry
+
+    missing = [name for name in names if name not in resolved]
+    if missing:
+        rows = (
+            db.query(Tags.id, Tags.name, Tags.locker_number)
+            .filter(Tags.name.in_(missing))
+            .all()
+        )
+        for tag_id, name, locker_number in rows:
+            resolved[name] = _to_entry(tag_id, name, locker_number)
+            tag_cache.put(resolved[name])
+
+    # 새로 생성한 태그는 커밋 전이므로 캐시에 넣지 않음 (롤백 시 잘못된 id가 남지 않도록)
+    missing = [name for name in names if name not in resolved]
+    if missing:
+        if db.get_bind().dialect.name == "postgresql":
+            rows = db.execute(
+                pg_insert(Tags)
+                .values([{"name": name} for name in missing])
+                .on_conflict_do_nothing(index_elements=["name"])
+                .returning(Tags.id, Tags.name, Tags.locker_number)
+            ).all()
+
+            # 동시에 다른 요청이 먼저 생성한 태그는 RETURNING에 없으므로 다시 조회
+            created = {name for _, name, _ in rows}
+            conflicted = [name for name in missing if name not in created]
+            if conflicted:
+                rows += (
+                    db.query(Tags.id, Tags.name, Tags.locker_number)
+                    .filter(Tags.name.in_(conflicted))
+                    .all()
+                )
+        else:
+            new_tags = [Tags(name=name) for name in missing]
+            db.add_all(new_tags)
+            db.flush()
+            rows = [(tag.id, tag.name, tag.locker_number) for tag in new_tags]
+
+        for tag_id, name, locker_number in rows:
+            resolved[name] = _to_entry(tag_id, name, locker_number)
+
+        response_cache.tags_changed()
+
+    return [resolved[name] for name in names]
@@ -9,12 +9,12 @@ def get_user_by_email(db: Session, email: str):
     """
     return db.query(Users).filter(Users.email == email).first()
 
-def create_new_user(db: Session, user_in: user_schema.UserCreate):
+async def create_new_user(db: Session, user_in: user_schema.UserCreate):
     """
-    비밀번호를 해싱하여 새 사용자를 생성합니다.
+    비밀번호를 해싱(전용 워커 풀)하여 새 사용자를 생성합니다.
     """
 
-    hashed_password = security.get_password_hash(user_in.password)
+    hashed_password = await security.get_password_hash_async(user_in.password)
 
     db_user = Users(
         email=user_in.email,
@@ -28,19 +28,31 @@ def create_new_user(db: Session, user_in: user_schema.UserCreate):
     db.refresh(db_user)
     return db_user
 
-def authenticate_user(db: Session, user_in: user_schema.UserLogin):
+async def authenticate_user(db: Session, user_in: user_schema.UserLogin):
     """
     사용자를 인증하고, 성공 시 Access Token을 반환합니다.
     실패 시 None을 반환합니다.
+    (bcrypt cost 설정이 바뀌었다면 새 cost로 재해싱하여 저장합니다.)
     """
 
     user = get_user_by_email(db, email=user_in.email)
 
-    if not user or not security.verify_password(user_in.password, user.hashed_password):
+    if not user:
         return None
 
+    verified, new_hash = await security.verify_and_update_password_async(
+        user_in.password, user.hashed_password
+    )
+    if not verified:
+        return None
+
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
+
     access_token = security.create_access_token(
-        data={"sub": user.email} # 'sub'는 토큰의 주체(사용자 식별자)
+        # 'sub'는 토큰의 주체(사용자 식별자), 'uid'는 DB 조회 없이 쓰는 사용자 id
+        data={"sub": user.email, "uid": user.id}
     )
 
     return access_token
@@ -0,0 +1,43 @@
+"""
+픽업 코드 만료 / 방치된 예약 / 응답 없는 사물함 명령 정리 작업
+
+- Lambda (EventBridge 스케줄): 핸들러 `app.sweeper.handler`
+- CLI: `python -m app.sweeper --batch-size 500 --max-batches 100`
+"""
+import argparse
+import json
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.service import sweeper_service
+
+
+def run(batch_size: int = settings.SWEEPER_BATCH_SIZE, max_batches: int = settings.SWEEPER_MAX_BATCHES) -> dict:
+    db = SessionLocal()
+    try:
+        stats = sweeper_service.sweep(db, batch_size=batch_size, max_batches=max_batches)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print(f"[Sweeper] {json.dumps(stats)}")
+    return stats
+
+
+def handler(event, context):
+    event = event or {}
+    return run(
+        batch_size=int(event.get("batch_size", settings.SWEEPER_BATCH_SIZE)),
+        max_batches=int(event.get("max_batches", settings.SWEEPER_MAX_BATCHES))
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="픽업 코드 만료 / 방치된 예약 정리")
+    parser.add_argument("--batch-size", type=int, default=settings.SWEEPER_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=settings.SWEEPER_MAX_BATCHES)
+    args = parser.parse_args()
+
+    run(batch_size=args.batch_size, max_batches=args.max_batches)
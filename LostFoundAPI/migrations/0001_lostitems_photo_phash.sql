@@ -0,0 +1,9 @@
+-- ItemRegister 중복 이미지 조회 (lookup_only)용 perceptual hash 컬럼 / 기기별 최근 등록 인덱스
+-- (app.models.LostItems.photo_phash, ix_lostitems_device_name_registered_at)
+-- 적용: psql "$DATABASE_URL" -f migrations/0001_lostitems_photo_phash.sql
+
+ALTER TABLE lostitems ADD COLUMN IF NOT EXISTS photo_phash VARCHAR(16);
+
+-- 운영 중 테이블 잠금 없이 생성 (트랜잭션 밖에서 실행)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_lostitems_device_name_registered_at
+    ON lostitems (device_name, registered_at);
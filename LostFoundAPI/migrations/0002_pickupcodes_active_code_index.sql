@@ -0,0 +1,20 @@
+-- 픽업 코드 할당기(pickup_code_service)용 순환 시퀀스 / 활성 코드만 유일한 부분 인덱스
+-- (app.models.pickup_code: pickup_code_seq, ix_pickupcodes_active_code)
+-- 기존 테이블 전체 UNIQUE(code)가 남아 있으면 시퀀스가 한 바퀴 돈 뒤 모든 할당이 충돌하므로 함께 제거합니다.
+-- 적용: psql "$DATABASE_URL" -f migrations/0002_pickupcodes_active_code_index.sql
+
+BEGIN;
+
+CREATE SEQUENCE IF NOT EXISTS pickup_code_seq MINVALUE 0 MAXVALUE 899999 START WITH 0 CYCLE;
+
+-- 활성(미사용/미취소) 코드끼리만 유일
+CREATE UNIQUE INDEX IF NOT EXISTS ix_pickupcodes_active_code
+    ON pickupcodes (code)
+    WHERE is_used = false AND cancelled_at IS NULL;
+
+-- 기존 테이블 전체 UNIQUE 제거 후 일반 인덱스로 다시 생성 (Column(unique=True, index=True) 또는 UNIQUE 제약)
+ALTER TABLE pickupcodes DROP CONSTRAINT IF EXISTS pickupcodes_code_key;
+DROP INDEX IF EXISTS ix_pickupcodes_code;
+CREATE INDEX ix_pickupcodes_code ON pickupcodes (code);
+
+COMMIT;
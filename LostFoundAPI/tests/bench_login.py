@@ -0,0 +1,105 @@
+"""
+POST /users/login 처리량 벤치마크 (PasswordHashPool vs 이벤트 루프에서 직접 bcrypt)
+- 같은 DB에 inline 모드(PASSWORD_HASH_WORKERS=0) / pool 모드 서버(uvicorn, 워커 1개)를 차례로 띄우고
+  동시 로그인 요청의 처리량(req/s)과 지연(p50/p95/max)을 비교합니다.
+- 로그인 부하 중에 /health_check를 계속 호출해, bcrypt가 이벤트 루프를 막는 동안
+  다른 요청이 얼마나 지연되는지(health_p95_ms)도 함께 측정합니다.
+- 측정 전에 벤치마크용 사용자(--email)를 만들거나 비밀번호를 갱신합니다.
+
+사용법 (LostFoundAPI 디렉터리에서, .env의 DATABASE_URL 등을 그대로 사용):
+    pip install -r tests/requirements.txt
+    python tests/bench_login.py --requests 200 --concurrency 20 --workers 2
+"""
+import os
+import sys
+import time
+import argparse
+import asyncio
+
+import httpx
+
+from load_async_db import API_DIR, run_server, measure, print_table
+
+PASSWORD = "bench-login-password"
+
+
+def seed_user(email: str, rounds: int):
+    """벤치마크용 사용자를 만들거나, 서버와 같은 bcrypt cost로 비밀번호를 다시 저장합니다."""
+    os.environ["BCRYPT_ROUNDS"] = str(rounds)
+    sys.path.insert(0, API_DIR)
+
+    from app.core.security import get_password_hash
+    from app.db.session import SessionLocal
+    from app.models import Users
+
+    db = SessionLocal()
+    try:
+        user = db.query(Users).filter(Users.email == email).first()
+        if user is None:
+            user = Users(name="bench-login", email=email)
+            db.add(user)
+        user.hashed_password = get_password_hash(PASSWORD)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _probe_health(client: httpx.AsyncClient, stop: asyncio.Event) -> list:
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health_check")
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+async def _run_mode(base_url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def send(client):
+            return await client.post("/users/login", json={"email": args.email, "password": PASSWORD})
+
+        # 커넥션 풀 / 워커 스레드 워밍업
+        await measure(client, send, total=args.concurrency, concurrency=args.concurrency)
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_health(client, stop))
+        result = await measure(client, send, total=args.requests, concurrency=args.concurrency)
+        stop.set()
+        health = sorted(await probe)
+
+    result["health_p95_ms"] = round(health[int(len(health) * 0.95) - 1], 1)
+    result["health_max_ms"] = round(health[-1], 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그인 처리량: PasswordHashPool vs inline bcrypt")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2, help="pool 모드의 PASSWORD_HASH_WORKERS")
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    parser.add_argument("--email", default="bench-login@example.com")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    seed_user(args.email, args.rounds)
+
+    results = {}
+    for mode, workers in (("inline", 0), ("pool", args.workers)):
+        env = {
+            "PASSWORD_HASH_WORKERS": str(workers),
+            "PASSWORD_HASH_MAX_QUEUE": str(args.concurrency),  # 503 거절 없이 처리량만 비교
+            "BCRYPT_ROUNDS": str(args.rounds),
+            "DB_POOL_SIZE": str(args.concurrency),
+            "DB_MAX_OVERFLOW": "0",
+        }
+        with run_server(args.port, env) as base_url:
+            results[mode] = asyncio.run(_run_mode(base_url, args))
+
+    print_table(results, ["requests", "errors", "req_per_sec", "p50_ms", "p95_ms", "max_ms", "health_p95_ms", "health_max_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+DB_ASYNC_MODE 부하 테스트
+- 같은 DB에 동기 모드 / 비동기 모드 서버(uvicorn, 워커 1개)를 차례로 띄우고
+  GET /items/ 동시 요청의 처리량(req/s)과 지연(p50/p95/max)을 비교합니다.
+- 응답 캐시를 끄고(RESPONSE_CACHE_ITEMS_TTL_SECONDS=0) 매 요청이 DB를 조회하도록 측정합니다.
+- 두 모드 모두 커넥션 풀 크기를 동시 요청 수로 맞춥니다. (기본 풀 2+3개로는 동기 모드에서
+  이벤트 루프가 커넥션 대기로 멈춰, 커넥션을 쥔 요청이 끝나지 못하고 DB_POOL_TIMEOUT마다 실패합니다.)
+
+사용법 (LostFoundAPI 디렉터리에서, .env의 DATABASE_URL 등을 그대로 사용):
+    pip install -r tests/requirements.txt
+    python tests/load_async_db.py --requests 2000 --concurrency 50 --seed 50
+"""
+import os
+import sys
+import time
+import argparse
+import asyncio
+import statistics
+import subprocess
+from contextlib import contextmanager
+
+import httpx
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@contextmanager
+def run_server(port: int, env: dict):
+    """uvicorn 서버를 띄우고 /health_check가 응답할 때까지 기다립니다."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=API_DIR,
+        env={**os.environ, **env}
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{base_url}/health_check", timeout=1).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("서버가 시작되지 않았습니다.")
+                time.sleep(0.2)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+async def measure(client: httpx.AsyncClient, send, total: int, concurrency: int) -> dict:
+    """
+    send(client) 요청을 concurrency개씩 동시에 total번 보내고 처리량/지연을 집계합니다.
+    """
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await send(client)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "req_per_sec": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        "max_ms": round(latencies[-1], 1),
+    }
+
+
+def print_table(results: dict, columns: list = None):
+    columns = columns or ["requests", "errors", "req_per_sec", "p50_ms", "p95_ms", "max_ms"]
+    widths = [max(13, len(column) + 2) for column in columns]
+    print(f"{'mode':<10}" + "".join(f"{column:>{width}}" for column, width in zip(columns, widths)))
+    for mode, result in results.items():
+        print(f"{mode:<10}" + "".join(f"{result[column]:>{width}}" for column, width in zip(columns, widths)))
+
+
+async def _run_mode(base_url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        if args.seed:
+            (await client.post("/dev/create-dummy-items", params={"count": args.seed})).raise_for_status()
+
+        async def send(client):
+            return await client.get("/items/", params={"limit": args.limit})
+
+        # 커넥션 풀 / JIT 워밍업
+        await measure(client, send, total=args.concurrency, concurrency=args.concurrency)
+        return await measure(client, send, total=args.requests, concurrency=args.concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB_ASYNC_MODE 동기/비동기 처리량 비교")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20, help="GET /items/ 페이지 크기")
+    parser.add_argument("--seed", type=int, default=0, help="측정 전 생성할 더미 분실물 수 (최대 50)")
+    parser.add_argument("--pool-size", type=int, default=None, help="DB_POOL_SIZE (기본: --concurrency)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = {}
+    for mode, async_mode in (("sync", "false"), ("async", "true")):
+        env = {
+            "DB_ASYNC_MODE": async_mode,
+            "DB_POOL_SIZE": str(args.pool_size or args.concurrency),
+            "DB_MAX_OVERFLOW": "0",
+            "RESPONSE_CACHE_ITEMS_TTL_SECONDS": "0",
+        }
+        with run_server(args.port, env) as base_url:
+            results[mode] = asyncio.run(_run_mode(base_url, args))
+        args.seed = 0  # 더미 데이터는 첫 서버에서 한 번만 생성
+
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()